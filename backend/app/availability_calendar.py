@@ -0,0 +1,129 @@
+# app/availability_calendar.py
+"""
+In-memory snapshot of the bookable (untaken, future) slots, bucketed by
+BUSINESS_TZ (Europe/Berlin) day.
+
+Browsing slots is the booking screen's most frequent call. Instead of querying
+the table on every request, each worker loads the next
+``AVAILABILITY_CALENDAR_DAYS`` days once, using the partial index on untaken
+slots, and then keeps the snapshot current:
+
+* slots created through the API are added (``add``),
+* a slot drops out as soon as a booking reserves it (``remove``),
+* slots whose start time has passed are filtered out when read.
+
+Serving a range is then a dict lookup per day. Other workers' bookings and
+slot changes reach this snapshot when it is rebuilt, which happens every
+``AVAILABILITY_CALENDAR_TTL`` seconds and whenever the day rolls over. A
+stale slot can't be double-booked: the reservation itself is atomic (see
+``crud.reserve_availability``), and a late booking just gets a 409.
+
+A rebuild is single-flight: when the snapshot expires under load, one request
+reloads it and the others wait for that load instead of each running the
+query.
+"""
+import asyncio
+import datetime
+import os
+import time
+from typing import Dict, Iterable, List, Optional
+
+from . import crud, crud_async, schemas
+from .database import AnySession
+
+AVAILABILITY_CALENDAR_DAYS = int(os.getenv("AVAILABILITY_CALENDAR_DAYS", "31"))
+AVAILABILITY_CALENDAR_TTL = float(os.getenv("AVAILABILITY_CALENDAR_TTL", "60"))
+
+
+def _day_of(slot: schemas.Availability) -> datetime.date:
+    return crud.business_day(slot.time)
+
+
+class AvailabilityCalendar:
+    """Untaken slots for ``[start, end]``, grouped by day and sorted by time."""
+
+    def __init__(self):
+        self.start: Optional[datetime.date] = None
+        self.end: Optional[datetime.date] = None
+        self._days: Dict[datetime.date, List[schemas.Availability]] = {}
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def _is_current(self, today: datetime.date) -> bool:
+        return (
+            self.start == today
+            and time.monotonic() - self._loaded_at < AVAILABILITY_CALENDAR_TTL
+        )
+
+    async def refresh(self, db: AnySession, today: datetime.date) -> None:
+        """Rebuild the snapshot from the database (one indexed range query)."""
+        async with self._lock:
+            await self._load(db, today)
+
+    async def _load(self, db: AnySession, today: datetime.date) -> None:
+        start = today
+        end = today + datetime.timedelta(days=AVAILABILITY_CALENDAR_DAYS)
+        rows = await crud_async.get_available_availabilities(
+            db, start_date=start, end_date=end, limit=None,
+        )
+        days: Dict[datetime.date, List[schemas.Availability]] = {}
+        for row in rows:
+            slot = schemas.Availability.model_validate(row)
+            days.setdefault(_day_of(slot), []).append(slot)
+        self.start, self.end, self._days = start, end, days
+        self._loaded_at = time.monotonic()
+
+    async def ensure_current(self, db: AnySession, today: datetime.date) -> None:
+        if self._is_current(today):
+            return
+        async with self._lock:
+            # Whoever held the lock may have just rebuilt it.
+            if not self._is_current(today):
+                await self._load(db, today)
+
+    def covers(self, day: datetime.date, until: Optional[datetime.date] = None) -> bool:
+        """True if the snapshot holds ``day`` (through ``until``, when given)."""
+        until = until or day
+        return self.start is not None and self.start <= day and until <= self.end
+
+    def slots(self, day: datetime.date) -> List[schemas.Availability]:
+        """Bookable slots on ``day``; slots that already started are skipped."""
+        slots = self._days.get(day, [])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        if slots and slots[0].time <= now:
+            slots = [s for s in slots if s.time > now]
+        return slots
+
+    def slots_between(
+        self, start: datetime.date, end: datetime.date,
+    ) -> List[schemas.Availability]:
+        """Bookable slots from ``start`` through ``end``, ordered by (time, id)."""
+        result: List[schemas.Availability] = []
+        day = start
+        while day <= end:
+            result.extend(self.slots(day))
+            day += datetime.timedelta(days=1)
+        return result
+
+    def add(self, slots: Iterable) -> None:
+        """Add newly created slots (ORM rows or schemas) that fall in the window."""
+        for row in slots:
+            slot = schemas.Availability.model_validate(row)
+            day = _day_of(slot)
+            if slot.is_taken or not self.covers(day):
+                continue
+            bucket = [s for s in self._days.get(day, []) if s.id != slot.id]
+            bucket.append(slot)
+            bucket.sort(key=lambda s: (s.time, s.id))
+            self._days[day] = bucket
+
+    def remove(self, availability_id: int, day: Optional[datetime.date] = None) -> None:
+        """Drop a slot that has just been booked."""
+        days = [day] if day is not None else list(self._days)
+        for d in days:
+            bucket = self._days.get(d)
+            if bucket and any(s.id == availability_id for s in bucket):
+                self._days[d] = [s for s in bucket if s.id != availability_id]
+
+
+calendar = AvailabilityCalendar()
@@ -0,0 +1,61 @@
+# app/catalog.py
+"""
+In-process cache of the active service catalog, one entry per brand.
+
+The catalog only changes through ``/api/services/create``, which calls
+``invalidate``. Every other read (the apps' ``/api/services/get`` and the web
+landing page) is served from memory. Each uvicorn worker keeps its own copy,
+so entries also expire after ``CATALOG_CACHE_TTL`` seconds (default 300). That
+way a service created through another worker shows up here within the TTL.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+from . import crud_async, models, schemas
+from .database import AnySession
+
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "300"))
+
+
+class CatalogEntry:
+    """A brand's active services (ordered by name) plus a digest of their content."""
+
+    def __init__(self, services: List[schemas.Service]):
+        self.services = services
+        body = json.dumps(
+            [s.model_dump(mode="json") for s in services], sort_keys=True,
+        ).encode("utf-8")
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.loaded_at = time.monotonic()
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() - self.loaded_at < CATALOG_CACHE_TTL
+
+    def etag(self, *variant) -> str:
+        """Strong ETag for one representation (e.g. a skip/limit page) of the catalog."""
+        suffix = "-".join(str(v) for v in variant)
+        return f'"{self.digest}-{suffix}"' if suffix else f'"{self.digest}"'
+
+
+_entries: Dict[models.BrandEnum, CatalogEntry] = {}
+
+
+async def get_catalog(db: AnySession, brand: models.BrandEnum) -> CatalogEntry:
+    """Return the cached catalog for ``brand``, loading it on a miss or after the TTL."""
+    entry = _entries.get(brand)
+    if entry is None or not entry.is_fresh():
+        rows = await crud_async.get_active_services(db, brand=brand, skip=0, limit=None)
+        entry = CatalogEntry([schemas.Service.model_validate(row) for row in rows])
+        _entries[brand] = entry
+    return entry
+
+
+def invalidate(brand: Optional[models.BrandEnum] = None) -> None:
+    """Drop the cached catalog for ``brand`` (or for every brand)."""
+    if brand is None:
+        _entries.clear()
+    else:
+        _entries.pop(brand, None)
@@ -1,54 +1,166 @@
 # app/crud.py
 import datetime
-from typing import List, Optional
+import hashlib
+from functools import lru_cache
+from typing import List, NamedTuple, Optional, Set, Tuple
 from zoneinfo import ZoneInfo
 
-from sqlalchemy.orm import Session, joinedload, selectinload
-from sqlalchemy import select
+from sqlalchemy.orm import Session, aliased, contains_eager, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy import and_, bindparam, case, cast, func, insert, literal, or_, select, true, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 
-from . import models, schemas
+from . import models, order_events, outbox, schemas
 
 # All booking hours are expressed in this timezone, regardless of where the
 # server runs. Stored values go to the DB as UTC (timestamptz).
 BUSINESS_TZ = ZoneInfo("Europe/Berlin")
 
 
+def business_today() -> datetime.date:
+    """Today's date in BUSINESS_TZ (not the server's local date)."""
+    return datetime.datetime.now(BUSINESS_TZ).date()
+
+
+def business_day(value: datetime.datetime) -> datetime.date:
+    """The BUSINESS_TZ calendar day of a stored timestamp (naive = UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return value.astimezone(BUSINESS_TZ).date()
+
+
+def business_day_bounds(
+    start_date: datetime.date, end_date: datetime.date,
+) -> Tuple[datetime.datetime, datetime.datetime]:
+    """
+    UTC ``[start, end)`` covering the BUSINESS_TZ days ``start_date`` through
+    ``end_date`` inclusive, i.e. from Berlin midnight to Berlin midnight.
+    """
+    start_local = datetime.datetime.combine(start_date, datetime.time.min, tzinfo=BUSINESS_TZ)
+    end_local = datetime.datetime.combine(
+        end_date + datetime.timedelta(days=1), datetime.time.min, tzinfo=BUSINESS_TZ,
+    )
+    return (
+        start_local.astimezone(datetime.timezone.utc),
+        end_local.astimezone(datetime.timezone.utc),
+    )
+
+
 # --- New CRUD functions for your new models ---
 
+def _order_graph_options():
+    """
+    Loader options for everything ``schemas.Order`` serializes. Loading it all
+    up front keeps serialization free of lazy loads, which an AsyncSession
+    can't perform once the route has returned.
+
+    A page of orders costs three statements whatever its size: orders joined
+    with location and availability, the association rows joined with their
+    services, and the process steps. ``Order.services`` is not loaded here;
+    ``_fill_services`` derives it from the association rows.
+    """
+    return (
+        joinedload(models.Order.location),
+        joinedload(models.Order.availability),
+        selectinload(models.Order.service_associations).joinedload(
+            models.OrderServiceAssociation.service
+        ),
+        selectinload(models.Order.process_steps),
+    )
+
+
+def _fill_services(orders: List[models.Order]) -> List[models.Order]:
+    """Populate ``Order.services`` from the already-loaded association rows, without SQL."""
+    for order in orders:
+        set_committed_value(order, "services", [a.service for a in order.service_associations])
+    return orders
+
+
 def get_orders(
     db: Session,
     phone_identifier: str,
     brand: Optional[models.BrandEnum] = None,
     skip: int = 0,
     limit: int = 100,
+    before: Optional[Tuple[datetime.datetime, int]] = None,
 ) -> List[models.Order]:
     """
-    Retrieves a list of orders from the database,
+    Retrieves a list of orders from the database, newest first,
     eagerly loading related location, services, and availability.
     When ``brand`` is provided, only that brand's orders are returned.
+
+    ``before`` is the ``(created_at, id)`` of the last order on the previous
+    page (keyset pagination). It walks ix_orders_phone_brand_created
+    backwards, so every page costs the same however deep it is; ``skip`` is
+    kept for the legacy offset-based route.
     """
     query = db.query(models.Order).filter(
         models.Order.phone_identifier == phone_identifier  # Filter by phone identifier
     )
     if brand is not None:
         query = query.filter(models.Order.brand == brand)
-    return (
+    if before is not None:
+        query = query.filter(tuple_(models.Order.created_at, models.Order.id) < tuple_(*before))
+    return _fill_services(
         query
-        .options(
-            joinedload(models.Order.location),
-            joinedload(models.Order.availability),
-            selectinload(models.Order.services),
-            selectinload(models.Order.service_associations).joinedload(
-                models.OrderServiceAssociation.service
-            ),
-        )
-        .order_by(models.Order.created_at.desc())  # Optional: order by creation date
+        .options(*_order_graph_options())
+        .order_by(models.Order.created_at.desc(), models.Order.id.desc())
         .offset(skip)
         .limit(limit)
         .all()
     )
 
 
+def get_order_summaries(
+    db: Session,
+    phone_identifier: str,
+    brand: Optional[models.BrandEnum] = None,
+    skip: int = 0,
+    limit: int = 100,
+    before: Optional[Tuple[datetime.datetime, int]] = None,
+) -> list:
+    """
+    The same page as ``get_orders``, but as flat rows for list screens: one
+    column-projection query instead of hydrating the full object graph.
+
+    Each row has ``id``, ``created_at``, ``status``, ``time`` (slot start),
+    ``address``, ``total`` and ``currency`` (stored on the order at booking),
+    ``item_count`` (sum of quantities, from a per-order subquery on the
+    association's primary key) and ``version``.
+    """
+    Order, Assoc = models.Order, models.OrderServiceAssociation
+    item_count = (
+        select(func.coalesce(func.sum(Assoc.quantity), 0))
+        .where(Assoc.order_id == Order.id)
+        .scalar_subquery()
+    )
+    query = (
+        select(
+            Order.id,
+            Order.created_at,
+            Order.status,
+            models.Availability.time,
+            models.Location.address,
+            func.coalesce(Order.total, 0.0).label("total"),
+            Order.currency,
+            item_count.label("item_count"),
+            Order.version,
+        )
+        .join(Order.availability)
+        .join(Order.location)
+        .where(Order.phone_identifier == phone_identifier)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    if brand is not None:
+        query = query.where(Order.brand == brand)
+    if before is not None:
+        query = query.where(tuple_(Order.created_at, Order.id) < tuple_(*before))
+    return db.execute(query).all()
+
+
 def get_order_by_phone_identifier_and_id(
     db: Session,
     phone_identifier: str,
@@ -66,86 +178,325 @@ def get_order_by_phone_identifier_and_id(
     )
     if brand is not None:
         query = query.filter(models.Order.brand == brand)
-    return (
-        query
-        .options(
-            joinedload(models.Order.location),
-            joinedload(models.Order.availability),
-            selectinload(models.Order.services),
-            selectinload(models.Order.service_associations).joinedload(
-                models.OrderServiceAssociation.service
-            ),
+    order = query.options(*_order_graph_options()).first()
+    if order is not None:
+        _fill_services([order])
+    return order
+
+
+def get_order_version(
+    db: Session,
+    phone_identifier: str,
+    order_id: int,
+    brand: Optional[models.BrandEnum] = None,
+) -> Optional[int]:
+    """
+    The ``version`` of the order ``get_order_by_phone_identifier_and_id``
+    would return (None if there is none): one column of one row, enough to
+    answer a conditional GET without loading the order.
+    """
+    query = select(models.Order.version).where(
+        models.Order.phone_identifier == phone_identifier,
+        models.Order.id == order_id,
+    )
+    if brand is not None:
+        query = query.where(models.Order.brand == brand)
+    return db.scalar(query)
+
+
+def get_order_page_digest(
+    db: Session,
+    phone_identifier: str,
+    brand: Optional[models.BrandEnum] = None,
+    skip: int = 0,
+    limit: int = 100,
+    before: Optional[Tuple[datetime.datetime, int]] = None,
+) -> str:
+    """
+    A digest of the ``(id, version)`` pairs of the orders on a ``get_orders``
+    page: it changes whenever an order on the page changes or the page gains
+    or loses one. Reads only the orders table and returns one value;
+    ``order_page_digest`` computes the same digest from loaded orders.
+    """
+    Order = models.Order
+    page = (
+        select(Order.id, Order.version, Order.created_at)
+        .where(Order.phone_identifier == phone_identifier)
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    if brand is not None:
+        page = page.where(Order.brand == brand)
+    if before is not None:
+        page = page.where(tuple_(Order.created_at, Order.id) < tuple_(*before))
+    page = page.subquery()
+    pairs = func.string_agg(
+        func.concat(page.c.id, ":", page.c.version),
+        aggregate_order_by(literal(","), page.c.created_at.desc(), page.c.id.desc()),
+    )
+    return db.scalar(select(func.md5(func.coalesce(pairs, ""))))
+
+
+def order_page_digest(orders) -> str:
+    """``get_order_page_digest`` of a page already loaded (orders or summary rows, in page order)."""
+    return hashlib.md5(",".join(f"{o.id}:{o.version}" for o in orders).encode("utf-8")).hexdigest()
+
+
+def get_order_progress(
+    db: Session,
+    phone_identifier: str,
+    brand: models.BrandEnum,
+    order_id: Optional[int] = None,
+) -> List[dict]:
+    """
+    Status and steps of one of the customer's orders (``order_id``) or of all
+    their OPEN orders, as ``order_events`` payloads: the snapshot a live
+    progress stream starts with. Reads no services, location or slot.
+    """
+    query = select(order_events.order_payload()).where(
+        models.Order.phone_identifier == phone_identifier,
+        models.Order.brand == brand,
+    )
+    if order_id is not None:
+        query = query.where(models.Order.id == order_id)
+    else:
+        query = query.where(models.Order.status == models.OrderStatusEnum.OPEN)
+    return list(db.scalars(query.order_by(models.Order.id)))
+
+
+class SlotUnavailableError(ValueError):
+    """The requested availability slot is taken or being booked right now."""
+
+
+def reserve_availability(db: Session, availability_id: int) -> Optional[models.Availability]:
+    """
+    Atomically mark a free slot as taken, in a single statement:
+
+        UPDATE availabilities SET is_taken = true
+        WHERE id = (SELECT id FROM availabilities
+                    WHERE id = :id AND is_taken = false
+                    FOR UPDATE SKIP LOCKED)
+        RETURNING ...
+
+    Of any number of concurrent bookings for the same slot exactly one gets the
+    row back. The others either skip the row while the winner holds its lock,
+    or find ``is_taken`` already set, and get None straight away instead of
+    queueing behind the winner's transaction.
+    """
+    free_slot = (
+        select(models.Availability.id)
+        .where(
+            models.Availability.id == availability_id,
+            models.Availability.is_taken.is_(False),
         )
-        .first()
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
     )
+    return db.scalars(
+        update(models.Availability)
+        .where(models.Availability.id == free_slot)
+        .values(is_taken=True)
+        .returning(models.Availability)
+    ).one_or_none()
 
 
-# Example for creating an order (simplified, without full error handling):
-def create_order(db: Session, order: schemas.OrderCreate) -> models.Order:
-    
-    db_availability = db.query(models.Availability).filter(models.Availability.id == order.availability_id).first()
-    db_availability = db_availability if db_availability and not db_availability.is_taken else None
-    if not db_availability:
-        raise ValueError("Availability not found")
-    db_availability.is_taken = True  # Mark as taken
+# Default steps every new order starts with. Store translation keys; the
+# mobile app resolves them via i18n.
+DEFAULT_PROCESS_STEPS = [
+    {"name": "step.booking_confirmed.name",   "text": "step.booking_confirmed.text"},
+    {"name": "step.cleaner_assigned.name",    "text": "step.cleaner_assigned.text"},
+    {"name": "step.on_the_way.name",          "text": "step.on_the_way.text"},
+    {"name": "step.cleaning_in_progress.name","text": "step.cleaning_in_progress.text"},
+    {"name": "step.completed.name",           "text": "step.completed.text"},
+]
+
 
+def create_order(db: Session, order: schemas.OrderCreate) -> models.Order:
+    """
+    Books an order with a fixed number of statements, whatever the basket size:
+    the services SELECT, the atomic slot reservation (see
+    ``reserve_availability``), one INSERT each for the location and the order,
+    one multi-row INSERT for the service associations, one for the default
+    process steps and one for the outbox emails.
+
+    Raises ``SlotUnavailableError`` when another booking holds the slot and
+    ``ValueError`` for unknown slots or services.
+
+    Every INSERT uses RETURNING, so the returned order already carries its full
+    graph (location, availability, services, service items, process steps) and
+    nothing has to be reloaded for the response or the emails.
+    """
+    # Validate the basket before reserving, so a bad request never holds the
+    # slot lock that concurrent bookings would skip over.
     db_services = db.query(models.Service).filter(models.Service.id.in_(order.service_ids)).all()
     if len(db_services) != len(order.service_ids):
         raise ValueError("One or more services not found")
 
-    db_location = models.Location(
-        address=order.location.address,
-        longitude=order.location.longitude,
-        latitude=order.location.latitude
-    )
-    db.add(db_location)
-
-    db_order = models.Order(
-        brand=order.brand,
-        phone_identifier=order.phone_identifier,
-        name=(order.name or None),
-        plate_number=(order.plate_number or None),  # home app has no plate
-        phone_number=order.phone_number,
-        email=(order.email or None),  # store None when not provided
-        location=db_location,
-        availability=db_availability,
-        # Services are attached below as association rows so we can carry the
-        # per-service quantity (the car app always uses 1).
-    )
-    db.add(db_order)
-    db.flush() # Flush to get the db_order.id before committing
+    db_availability = reserve_availability(db, order.availability_id)
+    if db_availability is None:
+        # Only the losing path pays for this lookup.
+        if get_availability_by_id(db, order.availability_id) is None:
+            raise ValueError("Availability not found")
+        raise SlotUnavailableError("Availability already taken")
 
+    # Services are stored as association rows so we can carry the per-service
+    # quantity (the car app always uses 1) and the price at booking time. The
+    # total is materialized on the order from the same snapshot.
     quantities = order.service_quantities or {}
+    item_rows = []
     for svc in db_services:
         qty = quantities.get(svc.id, 1)
         if not isinstance(qty, int) or qty < 1:
             qty = 1
-        db.add(models.OrderServiceAssociation(
-            order_id=db_order.id, service_id=svc.id, quantity=qty,
-        ))
-
-    # Store translation keys; the mobile app resolves them via i18n.
-    process_steps = [
-        {"name": "step.booking_confirmed.name",   "text": "step.booking_confirmed.text"},
-        {"name": "step.cleaner_assigned.name",    "text": "step.cleaner_assigned.text"},
-        {"name": "step.on_the_way.name",          "text": "step.on_the_way.text"},
-        {"name": "step.cleaning_in_progress.name","text": "step.cleaning_in_progress.text"},
-        {"name": "step.completed.name",           "text": "step.completed.text"},
-    ]
-    for process_step in process_steps:
-        db_process_step = models.ProcessStep(
-            name=process_step['name'],
-            text=process_step['text'],
-            status=schemas.ProcessStepStatusEnum.PENDING,
-            order_id=db_order.id
-        )
-        db.add(db_process_step)
+        item_rows.append({"service_id": svc.id, "quantity": qty, "unit_price": svc.price})
+    total = sum((row["unit_price"] or 0) * row["quantity"] for row in item_rows)
+    currency = db_services[0].currency if db_services else None
+
+    db_location = db.scalars(
+        insert(models.Location).returning(models.Location),
+        [{
+            "address": order.location.address,
+            "longitude": order.location.longitude,
+            "latitude": order.location.latitude,
+        }],
+    ).one()
+
+    db_order = db.scalars(
+        insert(models.Order).returning(models.Order),
+        [{
+            "brand": order.brand,
+            "phone_identifier": order.phone_identifier,
+            "name": order.name or None,
+            "plate_number": order.plate_number or None,  # home app has no plate
+            "phone_number": order.phone_number,
+            "email": order.email or None,  # store None when not provided
+            "location_id": db_location.id,
+            "availability_id": db_availability.id,
+            "total": total if item_rows else None,
+            "currency": currency,
+        }],
+    ).one()
+
+    db_items = []
+    if item_rows:
+        db_items = db.scalars(
+            insert(models.OrderServiceAssociation).returning(
+                models.OrderServiceAssociation, sort_by_parameter_order=True,
+            ),
+            [{"order_id": db_order.id, **row} for row in item_rows],
+        ).all()
+
+    db_steps = db.scalars(
+        insert(models.ProcessStep).returning(models.ProcessStep, sort_by_parameter_order=True),
+        [
+            {
+                "name": step["name"],
+                "text": step["text"],
+                "status": models.ProcessStepStatusEnum.PENDING,
+                "order_id": db_order.id,
+            }
+            for step in DEFAULT_PROCESS_STEPS
+        ],
+    ).all()
+
+    # Wire up the relationships from what we already hold, without emitting
+    # any SQL (set_committed_value marks them loaded, not changed).
+    services_by_id = {svc.id: svc for svc in db_services}
+    for item in db_items:
+        set_committed_value(item, "service", services_by_id[item.service_id])
+    set_committed_value(db_order, "location", db_location)
+    set_committed_value(db_order, "availability", db_availability)
+    set_committed_value(db_order, "services", db_services)
+    set_committed_value(db_order, "service_associations", db_items)
+    set_committed_value(db_order, "process_steps", db_steps)
+
+    # Queue the booking emails in the same transaction: they exist if and
+    # only if the order does (the email worker delivers them).
+    email_rows = outbox.order_email_rows(db_order, order.email, order.locale)
+    if email_rows:
+        db.execute(insert(models.EmailOutbox), email_rows)
 
     db.commit()
-    db.refresh(db_order)
     return db_order
 
 
+def get_order_by_uuid(db: Session, order_uuid: str) -> Optional[models.Order]:
+    """Order by its public uuid, with everything the cleaner detail page shows."""
+    return (
+        db.query(models.Order)
+        .filter(models.Order.uuid == order_uuid)
+        .options(
+            joinedload(models.Order.location),
+            joinedload(models.Order.availability),
+            selectinload(models.Order.services),
+            selectinload(models.Order.process_steps),
+        )
+        .first()
+    )
+
+
+def get_open_orders(
+    db: Session,
+    brand: models.BrandEnum,
+    start_date: Optional[datetime.date] = None,
+    end_date: Optional[datetime.date] = None,
+    step_status: Optional[models.ProcessStepStatusEnum] = None,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime.datetime, int]] = None,
+) -> List[models.Order]:
+    """
+    OPEN orders for ``brand`` by appointment time, soonest first (cleaner
+    dashboard).
+
+    ``start_date``/``end_date`` are inclusive BUSINESS_TZ days of the
+    appointment (either may be omitted). ``step_status`` keeps orders with at
+    least one process step in that status. ``after`` is the ``(time, id)`` of
+    the last order on the previous page (keyset pagination). The brand/status
+    filter is served by the partial index ix_orders_open_brand.
+    """
+    query = (
+        db.query(models.Order)
+        .join(models.Order.availability)
+        .filter(
+            models.Order.status == models.OrderStatusEnum.OPEN,
+            models.Order.brand == brand,
+        )
+    )
+    if start_date is not None or end_date is not None:
+        start_utc, end_utc = business_day_bounds(start_date or end_date, end_date or start_date)
+        if start_date is not None:
+            query = query.filter(models.Availability.time >= start_utc)
+        if end_date is not None:
+            query = query.filter(models.Availability.time < end_utc)
+    if step_status is not None:
+        query = query.filter(
+            select(models.ProcessStep.id)
+            .where(
+                models.ProcessStep.order_id == models.Order.id,
+                models.ProcessStep.status == step_status,
+            )
+            .exists()
+        )
+    if after is not None:
+        query = query.filter(tuple_(models.Availability.time, models.Order.id) > tuple_(*after))
+    query = (
+        query
+        .options(
+            joinedload(models.Order.location),
+            contains_eager(models.Order.availability),
+        )
+        .order_by(models.Availability.time, models.Order.id)
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def get_process_step(db: Session, step_id: int) -> Optional[models.ProcessStep]:
+    return db.query(models.ProcessStep).filter(models.ProcessStep.id == step_id).first()
+
+
 # --- MODIFIED: Get available availabilities for the next 2 weeks ---
 def get_availability_by_id(db: Session, availability_id: int):
     return (
@@ -154,22 +505,39 @@ def get_availability_by_id(db: Session, availability_id: int):
         .first()
     )
 
-def get_available_availabilities(db: Session, start_date: datetime.date, end_date: datetime.date, skip: int = 0, limit: int = 100) -> List[models.Availability]:
+def get_available_availabilities(
+    db: Session,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    skip: int = 0,
+    limit: Optional[int] = 100,
+    after: Optional[Tuple[datetime.datetime, int]] = None,
+) -> List[models.Availability]:
     """
     Retrieves a list of availability slots that are not taken,
     fall within the requested date range, and have not yet started.
+
+    ``start_date``/``end_date`` are inclusive BUSINESS_TZ days. ``after`` is a
+    ``(time, id)`` keyset cursor: only slots strictly after it are returned.
+    Served by the partial index ix_availabilities_open_time; ``limit=None``
+    returns the whole range (used by app/availability_calendar.py).
     """
     now_utc = datetime.datetime.now(datetime.timezone.utc)
+    start_utc, end_utc = business_day_bounds(start_date, end_date)
 
-    return (
-        db.query(models.Availability)
-        .filter(
-            models.Availability.is_taken == False,
-            models.Availability.time >= start_date, # Start from today
-            models.Availability.time <= end_date,   # Up to end of range
-            models.Availability.time > now_utc,     # Hide slots already in the past
+    query = db.query(models.Availability).filter(
+        models.Availability.is_taken == False,
+        models.Availability.time >= start_utc,  # From Berlin midnight of start_date
+        models.Availability.time < end_utc,     # Up to Berlin midnight after end_date
+        models.Availability.time > now_utc,     # Hide slots already in the past
+    )
+    if after is not None:
+        query = query.filter(
+            tuple_(models.Availability.time, models.Availability.id) > tuple_(*after)
         )
-        .order_by(models.Availability.time) # Optional: order by date/time
+    return (
+        query
+        .order_by(models.Availability.time, models.Availability.id)
         .offset(skip)
         .limit(limit)
         .all()
@@ -182,95 +550,110 @@ def create_availability(db: Session, availability: schemas.AvailabilityCreate) -
         is_taken=availability.is_taken
     )
     db.add(db_availability)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        # uq_availabilities_time: there is already a slot at this time.
+        db.rollback()
+        raise ValueError("An availability slot already exists at this time")
     db.refresh(db_availability)
     return db_availability
 
 
-def bulk_create_availabilities_for_day(
+def _slot_times(
+    target_date: datetime.date, start_hour: int, end_hour: int, step_minutes: int,
+) -> List[datetime.datetime]:
+    """
+    UTC start times of the slots on ``target_date``: from ``start_hour``:00
+    Europe/Berlin in ``step_minutes`` intervals, each ending at or before
+    ``end_hour``:00 Berlin time (``end_hour=24`` means midnight).
+    """
+    day_local = datetime.datetime.combine(target_date, datetime.time.min, tzinfo=BUSINESS_TZ)
+    current = day_local + datetime.timedelta(hours=start_hour)
+    end_dt_local = day_local + datetime.timedelta(hours=end_hour)
+    step = datetime.timedelta(minutes=step_minutes)
+
+    times: List[datetime.datetime] = []
+    while current + step <= end_dt_local:
+        times.append(current.astimezone(datetime.timezone.utc))
+        current += step
+    return times
+
+
+def bulk_create_availabilities(
     db: Session,
-    target_date: datetime.date,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    weekdays: Optional[Set[int]] = None,
     start_hour: int = 8,
     end_hour: int = 17,
     step_minutes: int = 90,
 ) -> List[models.Availability]:
     """
-    Creates availability slots for ``target_date`` starting at ``start_hour``:00
-    Europe/Berlin time, in ``step_minutes`` intervals. Each slot must end at or
-    before ``end_hour``:00 Berlin time. Slots already present for that Berlin
-    calendar day (matched by Berlin hour+minute) are skipped, so the endpoint
-    is safe to call repeatedly.
+    Creates the slots for every day from ``start_date`` through ``end_date``
+    whose ISO weekday (Mon=1 .. Sun=7) is in ``weekdays`` (default: all), laid
+    out as in ``_slot_times``.
+
+    All slots go in with one set-based ``INSERT ... ON CONFLICT (time) DO
+    NOTHING RETURNING``. Times that already have a slot are skipped by the
+    unique index on ``availabilities.time``, so the call is safe to repeat.
+    Returns only the newly created slots, ordered by time.
 
     Stored datetimes are timezone-aware (UTC in the timestamptz column).
     """
-    # Build the day range in Berlin local time, then convert to UTC for DB ops.
-    start_dt_local = datetime.datetime.combine(
-        target_date, datetime.time(start_hour, 0), tzinfo=BUSINESS_TZ
-    )
-    end_dt_local = datetime.datetime.combine(
-        target_date, datetime.time(end_hour, 0), tzinfo=BUSINESS_TZ
-    )
-    step = datetime.timedelta(minutes=step_minutes)
+    rows = []
+    day = start_date
+    while day <= end_date:
+        if weekdays is None or day.isoweekday() in weekdays:
+            rows.extend(
+                {"time": t, "is_taken": False}
+                for t in _slot_times(day, start_hour, end_hour, step_minutes)
+            )
+        day += datetime.timedelta(days=1)
+    if not rows:
+        return []
 
-    candidates: List[datetime.datetime] = []
-    current = start_dt_local
-    while current + step <= end_dt_local:
-        candidates.append(current.astimezone(datetime.timezone.utc))
-        current += step
+    created = db.scalars(
+        pg_insert(models.Availability)
+        .on_conflict_do_nothing(index_elements=[models.Availability.time])
+        .returning(models.Availability),
+        rows,
+    ).all()
+    db.commit()
+    return sorted(created, key=lambda av: av.time)
 
-    if not candidates:
-        return []
 
-    # Existing slots for the Berlin calendar day, queried in UTC bounds.
-    day_start_local = datetime.datetime.combine(
-        target_date, datetime.time.min, tzinfo=BUSINESS_TZ
-    )
-    day_end_local = day_start_local + datetime.timedelta(days=1)
-    day_start_utc = day_start_local.astimezone(datetime.timezone.utc)
-    day_end_utc = day_end_local.astimezone(datetime.timezone.utc)
+def bulk_create_availabilities_for_day(
+    db: Session,
+    target_date: datetime.date,
+    start_hour: int = 8,
+    end_hour: int = 17,
+    step_minutes: int = 90,
+) -> List[models.Availability]:
+    """
+    Creates availability slots for ``target_date`` starting at ``start_hour``:00
+    Europe/Berlin time, in ``step_minutes`` intervals. Each slot must end at or
+    before ``end_hour``:00 Berlin time. Slots already present at the same time
+    are skipped, so the endpoint is safe to call repeatedly.
 
-    existing = (
-        db.query(models.Availability)
-        .filter(
-            models.Availability.time >= day_start_utc,
-            models.Availability.time < day_end_utc,
-        )
-        .all()
+    Single-day form of ``bulk_create_availabilities``.
+    """
+    return bulk_create_availabilities(
+        db, target_date, target_date,
+        start_hour=start_hour, end_hour=end_hour, step_minutes=step_minutes,
     )
-    # Compare on (hour, minute) in Berlin local to match how operators think.
-    existing_hm = {
-        (
-            av.time.astimezone(BUSINESS_TZ).hour,
-            av.time.astimezone(BUSINESS_TZ).minute,
-        )
-        for av in existing
-        if av.time is not None
-    }
-
-    created: List[models.Availability] = []
-    for slot_time_utc in candidates:
-        local = slot_time_utc.astimezone(BUSINESS_TZ)
-        if (local.hour, local.minute) in existing_hm:
-            continue
-        db_av = models.Availability(time=slot_time_utc, is_taken=False)
-        db.add(db_av)
-        created.append(db_av)
-
-    db.commit()
-    for av in created:
-        db.refresh(av)
-    return created
 
 
 def get_active_services(
     db: Session,
     brand: Optional[models.BrandEnum] = None,
     skip: int = 0,
-    limit: int = 100,
+    limit: Optional[int] = 100,
 ) -> List[models.Service]:
     """
     Retrieves a list of services that are currently active.
     When ``brand`` is provided, only that brand's catalog is returned.
+    ``limit=None`` returns the whole catalog (used by app/catalog.py).
     """
     query = db.query(models.Service).filter(models.Service.is_active == True)
     if brand is not None:
@@ -302,75 +685,333 @@ def create_service(db: Session, service: schemas.ServiceCreate) -> models.Servic
 
 def update_order_status(db: Session, order_id: int, new_status: schemas.OrderStatusEnum) -> Optional[models.Order]:
     """
-    Flip the top-level status of an order (open/completed/cancelled).
-    When the new status is COMPLETED, every non-completed process step on the
-    order is also marked completed so the UI stays consistent.
+    Flip the top-level status of an order (open/completed/cancelled) and bump
+    its version. When the new status is COMPLETED, every non-completed process
+    step on the order is also marked completed so the UI stays consistent.
     Returns the updated order, or None if not found.
-    """
-    db_order = db.query(models.Order).filter(models.Order.id == order_id).first()
-    if db_order is None:
-        return None
-
-    db_order.status = new_status
 
-    # Mark every step completed when the order is being completed.
+    The order's steps are locked (in id order) before the order row, the same
+    order step transitions and bulk updates take them in, so these never
+    deadlock with each other.
+    """
+    PS = models.ProcessStep
+    siblings = select(PS.id).where(PS.order_id == order_id).order_by(PS.id).with_for_update(key_share=True)
     if new_status == schemas.OrderStatusEnum.COMPLETED:
-        steps = (
-            db.query(models.ProcessStep)
-            .filter(models.ProcessStep.order_id == order_id)
-            .all()
+        db.execute(
+            update(PS)
+            .where(PS.id.in_(siblings), PS.status != models.ProcessStepStatusEnum.COMPLETED)
+            .values(status=models.ProcessStepStatusEnum.COMPLETED)
+            .execution_options(synchronize_session=False)
         )
-        for step in steps:
-            if getattr(step.status, "value", step.status) != "completed":
-                step.status = models.ProcessStepStatusEnum.COMPLETED
-
+    else:
+        db.execute(siblings).all()
+    db_order = db.scalars(
+        update(models.Order)
+        .where(models.Order.id == order_id)
+        .values(status=models.OrderStatusEnum(new_status.value), version=models.Order.version + 1)
+        .returning(models.Order)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    ).one_or_none()
+    if db_order is not None:
+        order_events.notify_orders(db, [order_id])
     db.commit()
-    db.refresh(db_order)
     return db_order
 
 
-def update_process_step_status(db: Session, step_id: int, new_status: schemas.ProcessStepStatusEnum) -> Optional[models.ProcessStep]:
-    db_step = db.query(models.ProcessStep).filter(models.ProcessStep.id == step_id).first()
-    if db_step is None:
-        return None
+class StepTransition(NamedTuple):
+    """Result of ``update_process_step_status``: the step and its order's status."""
+    step: models.ProcessStep
+    order_status: models.OrderStatusEnum
+    order_completed: bool  # this transition auto-completed the order
 
-    # Normalize to the model's enum class so SQLAlchemy serializes consistently.
-    new_status_model = models.ProcessStepStatusEnum(new_status.value)
-    db_step.status = new_status_model
-    # db_step.updated_at = datetime.datetime.utcnow()  # Update the timestamp
-    db.commit()
-    db.refresh(db_step)
-
-    # If this update means every step on the order is now completed, auto-mark
-    # the parent order as completed too (saves the cleaner a second click).
-    if new_status_model == models.ProcessStepStatusEnum.COMPLETED:
-        order = (
-            db.query(models.Order)
-            .filter(models.Order.id == db_step.order_id)
-            .first()
+
+@lru_cache(maxsize=None)
+def _step_transition(completing: bool, scoped: bool):
+    """
+    The statement behind ``update_process_step_status`` (parameters
+    ``step_id``, ``new_status`` and, when ``scoped``, ``order_uuid``; none may
+    share a column's name, or the UPDATEs would SET it). Built once per shape:
+    constructing it costs more than running it.
+    """
+    owner = select(models.ProcessStep.order_id).where(models.ProcessStep.id == bindparam("step_id"))
+    if scoped:
+        owner = owner.where(
+            models.ProcessStep.order_id
+            == select(models.Order.id).where(models.Order.uuid == bindparam("order_uuid")).scalar_subquery()
         )
-        if order is None:
-            print(f"[auto-complete] step {step_id} has no parent order?", flush=True)
-            return db_step
-
-        # Compare on raw string values to sidestep any enum-class drift.
-        all_steps = (
-            db.query(models.ProcessStep)
-            .filter(models.ProcessStep.order_id == order.id)
-            .all()
+    siblings = (
+        select(
+            models.ProcessStep.id, models.ProcessStep.order_id, models.ProcessStep.name,
+            models.ProcessStep.status, models.ProcessStep.updated_at,
         )
-        statuses = [getattr(s.status, "value", s.status) for s in all_steps]
-        all_done = bool(statuses) and all(v == "completed" for v in statuses)
-        order_status_value = getattr(order.status, "value", order.status)
-        print(
-            f"[auto-complete] order={order.id} step={step_id} order_status={order_status_value} "
-            f"step_statuses={statuses} all_done={all_done}",
-            flush=True,
+        .where(models.ProcessStep.order_id == owner.scalar_subquery())
+        .order_by(models.ProcessStep.id)
+        .with_for_update(key_share=True)
+        .cte("siblings")
+    )
+    step = (
+        update(models.ProcessStep)
+        .where(models.ProcessStep.id.in_(
+            select(siblings.c.id).where(siblings.c.id == bindparam("step_id"))
+        ))
+        .values(status=bindparam("new_status"))
+        .returning(*models.ProcessStep.__table__.c)
+        .cte("step")
+    )
+    # Every transition bumps the order's version; the last step completed
+    # also completes an OPEN order.
+    order_id = select(step.c.order_id).scalar_subquery()
+    values = {"version": models.Order.version + 1}
+    completed = literal(False)
+    if completing:
+        # The order row as it is before this statement, locked after its
+        # steps (max() reads them all first). Every other step was already
+        # completed when none of the locked rows says otherwise.
+        before = (
+            select(models.Order.id, models.Order.status)
+            .where(models.Order.id == select(func.max(siblings.c.order_id)).scalar_subquery())
+            .with_for_update(key_share=True)
+            .cte("before")
+        )
+        completes = and_(
+            select(before.c.status).scalar_subquery() == models.OrderStatusEnum.OPEN,
+            ~select(siblings.c.id)
+            .where(
+                siblings.c.id != bindparam("step_id"),
+                siblings.c.status != models.ProcessStepStatusEnum.COMPLETED,
+            )
+            .exists(),
+        )
+        order_id = select(before.c.id).where(select(step.c.id).exists()).scalar_subquery()
+        values["status"] = case(
+            (completes, literal(models.OrderStatusEnum.COMPLETED, models.Order.status.type)),
+            else_=models.Order.status,
+        )
+        completed = completes
+    order = (
+        update(models.Order)
+        .where(models.Order.id == order_id)
+        .values(**values)
+        .returning(models.Order.phone_identifier, models.Order.brand, models.Order.status, models.Order.version)
+        .cte("order")
+    )
+    # The order's steps as they are after this statement (its own updates
+    # aren't visible to the rest of it), for the live progress event.
+    steps = (
+        select(func.json_agg(aggregate_order_by(
+            order_events.step_json(
+                siblings.c.id, siblings.c.name,
+                func.coalesce(step.c.status, siblings.c.status),
+                case((step.c.id.is_not(None), step.c.updated_at), else_=siblings.c.updated_at),
+            ),
+            siblings.c.id,
+        )))
+        .select_from(siblings.outerjoin(step, step.c.id == siblings.c.id))
+        .scalar_subquery()
+    )
+    return (
+        select(
+            aliased(models.ProcessStep, step), order.c.status, completed,
+            order_events.notify(
+                step.c.order_id, order.c.phone_identifier, order.c.brand, order.c.status, order.c.version, steps,
+            ),
         )
-        if all_done and order_status_value == "open":
-            order.status = models.OrderStatusEnum.COMPLETED
-            db.commit()
-            db.refresh(order)
-            print(f"[auto-complete] order={order.id} → completed", flush=True)
+        .select_from(step.join(order, true()))
+        .execution_options(populate_existing=True)
+    )
+
 
-    return db_step
\ No newline at end of file
+def update_process_step_status(
+    db: Session,
+    step_id: int,
+    new_status: schemas.ProcessStepStatusEnum,
+    order_uuid: Optional[str] = None,
+) -> Optional[StepTransition]:
+    """
+    Set a step's status and, when that leaves every step of an OPEN order
+    completed, mark the order COMPLETED too. Bumps the order's version either
+    way. One statement, one round trip.
+
+    With ``order_uuid``, the step must belong to that order (None otherwise),
+    so a forged URL can't touch someone else's order.
+
+    The statement first locks all of the order's steps in id order. Under READ
+    COMMITTED, a transaction that had to wait for those locks reads the
+    siblings as committed by the one before it, so when two cleaners complete
+    the last two steps at once the second one sees the first and completes
+    the order.
+    """
+    step_status = models.ProcessStepStatusEnum(new_status.value)
+    statement = _step_transition(
+        completing=step_status == models.ProcessStepStatusEnum.COMPLETED,
+        scoped=order_uuid is not None,
+    )
+    params = {"step_id": step_id, "new_status": step_status}
+    if order_uuid is not None:
+        params["order_uuid"] = order_uuid
+    row = db.execute(statement, params).one_or_none()
+    db.commit()
+    return StepTransition(*row[:3]) if row is not None else None
+
+
+def _enum_case(column, mapping: dict, type_, else_=None):
+    """``CASE column WHEN key THEN value ... ELSE else_ END`` cast to the enum ``type_``."""
+    if not mapping:
+        return else_
+    return cast(case({k: literal(v, type_) for k, v in mapping.items()}, value=column, else_=else_), type_)
+
+
+def bulk_update_statuses(
+    db: Session,
+    step_updates: List[schemas.StepStatusUpdate],
+    order_updates: List[schemas.OrderStatusUpdate],
+) -> Tuple[List[dict], List[dict]]:
+    """
+    Apply many step and order transitions in one transaction and return one
+    result per item (see ``schemas.BulkStatusResult``), in request order.
+    Items that can't be applied (unknown step or order, an item repeating an
+    earlier one) are reported and skipped; the rest are applied.
+
+    Step transitions go first and auto-complete orders like
+    ``update_process_step_status``; order transitions go last, so an explicit
+    order status wins, and completing an order completes its steps (like
+    ``update_order_status``). Every order touched gets one version bump.
+    Six statements however many items there are, the last one announcing the
+    changed orders to live subscribers.
+    """
+    PS, O = models.ProcessStep, models.Order
+    step_ids = {u.step_id for u in step_updates if u.step_id is not None}
+    uuids = {u.order_uuid for u in step_updates if u.step_id is None and u.order_uuid}
+    uuids |= {u.order_uuid for u in order_updates}
+
+    # 1. Lock every step of every order involved, in id order (the same order
+    #    update_process_step_status uses), which also reads them current.
+    touched = select(PS.order_id).where(PS.id.in_(step_ids)).union(select(O.id).where(O.uuid.in_(uuids)))
+    rows = db.execute(
+        select(PS, O.uuid)
+        .join(PS.order)
+        .where(PS.order_id.in_(touched))
+        .order_by(PS.id)
+        .with_for_update(of=PS, key_share=True)
+    ).all()
+    # 2. Then the orders themselves, so their status is current too.
+    order_uuid, order_status = {}, {}
+    for order_id, uuid, status in db.execute(
+        select(O.id, O.uuid, O.status).where(O.id.in_(touched)).order_by(O.id).with_for_update(key_share=True)
+    ):
+        order_uuid[order_id] = uuid
+        order_status[order_id] = status
+    steps = {step.id: step for step, _ in rows}
+    by_name = {}
+    steps_of = {}
+    for step, uuid in rows:
+        by_name.setdefault((uuid, step.name), step)
+        steps_of.setdefault(step.order_id, {})[step.id] = step.status
+
+    step_results: List[dict] = []
+    new_step_status = {}
+    for u in step_updates:
+        step = None
+        if u.step_id is not None:
+            step = steps.get(u.step_id)
+            if step is not None and u.order_uuid and order_uuid[step.order_id] != u.order_uuid:
+                step = None
+        elif u.order_uuid and u.name:
+            step = by_name.get((u.order_uuid, u.name))
+        else:
+            step_results.append({"ok": False, "error": "Give step_id, or order_uuid and name"})
+            continue
+        if step is None:
+            step_results.append({"ok": False, "error": "Process step not found", "order_uuid": u.order_uuid})
+        elif step.id in new_step_status:
+            step_results.append({"ok": False, "error": "Step already updated by an earlier item", "step": step})
+        else:
+            new_step_status[step.id] = models.ProcessStepStatusEnum(u.status.value)
+            step_results.append({"ok": True, "step": step})
+
+    order_results: List[dict] = []
+    new_order_status = {}
+    for u in order_updates:
+        if u.order_uuid in new_order_status:
+            order_results.append({"order_uuid": u.order_uuid, "ok": False, "error": "Order already updated by an earlier item"})
+        else:
+            new_order_status[u.order_uuid] = models.OrderStatusEnum(u.status.value)
+            order_results.append({"order_uuid": u.order_uuid, "ok": True})
+
+    # Orders whose steps are all completed once this batch is applied, where
+    # this batch completed at least one of them.
+    auto_complete = set()
+    for step_id, status in new_step_status.items():
+        order_id = steps[step_id].order_id
+        steps_of[order_id][step_id] = status
+    for step_id, status in new_step_status.items():
+        order_id = steps[step_id].order_id
+        if (
+            status == models.ProcessStepStatusEnum.COMPLETED
+            and order_status[order_id] == models.OrderStatusEnum.OPEN
+            and order_uuid[order_id] not in new_order_status
+            and all(s == models.ProcessStepStatusEnum.COMPLETED for s in steps_of[order_id].values())
+        ):
+            auto_complete.add(order_uuid[order_id])
+
+    # 3. The step transitions.
+    if new_step_status:
+        db.scalars(
+            update(PS)
+            .where(PS.id.in_(new_step_status))
+            .values(status=_enum_case(PS.id, new_step_status, PS.status.type))
+            .returning(PS)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).all()
+
+    # 4. Explicit order transitions and auto-completions (exact: the order
+    #    rows are locked), and a version bump for every order changed.
+    step_orders = {steps[step_id].order_id for step_id in new_step_status}
+    updated = []
+    if new_order_status or step_orders:
+        targets = {**{uuid: models.OrderStatusEnum.COMPLETED for uuid in auto_complete}, **new_order_status}
+        updated = db.execute(
+            update(O)
+            .where(or_(O.uuid.in_(new_order_status), O.id.in_(step_orders)))
+            .values(
+                status=_enum_case(O.uuid, targets, O.status.type, else_=O.status),
+                version=O.version + 1,
+            )
+            .returning(O.id, O.uuid, O.status)
+            .execution_options(synchronize_session=False)
+        ).all()
+        for order_id, uuid, status in updated:
+            order_uuid[order_id] = uuid
+            order_status[order_id] = status
+
+        # 5. Completing an order completes its remaining steps.
+        completed_orders = [
+            order_id for order_id, uuid, status in updated
+            if uuid in new_order_status and status == models.OrderStatusEnum.COMPLETED
+        ]
+        if completed_orders:
+            db.scalars(
+                update(PS)
+                .where(PS.order_id.in_(completed_orders), PS.status != models.ProcessStepStatusEnum.COMPLETED)
+                .values(status=models.ProcessStepStatusEnum.COMPLETED)
+                .returning(PS)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            ).all()
+
+        status_by_uuid = {uuid: status for _, uuid, status in updated}
+        for result in order_results:
+            if result["ok"]:
+                if result["order_uuid"] in status_by_uuid:
+                    result["status"] = status_by_uuid[result["order_uuid"]]
+                else:
+                    result.update(ok=False, error="Order not found")
+
+    order_events.notify_orders(db, [order_id for order_id, _, _ in updated])
+    db.commit()
+    for result in step_results:
+        step = result.get("step")
+        if step is not None:
+            result["order_uuid"] = order_uuid[step.order_id]
+            result["order_status"] = order_status[step.order_id]
+            result["order_completed"] = result["ok"] and result["order_uuid"] in auto_complete
+    return step_results, order_results
@@ -0,0 +1,263 @@
+# app/crud_async.py
+"""
+Awaitable versions of the functions in ``crud.py`` for the ``async def`` routes.
+
+Each one accepts either session flavour (see ``database.get_session``):
+
+* ``AsyncSession`` (DB_ASYNC=1): the query logic runs through
+  ``AsyncSession.run_sync`` on the asyncpg driver, so the event loop keeps
+  serving other requests while Postgres works.
+* sync ``Session`` (default): the blocking call is moved to Starlette's
+  threadpool instead of running on the event loop.
+
+Both modes share the query code in ``crud.py`` — add new queries there and
+expose them here with a one-line wrapper.
+"""
+import datetime
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from . import crud, models, outbox, schemas
+from .database import AnySession
+
+
+async def run(db: AnySession, fn, *args, **kwargs):
+    """Call the sync CRUD function ``fn(db, *args, **kwargs)`` without blocking the loop."""
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+async def run_and_close(db: AnySession, fn, *args, **kwargs):
+    """
+    ``run``, then give the session's connection back to the pool in the same
+    call, e.g. before a long-lived streaming response (the dependency would
+    only close it once the response ends). A separate ``close`` call could
+    queue behind requests waiting for that very connection.
+    """
+    if isinstance(db, AsyncSession):
+        try:
+            return await db.run_sync(fn, *args, **kwargs)
+        finally:
+            await db.close()
+
+    def call():
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(call)
+
+
+# --- Orders -----------------------------------------------------------------
+
+async def get_orders(
+    db: AnySession,
+    phone_identifier: str,
+    brand: Optional[models.BrandEnum] = None,
+    skip: int = 0,
+    limit: int = 100,
+    before: Optional[Tuple[datetime.datetime, int]] = None,
+) -> List[models.Order]:
+    return await run(
+        db, crud.get_orders, phone_identifier, brand=brand, skip=skip, limit=limit, before=before,
+    )
+
+
+async def get_order_summaries(
+    db: AnySession,
+    phone_identifier: str,
+    brand: Optional[models.BrandEnum] = None,
+    skip: int = 0,
+    limit: int = 100,
+    before: Optional[Tuple[datetime.datetime, int]] = None,
+) -> list:
+    return await run(
+        db, crud.get_order_summaries, phone_identifier,
+        brand=brand, skip=skip, limit=limit, before=before,
+    )
+
+
+async def get_order_by_phone_identifier_and_id(
+    db: AnySession,
+    phone_identifier: str,
+    order_id: int,
+    brand: Optional[models.BrandEnum] = None,
+) -> Optional[models.Order]:
+    return await run(
+        db, crud.get_order_by_phone_identifier_and_id,
+        phone_identifier=phone_identifier, order_id=order_id, brand=brand,
+    )
+
+
+async def get_order_version(
+    db: AnySession,
+    phone_identifier: str,
+    order_id: int,
+    brand: Optional[models.BrandEnum] = None,
+) -> Optional[int]:
+    return await run(db, crud.get_order_version, phone_identifier, order_id, brand=brand)
+
+
+async def get_order_page_digest(
+    db: AnySession,
+    phone_identifier: str,
+    brand: Optional[models.BrandEnum] = None,
+    skip: int = 0,
+    limit: int = 100,
+    before: Optional[Tuple[datetime.datetime, int]] = None,
+) -> str:
+    return await run(
+        db, crud.get_order_page_digest, phone_identifier,
+        brand=brand, skip=skip, limit=limit, before=before,
+    )
+
+
+async def get_order_by_uuid(db: AnySession, order_uuid: str) -> Optional[models.Order]:
+    return await run(db, crud.get_order_by_uuid, order_uuid)
+
+
+async def get_order_progress(
+    db: AnySession,
+    phone_identifier: str,
+    brand: models.BrandEnum,
+    order_id: Optional[int] = None,
+) -> List[dict]:
+    """Closes the session: this is what an event stream reads before it starts."""
+    return await run_and_close(db, crud.get_order_progress, phone_identifier, brand, order_id=order_id)
+
+
+async def get_open_orders(
+    db: AnySession,
+    brand: models.BrandEnum,
+    start_date: Optional[datetime.date] = None,
+    end_date: Optional[datetime.date] = None,
+    step_status: Optional[models.ProcessStepStatusEnum] = None,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime.datetime, int]] = None,
+) -> List[models.Order]:
+    return await run(
+        db, crud.get_open_orders, brand,
+        start_date=start_date, end_date=end_date, step_status=step_status, limit=limit, after=after,
+    )
+
+
+async def create_order(db: AnySession, order: schemas.OrderCreate) -> models.Order:
+    return await run(db, crud.create_order, order)
+
+
+async def update_order_status(
+    db: AnySession, order_id: int, new_status: schemas.OrderStatusEnum,
+) -> Optional[models.Order]:
+    return await run(db, crud.update_order_status, order_id, new_status)
+
+
+# --- Process steps ----------------------------------------------------------
+
+async def get_process_step(db: AnySession, step_id: int) -> Optional[models.ProcessStep]:
+    return await run(db, crud.get_process_step, step_id)
+
+
+async def update_process_step_status(
+    db: AnySession,
+    step_id: int,
+    new_status: schemas.ProcessStepStatusEnum,
+    order_uuid: Optional[str] = None,
+) -> Optional[crud.StepTransition]:
+    return await run(db, crud.update_process_step_status, step_id, new_status, order_uuid=order_uuid)
+
+
+async def bulk_update_statuses(
+    db: AnySession,
+    step_updates: List[schemas.StepStatusUpdate],
+    order_updates: List[schemas.OrderStatusUpdate],
+) -> Tuple[List[dict], List[dict]]:
+    return await run(db, crud.bulk_update_statuses, step_updates, order_updates)
+
+
+# --- Availabilities ---------------------------------------------------------
+
+async def get_availability_by_id(db: AnySession, availability_id: int):
+    return await run(db, crud.get_availability_by_id, availability_id)
+
+
+async def get_available_availabilities(
+    db: AnySession,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    skip: int = 0,
+    limit: Optional[int] = 100,
+    after: Optional[Tuple[datetime.datetime, int]] = None,
+) -> List[models.Availability]:
+    return await run(
+        db, crud.get_available_availabilities,
+        start_date=start_date, end_date=end_date, skip=skip, limit=limit, after=after,
+    )
+
+
+async def create_availability(
+    db: AnySession, availability: schemas.AvailabilityCreate,
+) -> models.Availability:
+    return await run(db, crud.create_availability, availability)
+
+
+async def bulk_create_availabilities(
+    db: AnySession,
+    start_date: datetime.date,
+    end_date: datetime.date,
+    weekdays: Optional[Set[int]] = None,
+    start_hour: int = 8,
+    end_hour: int = 17,
+    step_minutes: int = 90,
+) -> List[models.Availability]:
+    return await run(
+        db, crud.bulk_create_availabilities,
+        start_date=start_date, end_date=end_date, weekdays=weekdays,
+        start_hour=start_hour, end_hour=end_hour, step_minutes=step_minutes,
+    )
+
+
+async def bulk_create_availabilities_for_day(
+    db: AnySession,
+    target_date: datetime.date,
+    start_hour: int = 8,
+    end_hour: int = 17,
+    step_minutes: int = 90,
+) -> List[models.Availability]:
+    return await run(
+        db, crud.bulk_create_availabilities_for_day,
+        target_date=target_date, start_hour=start_hour,
+        end_hour=end_hour, step_minutes=step_minutes,
+    )
+
+
+# --- Services ---------------------------------------------------------------
+
+async def get_active_services(
+    db: AnySession,
+    brand: Optional[models.BrandEnum] = None,
+    skip: int = 0,
+    limit: Optional[int] = 100,
+) -> List[models.Service]:
+    return await run(db, crud.get_active_services, brand=brand, skip=skip, limit=limit)
+
+
+async def create_service(db: AnySession, service: schemas.ServiceCreate) -> models.Service:
+    return await run(db, crud.create_service, service)
+
+
+# --- Email outbox -----------------------------------------------------------
+
+async def get_outbox_stats(db: AnySession) -> dict:
+    return await run(db, outbox.stats)
+
+
+async def get_dead_letters(db: AnySession, limit: int = 100) -> List[models.EmailOutbox]:
+    return await run(db, outbox.dead_letters, limit=limit)
+
+
+async def requeue_outbox_email(db: AnySession, outbox_id: int) -> bool:
+    return await run(db, outbox.requeue, outbox_id)
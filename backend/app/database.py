@@ -1,22 +1,162 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+from typing import Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from dotenv import load_dotenv
 
 load_dotenv() # Load environment variables from .env
 
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 
+# DB_ASYNC=1 serves every route through an AsyncEngine/AsyncSession (asyncpg)
+# so a slow query no longer stalls the event loop. Read once at startup; the
+# default keeps the original sync psycopg2 Session.
+USE_ASYNC_DB = os.getenv("DB_ASYNC", "0") == "1"
+
+
+# --- Connection pool ----------------------------------------------------------
+# Every knob comes from the environment so each deployment can size its pool
+# against Postgres' connection limit:
+#   DB_POOL_SIZE          persistent connections per worker process (default 5)
+#   DB_MAX_OVERFLOW       extra short-lived connections under bursts (default 10)
+#   DB_POOL_RECYCLE       seconds before a connection is replaced (default 1800;
+#                         -1 disables). Keeps us under server/proxy idle timeouts.
+#   DB_POOL_TIMEOUT       seconds to wait for a free connection (default 30)
+#   DB_POOL_LIFO          1 = reuse the most recently returned connection, so
+#                         idle extras age out and get recycled (default 1)
+#   DB_POOL_PRE_PING      1 = test each connection on checkout (default 1). It
+#                         costs a round trip per checkout; with a recycle below
+#                         the server idle timeout it can usually be turned off.
+#
+# Per-worker sizing: when DB_POOL_SIZE is unset but DB_MAX_CONNECTIONS is, the
+# budget is split across the WEB_CONCURRENCY uvicorn workers (pool size =
+# budget // workers, no overflow), so N workers never exceed the budget.
+def _env_int(key: str, default: int) -> int:
+    value = os.getenv(key)
+    return int(value) if value not in (None, "") else default
+
+
+def _pool_settings() -> dict:
+    workers = max(1, _env_int("WEB_CONCURRENCY", 1))
+    budget = _env_int("DB_MAX_CONNECTIONS", 0)
+    if os.getenv("DB_POOL_SIZE") is None and budget > 0:
+        pool_size = max(1, budget // workers)
+        max_overflow = 0
+    else:
+        pool_size = _env_int("DB_POOL_SIZE", 5)
+        max_overflow = _env_int("DB_MAX_OVERFLOW", 10)
+    return {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        "pool_use_lifo": os.getenv("DB_POOL_LIFO", "1") == "1",
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "1") == "1",
+    }
+
+
+POOL_SETTINGS = _pool_settings()
+
+
+class PoolStats:
+    """Counters collected from pool events for one engine (per worker process)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits_total_s = 0.0
+        self.waits_max_s = 0.0
+        self.timeouts = 0
+        self.connects = 0
+        self.pre_ping_failures = 0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.waits_total_s += seconds
+            self.waits_max_s = max(self.waits_max_s, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self, pool) -> dict:
+        """Counters plus the live pool state, as plain JSON-able values."""
+        with self._lock:
+            return {
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "checkouts": self.checkouts,
+                "wait_avg_ms": round(1000 * self.waits_total_s / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(1000 * self.waits_max_s, 3),
+                "checkout_timeouts": self.timeouts,
+                "connects": self.connects,
+                "pre_ping_failures": self.pre_ping_failures,
+            }
+
+    def incr(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+def _timed_pool(base, stats: PoolStats):
+    """A ``base`` pool subclass that records how long each checkout waited.
+
+    ``stats`` lives on the class so it survives ``engine.dispose()``, which
+    rebuilds the pool from the same class.
+    """
+
+    class _TimedPool(base):
+        def _do_get(self):
+            start = time.perf_counter()
+            try:
+                conn = super()._do_get()
+            except Exception:
+                self.stats.record_wait(time.perf_counter() - start, timed_out=True)
+                raise
+            self.stats.record_wait(time.perf_counter() - start)
+            return conn
+
+    _TimedPool.stats = stats
+    _TimedPool.__name__ = f"Timed{base.__name__}"
+    return _TimedPool
+
+
+def _instrument(sync_engine, stats: PoolStats) -> None:
+    @event.listens_for(sync_engine.pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.incr("connects")
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context):
+        if context.is_pre_ping:
+            stats.incr("pre_ping_failures")
+
+
 # Create the SQLAlchemy engine
-# pool_pre_ping=True helps with long-lived connections
-engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
+engine_stats = PoolStats()
+engine = create_engine(
+    SQLALCHEMY_DATABASE_URL, poolclass=_timed_pool(QueuePool, engine_stats), **POOL_SETTINGS,
+)
+_instrument(engine, engine_stats)
 
 # Create a SessionLocal class for database sessions
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False (as in async mode): objects a route has already
+# loaded stay usable after commit instead of being re-SELECTed on access.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
 # Base class for declarative models
 Base = declarative_base()
 
+# Either session flavour; routes receive whichever mode is active.
+AnySession = Union[Session, AsyncSession]
+
 # Dependency to get a database session
 def get_db():
     db = SessionLocal()
@@ -25,11 +165,64 @@ def get_db():
     finally:
         db.close()
 
-# For async operations with SQLAlchemy, you'd use AsyncEngine and AsyncSession
-# from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-# ASYNC_SQLALCHEMY_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://")
-# async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, echo=True)
-# AsyncSessionLocal = sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
-# async def get_async_db():
-#     async with AsyncSessionLocal() as session:
-#         yield session
\ No newline at end of file
+
+def _async_database_url(url: str):
+    """
+    Rewrite the libpq-style DATABASE_URL for asyncpg.
+
+    asyncpg rejects libpq query options such as ``sslmode`` and
+    ``channel_binding`` (both present on the Neon URL), so they are stripped
+    and ``sslmode`` is translated into asyncpg's ``ssl`` connect argument.
+    Returns ``(url, connect_args)``.
+    """
+    parsed = make_url(url)
+    query = dict(parsed.query)
+    sslmode = query.pop("sslmode", None)
+    query.pop("channel_binding", None)
+    connect_args = {}
+    if sslmode and sslmode != "disable":
+        connect_args["ssl"] = sslmode
+    parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+    return parsed, connect_args
+
+
+# Only build the async engine when it is switched on, so the sync mode keeps
+# working on hosts where asyncpg isn't installed.
+async_engine = None
+async_engine_stats = None
+AsyncSessionLocal = None
+if USE_ASYNC_DB:
+    _async_url, _async_connect_args = _async_database_url(SQLALCHEMY_DATABASE_URL)
+    async_engine_stats = PoolStats()
+    async_engine = create_async_engine(
+        _async_url, connect_args=_async_connect_args,
+        poolclass=_timed_pool(AsyncAdaptedQueuePool, async_engine_stats), **POOL_SETTINGS,
+    )
+    _instrument(async_engine.sync_engine, async_engine_stats)
+    # expire_on_commit=False: objects returned by a route are serialized after
+    # the commit, and an expired attribute can't be lazily reloaded there.
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False,
+    )
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+# The dependency routes should use: resolves to the mode chosen at startup.
+get_session = get_async_db if USE_ASYNC_DB else get_db
+
+
+def pool_status() -> dict:
+    """Live pool statistics for this worker (see the /api/internal/db/pool route)."""
+    status = {
+        "pid": os.getpid(),
+        "mode": "async" if USE_ASYNC_DB else "sync",
+        "settings": POOL_SETTINGS,
+        "sync": engine_stats.snapshot(engine.pool),
+    }
+    if async_engine is not None:
+        status["async"] = async_engine_stats.snapshot(async_engine.sync_engine.pool)
+    return status
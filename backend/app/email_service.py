@@ -7,29 +7,46 @@ Lightweight email service with two backends:
        RESEND_API_KEY    API key from https://resend.com/api-keys
        RESEND_FROM       verified sender, e.g. "CleanCar <noreply@yourdomain>"
                          (falls back to SMTP_FROM, then onboarding@resend.dev)
+   Requests reuse keep-alive connections (see _ResendClient) and are retried
+   on connection errors, 429 and 5xx: RESEND_TIMEOUT (default 10 s),
+   RESEND_RETRIES (default 2), RESEND_RETRY_BACKOFF (default 0.5 s).
+   send_emails sends several emails per request through the batch endpoint.
+   RESEND_API_URL (default https://api.resend.com) can point at a local stub.
 
 2. SMTP fallback. Requires:
        SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASSWORD, SMTP_FROM,
        SMTP_USE_TLS (default "1"), SMTP_TIMEOUT (default "10")
+   Authenticated connections are pooled per account and reused across sends
+   (see _SMTPPool): up to SMTP_POOL_SIZE idle connections are kept (default
+   4, one per email worker), each for at most SMTP_POOL_MAX_IDLE seconds
+   (default 120).
 
 If neither RESEND_API_KEY nor SMTP_HOST is set, sending is skipped with a
 warning (useful for local dev). Sending is always best-effort: failures are
 caught and logged so order creation never fails because email failed.
+
+Order emails are not sent from request handlers: they are queued in the
+email outbox (app/outbox.py) and delivered, with retries, by the email worker
+(app/email_worker.py).
 """
 
 from __future__ import annotations
 
+import hashlib
+import http.client
 import json
 import logging
 import os
 import smtplib
 import ssl
-import urllib.error
+import threading
+import time
 import urllib.parse
-import urllib.request
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from email.message import EmailMessage
-from typing import Iterable, Optional
+from html import escape
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 from .translations import (
@@ -108,8 +125,9 @@ def _brand_email_config(brand: str) -> dict:
 BOOKING_DURATION_MINUTES = int(os.getenv("BOOKING_DURATION_MINUTES", "90"))
 
 
-def _is_configured() -> bool:
-    return bool(os.getenv("RESEND_API_KEY") or os.getenv("SMTP_HOST"))
+def is_configured(brand: str = "car") -> bool:
+    """True if ``send_email`` has a backend for ``brand`` (Resend, or that brand's SMTP host)."""
+    return bool(os.getenv("RESEND_API_KEY") or _env_brand("SMTP_HOST", brand))
 
 
 def _format_berlin(dt: Optional[datetime]) -> str:
@@ -122,9 +140,133 @@ def _format_berlin(dt: Optional[datetime]) -> str:
     return local.strftime("%A, %B %d, %Y at %H:%M")
 
 
-def _send_via_resend(to: str, from_addr: str, subject: str, body_text: str, body_html: Optional[str]) -> bool:
-    """Send via Resend HTTP API. Returns True on success."""
-    api_key = os.environ["RESEND_API_KEY"]
+RESEND_API_URL = os.getenv("RESEND_API_URL", "https://api.resend.com").rstrip("/")
+RESEND_TIMEOUT = float(os.getenv("RESEND_TIMEOUT", "10"))
+# Extra attempts after a connection error, a 429 or a 5xx answer.
+RESEND_RETRIES = int(os.getenv("RESEND_RETRIES", "2"))
+RESEND_RETRY_BACKOFF = float(os.getenv("RESEND_RETRY_BACKOFF", "0.5"))
+RESEND_POOL_SIZE = int(os.getenv("RESEND_POOL_SIZE", "4"))
+# Resend accepts at most 100 emails per /emails/batch call.
+RESEND_BATCH_SIZE = min(100, int(os.getenv("RESEND_BATCH_SIZE", "100")))
+
+_HTTP_CONNECTION_ERRORS = (http.client.HTTPException, OSError)
+
+
+class _ResendClient:
+    """
+    Keep-alive HTTP(S) connections to the Resend API.
+
+    Each request borrows an idle connection, so the TCP and TLS handshakes
+    happen once per connection instead of once per email. A connection that
+    errors is discarded; the request is retried on a fresh one, as are 429 and
+    5xx answers (after RESEND_RETRY_BACKOFF seconds, doubling). An
+    ``idempotency_key`` makes those retries safe: Resend sends a request with a
+    key it has already seen only once. Up to RESEND_POOL_SIZE idle connections
+    are kept.
+
+    RESEND_API_URL can point at a plain-HTTP stub for local testing.
+    """
+
+    def __init__(self, base_url: str, timeout: float):
+        url = urllib.parse.urlsplit(base_url)
+        self.base_url, self.timeout = base_url, timeout
+        self.secure = url.scheme == "https"
+        self.host, self.port = url.hostname, url.port
+        self.prefix = url.path.rstrip("/")
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.secure:
+            return http.client.HTTPSConnection(
+                self.host, self.port, timeout=self.timeout, context=ssl.create_default_context(),
+            )
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _checkout(self) -> Tuple[http.client.HTTPConnection, bool]:
+        """An idle connection (reused=True), or a new one."""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop(), True
+        return self._connect(), False
+
+    def _checkin(self, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            if len(self._idle) < RESEND_POOL_SIZE:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def _request_once(self, path: str, body: bytes, headers: Dict[str, str]) -> Tuple[int, str]:
+        conn, reused = self._checkout()
+        try:
+            conn.request("POST", self.prefix + path, body=body, headers=headers)
+            resp = conn.getresponse()
+            text = resp.read().decode("utf-8", errors="replace")
+        except _HTTP_CONNECTION_ERRORS as e:
+            conn.close()
+            if not reused or isinstance(e, TimeoutError):
+                raise
+            # The server dropped the idle connection: go again on a fresh one
+            # without spending a retry.
+            return self._request_once(path, body, headers)
+        except BaseException:
+            conn.close()
+            raise
+        if resp.will_close:
+            conn.close()
+        else:
+            self._checkin(conn)
+        return resp.status, text
+
+    def post(self, path: str, payload, idempotency_key: Optional[str] = None) -> Tuple[int, str]:
+        """POST ``payload`` as JSON; returns (status, body) of the last attempt."""
+        headers = {
+            "Authorization": f"Bearer {os.environ['RESEND_API_KEY']}",
+            "Content-Type": "application/json",
+            # Cloudflare in front of api.resend.com blocks the default
+            # Python UA (error 1010); send a normal-looking UA.
+            "User-Agent": "clean-car-app/1.0 (+resend)",
+            "Accept": "application/json",
+        }
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
+        body = json.dumps(payload).encode("utf-8")
+        attempt = 0
+        while True:
+            try:
+                status, text = self._request_once(path, body, headers)
+            except _HTTP_CONNECTION_ERRORS as e:
+                if attempt >= RESEND_RETRIES:
+                    raise
+                logger.warning("Resend %s connection error (%s); retrying", path, e)
+            else:
+                if not (status == 429 or status >= 500) or attempt >= RESEND_RETRIES:
+                    return status, text
+                logger.warning("Resend %s answered %s; retrying", path, status)
+            time.sleep(RESEND_RETRY_BACKOFF * 2 ** attempt)
+            attempt += 1
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+_resend_client: Optional[_ResendClient] = None
+_resend_client_lock = threading.Lock()
+
+
+def _resend() -> _ResendClient:
+    global _resend_client
+    with _resend_client_lock:
+        if _resend_client is None:
+            _resend_client = _ResendClient(RESEND_API_URL, RESEND_TIMEOUT)
+        return _resend_client
+
+
+def _resend_payload(to: str, from_addr: str, subject: str, body_text: str, body_html: Optional[str]) -> dict:
     payload = {
         "from": from_addr,
         "to": [to],
@@ -133,40 +275,195 @@ def _send_via_resend(to: str, from_addr: str, subject: str, body_text: str, body
     }
     if body_html:
         payload["html"] = body_html
+    return payload
 
-    req = urllib.request.Request(
-        url="https://api.resend.com/emails",
-        data=json.dumps(payload).encode("utf-8"),
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-            # Cloudflare in front of api.resend.com blocks the default
-            # Python-urllib UA (error 1010); send a normal-looking UA.
-            "User-Agent": "clean-car-app/1.0 (+resend)",
-            "Accept": "application/json",
-        },
-        method="POST",
-    )
+
+def _send_via_resend(to: str, from_addr: str, subject: str, body_text: str, body_html: Optional[str],
+                     idempotency_key: Optional[str] = None) -> bool:
+    """Send via Resend HTTP API. Returns True on success."""
     print(f"[email] resend POST from={from_addr} to={to}", flush=True)
-    try:
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            status = resp.status
-            body = resp.read().decode("utf-8", errors="replace")
-        print(f"[email] resend status={status} body={body[:200]}", flush=True)
-        return 200 <= status < 300
-    except urllib.error.HTTPError as e:
-        err_body = e.read().decode("utf-8", errors="replace") if e.fp else ""
-        logger.error("Resend HTTPError %s: %s", e.code, err_body)
-        print(f"[email] resend HTTPError {e.code}: {err_body[:300]}", flush=True)
+    status, body = _resend().post(
+        "/emails", _resend_payload(to, from_addr, subject, body_text, body_html), idempotency_key,
+    )
+    print(f"[email] resend status={status} body={body[:200]}", flush=True)
+    if not 200 <= status < 300:
+        logger.error("Resend HTTP %s: %s", status, body)
+        return False
+    return True
+
+
+def _send_batch_via_resend(payloads: List[dict], idempotency_key: Optional[str] = None) -> bool:
+    """Send up to RESEND_BATCH_SIZE emails in one /emails/batch call.
+
+    Resend validates the whole batch up front: it is accepted or refused as a
+    unit, so one flag covers every email in it."""
+    print(f"[email] resend batch POST n={len(payloads)}", flush=True)
+    status, body = _resend().post("/emails/batch", payloads, idempotency_key)
+    print(f"[email] resend batch status={status} body={body[:200]}", flush=True)
+    if not 200 <= status < 300:
+        logger.error("Resend batch HTTP %s: %s", status, body)
         return False
+    return True
+
+
+SMTP_POOL_SIZE = int(os.getenv("SMTP_POOL_SIZE", "4"))
+SMTP_POOL_MAX_IDLE = float(os.getenv("SMTP_POOL_MAX_IDLE", "120"))
+# Connections idle longer than this get a NOOP before reuse.
+SMTP_POOL_CHECK_AFTER = float(os.getenv("SMTP_POOL_CHECK_AFTER", "15"))
+
+# Errors that mean the connection itself is gone (not that the message was refused).
+_SMTP_CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError, ssl.SSLError)
+
+
+class _SMTPPool:
+    """
+    Authenticated SMTP connections for one account (host, port, user, TLS mode).
+
+    A send borrows an idle connection, so EHLO/STARTTLS/LOGIN happen once per
+    connection instead of once per email. Connections that sat idle for a
+    while are checked with NOOP first; ones idle past SMTP_POOL_MAX_IDLE (most
+    servers drop idle clients after a few minutes) are closed instead. A
+    connection that fails mid-send is discarded. Up to SMTP_POOL_SIZE idle
+    connections are kept; extra ones opened under concurrency are closed after use.
+    """
+
+    def __init__(self, host: str, port: int, user: str, password: str, use_tls: bool):
+        self.host, self.port, self.user, self.password, self.use_tls = host, port, user, password, use_tls
+        self._idle: List[Tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        timeout = int(os.getenv("SMTP_TIMEOUT", "10"))
+        print(
+            f"[email] smtp connecting host={self.host} port={self.port} use_tls={self.use_tls}",
+            flush=True,
+        )
+        if self.use_tls:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=timeout)
+            try:
+                smtp.ehlo()
+                smtp.starttls(context=ssl.create_default_context())
+                smtp.ehlo()
+            except Exception:
+                smtp.close()
+                raise
+        else:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=timeout, context=ssl.create_default_context())
+        try:
+            if self.user:
+                smtp.login(self.user, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+
+    @staticmethod
+    def _close(smtp: smtplib.SMTP) -> None:
+        try:
+            smtp.quit()
+        except Exception:  # noqa: BLE001 — already broken; just drop it
+            smtp.close()
+
+    def _checkout(self) -> Tuple[smtplib.SMTP, bool]:
+        """An idle connection that still answers (reused=True), or a new one."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                smtp, idle_since = self._idle.pop()
+            idle_for = time.monotonic() - idle_since
+            if idle_for > SMTP_POOL_MAX_IDLE:
+                self._close(smtp)
+                continue
+            if idle_for > SMTP_POOL_CHECK_AFTER:
+                try:
+                    if smtp.noop()[0] != 250:
+                        raise smtplib.SMTPServerDisconnected("NOOP failed")
+                except Exception:  # noqa: BLE001
+                    smtp.close()
+                    continue
+            return smtp, True
+        return self._connect(), False
+
+    def _checkin(self, smtp: smtplib.SMTP) -> None:
+        with self._lock:
+            if len(self._idle) < SMTP_POOL_SIZE:
+                self._idle.append((smtp, time.monotonic()))
+                return
+        self._close(smtp)
+
+    @contextmanager
+    def connection(self):
+        smtp, reused = self._checkout()
+        try:
+            yield smtp, reused
+        except _SMTP_CONNECTION_ERRORS:
+            smtp.close()
+            raise
+        except smtplib.SMTPResponseException:
+            # The server refused this message; the session itself is still usable
+            # after an RSET.
+            try:
+                smtp.rset()
+            except Exception:  # noqa: BLE001
+                smtp.close()
+                raise
+            self._checkin(smtp)
+            raise
+        except Exception:
+            smtp.close()
+            raise
+        else:
+            self._checkin(smtp)
+
+    def send(self, msg: EmailMessage) -> None:
+        # Connecting can fail before connection() yields: that error is the
+        # caller's to see, not a reason to retry.
+        reused = False
+        try:
+            with self.connection() as (smtp, reused):
+                smtp.send_message(msg)
+        except _SMTP_CONNECTION_ERRORS:
+            if not reused:
+                raise
+            # The pooled connection had gone stale between the check and the
+            # send: retry once on a fresh one.
+            with self.connection() as (smtp, _):
+                smtp.send_message(msg)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for smtp, _ in idle:
+            self._close(smtp)
+
+
+_smtp_pools: Dict[Tuple[str, int, str, bool], _SMTPPool] = {}
+_smtp_pools_lock = threading.Lock()
+
+
+def _smtp_pool(host: str, port: int, user: str, password: str, use_tls: bool) -> _SMTPPool:
+    """The pool for one SMTP account; each brand's credentials get their own."""
+    key = (host, port, user, use_tls)
+    with _smtp_pools_lock:
+        pool = _smtp_pools.get(key)
+        if pool is None or pool.password != password:
+            pool = _smtp_pools[key] = _SMTPPool(host, port, user, password, use_tls)
+        return pool
+
+
+def close_smtp_pools() -> None:
+    """Close every idle pooled SMTP connection (on shutdown)."""
+    with _smtp_pools_lock:
+        pools = list(_smtp_pools.values())
+    for pool in pools:
+        pool.close()
 
 
 def _send_via_smtp(to: str, from_addr: str, subject: str, body_text: str, body_html: Optional[str],
                    host: str, port: int, user: str, password: str, use_tls: bool) -> bool:
-    """Send via SMTP (smtplib) using the supplied (brand-specific) credentials.
-    Returns True on success."""
-    timeout = int(os.getenv("SMTP_TIMEOUT", "10"))
-
+    """Send via SMTP (smtplib) using the supplied (brand-specific) credentials,
+    over a pooled connection. Returns True on success."""
     msg = EmailMessage()
     msg["From"] = from_addr
     msg["To"] = to
@@ -175,23 +472,8 @@ def _send_via_smtp(to: str, from_addr: str, subject: str, body_text: str, body_h
     if body_html:
         msg.add_alternative(body_html, subtype="html")
 
-    print(
-        f"[email] smtp connecting host={host} port={port} use_tls={use_tls} from={from_addr} to={to}",
-        flush=True,
-    )
-    if use_tls:
-        with smtplib.SMTP(host, port, timeout=timeout) as smtp:
-            smtp.ehlo()
-            smtp.starttls(context=ssl.create_default_context())
-            smtp.ehlo()
-            if user:
-                smtp.login(user, password)
-            smtp.send_message(msg)
-    else:
-        with smtplib.SMTP_SSL(host, port, timeout=timeout, context=ssl.create_default_context()) as smtp:
-            if user:
-                smtp.login(user, password)
-            smtp.send_message(msg)
+    print(f"[email] smtp send host={host} port={port} from={from_addr} to={to}", flush=True)
+    _smtp_pool(host, port, user, password, use_tls).send(msg)
     return True
 
 
@@ -247,6 +529,97 @@ def send_email(to: str, subject: str, body_text: str, body_html: Optional[str] =
         return False
 
 
+class OutgoingEmail(NamedTuple):
+    """A rendered email; the fields are ``send_email``'s arguments."""
+    to: str
+    subject: str
+    body_text: str
+    body_html: Optional[str] = None
+    brand: str = "car"
+
+
+def _send_one_via_resend(payload: dict, idempotency_key: Optional[str]) -> bool:
+    try:
+        return _send_via_resend(payload["to"][0], payload["from"], payload["subject"], payload["text"],
+                                payload.get("html"), idempotency_key=idempotency_key)
+    except Exception as e:  # noqa: BLE001 — best-effort, never raise
+        logger.exception("Failed to send email via Resend: %s", e)
+        print(f"[email] FAILED to={payload['to'][0]} error={type(e).__name__}: {e}", flush=True)
+        return False
+
+
+def send_emails(messages: List[OutgoingEmail],
+                idempotency_keys: Optional[List[str]] = None,
+                first_attempt: Optional[List[bool]] = None) -> List[bool]:
+    """Send several emails; returns one success flag per message.
+
+    With Resend, first attempts go out RESEND_BATCH_SIZE at a time through the
+    batch endpoint: one HTTP request instead of one per email. With SMTP each
+    one is sent over its brand's pooled connection. ``idempotency_keys`` (one
+    per message, stable across retries) are forwarded to Resend.
+
+    A batch is accepted or refused as a whole and carries one idempotency key
+    of its own, so:
+
+    * when Resend refuses a batch (say, one invalid recipient), its emails are
+      sent one by one, and only the bad one fails;
+    * retries (``first_attempt`` False) are always sent one by one under their
+      own key, which stays the same however the retried emails are grouped.
+    """
+    if not os.getenv("RESEND_API_KEY"):
+        return [send_email(*m) for m in messages]
+
+    results = [False] * len(messages)
+    payloads: Dict[int, dict] = {}
+    for i, m in enumerate(messages):
+        if m.to:
+            payloads[i] = _resend_payload(m.to, _brand_email_config(m.brand)["from"], m.subject,
+                                          m.body_text, m.body_html)
+        else:
+            logger.warning("Empty recipient; skipping email %r", m.subject)
+
+    def key(i: int) -> Optional[str]:
+        return idempotency_keys[i] if idempotency_keys else None
+
+    batched = [i for i in payloads if first_attempt is None or first_attempt[i]]
+    single = [i for i in payloads if first_attempt is not None and not first_attempt[i]]
+    for start in range(0, len(batched), RESEND_BATCH_SIZE):
+        chunk = batched[start:start + RESEND_BATCH_SIZE]
+        if len(chunk) == 1:
+            single.extend(chunk)
+            continue
+        batch_key = None
+        if idempotency_keys:
+            batch_key = "batch-" + hashlib.sha256("\n".join(key(i) for i in chunk).encode()).hexdigest()
+        logger.info("Sending %s emails backend=resend-batch", len(chunk))
+        try:
+            ok = _send_batch_via_resend([payloads[i] for i in chunk], batch_key)
+        except Exception as e:  # noqa: BLE001 — best-effort, never raise
+            # The batch may or may not have gone out: leave the emails to be
+            # retried, one by one, under their own keys.
+            logger.exception("Failed to send %s emails via Resend: %s", len(chunk), e)
+            print(f"[email] FAILED batch n={len(chunk)} error={type(e).__name__}: {e}", flush=True)
+            continue
+        if ok:
+            for i in chunk:
+                results[i] = True
+        else:
+            # Refused as a whole, so nothing was sent: find the bad ones.
+            single.extend(chunk)
+    for i in single:
+        results[i] = _send_one_via_resend(payloads[i], key(i))
+    return results
+
+
+def close_connections() -> None:
+    """Close the idle pooled SMTP and Resend connections (on shutdown)."""
+    close_smtp_pools()
+    with _resend_client_lock:
+        client = _resend_client
+    if client is not None:
+        client.close()
+
+
 def _to_utc(dt: datetime) -> datetime:
     if dt.tzinfo is None:
         return dt.replace(tzinfo=ZoneInfo("UTC"))
@@ -270,7 +643,78 @@ def _gcal_link(title: str, start: datetime, end: datetime, details: str, locatio
     return "https://calendar.google.com/calendar/render?" + urllib.parse.urlencode(params)
 
 
-def send_booking_confirmation(
+# --- Order emails -------------------------------------------------------------
+# Labels, headings and the static HTML around them depend only on the locale
+# and brand. They are built the first time a (locale, brand) is used and kept
+# in ``_EMAIL_STRINGS``, so a send only interpolates the order's own fields
+# instead of translating every label again (bulk sends, e.g. reminders).
+
+_ROW_HTML = '<tr><td style="padding:4px 12px 4px 0;color:#666;">'
+
+_EMAIL_STRINGS: Dict[Tuple[str, str], Dict[str, str]] = {}
+
+
+def _build_email_strings(loc: str, brand: str) -> Dict[str, str]:
+    s = {
+        field: _tr(f"email.field.{field}", loc)
+        for field in ("order", "name", "when", "where", "vehicle", "phone", "email", "services", "total", "tz_suffix")
+    }
+    for key in ("subject", "greeting", "intro", "outro", "heading", "signature"):
+        s[f"customer.{key}"] = _trb(f"email.customer.{key}", loc, brand)
+    # Subjects and the cleaner heading keep their {order_id} / {when}
+    # placeholders; see _with_fields.
+    for key in ("subject", "intro", "heading", "footer"):
+        s[f"cleaner.{key}"] = _trb(f"email.cleaner.{key}", loc, brand)
+    s["cta_open"] = _tr("email.cleaner.cta_open", loc)
+    s["cta_calendar"] = _tr("email.cleaner.cta_calendar", loc)
+
+    # HTML fragments: a row's label cell, then the value is appended.
+    for field in ("order", "name", "when", "where", "vehicle", "phone", "email"):
+        s[f"row.{field}"] = f'{_ROW_HTML}{s[field]}</td><td>'
+    s["tz_html"] = f' <span style="color:#888;">{s["tz_suffix"]}</span>'
+    s["services_html"] = (
+        f'<p style="margin:8px 0 4px 0;color:#666;">{s["services"]}</p>\n'
+        f'  <ul style="margin:0 0 16px 18px;padding:0;">'
+    )
+    s["html_open"] = (
+        "<!DOCTYPE html>\n<html>\n"
+        '<body style="font-family:-apple-system,Helvetica,Arial,sans-serif;color:#1a1a1a;max-width:560px;margin:0 auto;padding:24px;">\n'
+        '  <h2 style="color:#0EA5A4;margin:0 0 12px 0;">'
+    )
+    s["customer.html_head"] = (
+        f"{s['html_open']}{s['customer.heading']}</h2>\n"
+        f"  <p>{s['customer.intro']}</p>\n"
+        f'  <table style="border-collapse:collapse;margin:16px 0;">\n'
+    )
+    s["customer.html_tail"] = (
+        f"  <p>{s['customer.outro']}</p>\n"
+        f'  <p style="color:#888;font-size:13px;margin-top:24px;">{s["customer.signature"]}</p>\n'
+        "</body>\n</html>\n"
+    )
+    s["cleaner.html_tail"] = (
+        f'  <p style="color:#888;font-size:12px;margin-top:24px;">{s["cleaner.footer"]}</p>\n'
+        "</body>\n</html>\n"
+    )
+    return s
+
+
+def _email_strings(loc: str, brand: str) -> Dict[str, str]:
+    """The static strings of the order emails for ``loc`` / ``brand``, built on first use."""
+    strings = _EMAIL_STRINGS.get((loc, brand))
+    if strings is None:
+        strings = _EMAIL_STRINGS[(loc, brand)] = _build_email_strings(loc, brand)
+    return strings
+
+
+def _with_fields(text: str, **fields) -> str:
+    """Fill a cached string's placeholders (like translate_brand does with params)."""
+    try:
+        return text.format(**fields)
+    except (KeyError, IndexError):
+        return text
+
+
+def render_booking_confirmation(
     to: str,
     order_id: int,
     plate_number: Optional[str],
@@ -284,95 +728,69 @@ def send_booking_confirmation(
     locale: str = DEFAULT_LOCALE,
     brand: str = "car",
     name: Optional[str] = None,
-) -> bool:
-    """Build and send a booking confirmation email."""
+) -> OutgoingEmail:
+    """Build the booking confirmation email."""
     loc = normalize_locale(locale)
+    s = _email_strings(loc, brand)
     when = _format_berlin(availability_time)
     services_list = _service_lines(service_names, service_quantities, loc)
-    services_text = "\n".join(f"  • {s}" for s in services_list) or "  • —"
-    services_html = "".join(f"<li>{s}</li>" for s in services_list) or "<li>—</li>"
-
-    # Pull all visible strings from the translation table.
-    L_ORDER    = _tr("email.field.order",    loc)
-    L_NAME     = _tr("email.field.name",     loc)
-    L_WHEN     = _tr("email.field.when",     loc)
-    L_WHERE    = _tr("email.field.where",    loc)
-    L_VEHICLE  = _tr("email.field.vehicle",  loc)
-    L_PHONE    = _tr("email.field.phone",    loc)
-    L_SERVICES = _tr("email.field.services", loc)
-    L_TOTAL    = _tr("email.field.total",    loc)
-    L_TZ       = _tr("email.field.tz_suffix", loc)
+    services_text = "\n".join(f"  • {line}" for line in services_list) or "  • —"
+    # Order fields are customer input: escape them in the HTML body.
+    services_html = "".join(f"<li>{escape(line)}</li>" for line in services_list) or "<li>—</li>"
 
     total_line_txt = ""
     total_line_html = ""
     if total_price is not None:
-        total_line_txt = f"\n{L_TOTAL}: {total_price:.2f} {currency}\n"
-        total_line_html = f"<p><strong>{L_TOTAL}:</strong> {total_price:.2f} {currency}</p>"
+        total_line_txt = f"\n{s['total']}: {total_price:.2f} {currency}\n"
+        total_line_html = f"<p><strong>{s['total']}:</strong> {total_price:.2f} {currency}</p>"
 
-    subject     = _trb("email.customer.subject",  loc, brand, order_id=order_id)
-    greeting    = _trb("email.customer.greeting", loc, brand)
-    intro       = _trb("email.customer.intro",    loc, brand)
-    outro       = _trb("email.customer.outro",    loc, brand)
-    heading     = _trb("email.customer.heading",  loc, brand)
-    signature   = _trb("email.customer.signature", loc, brand)
+    subject = _with_fields(s["customer.subject"], order_id=order_id)
 
     # The home (couch/mattress) app has no vehicle plate — omit that row.
-    vehicle_line_txt = f"{L_VEHICLE}:  {plate_number}\n" if plate_number else ""
-    vehicle_row_html = (
-        f'<tr><td style="padding:4px 12px 4px 0;color:#666;">{L_VEHICLE}</td>'
-        f'<td>{plate_number}</td></tr>'
-    ) if plate_number else ""
-
-    name_line_txt = f"{L_NAME}:     {name}\n" if name else ""
-    name_row_html = (
-        f'<tr><td style="padding:4px 12px 4px 0;color:#666;">{L_NAME}</td>'
-        f'<td>{name}</td></tr>'
-    ) if name else ""
+    vehicle_line_txt = f"{s['vehicle']}:  {plate_number}\n" if plate_number else ""
+    vehicle_row_html = f"{s['row.vehicle']}{escape(plate_number)}</td></tr>" if plate_number else ""
+
+    name_line_txt = f"{s['name']}:     {name}\n" if name else ""
+    name_row_html = f"{s['row.name']}{escape(name)}</td></tr>" if name else ""
 
     body_text = (
-        f"{greeting}\n\n"
-        f"{intro}\n\n"
-        f"{L_ORDER}:    #{order_id}\n"
+        f"{s['customer.greeting']}\n\n"
+        f"{s['customer.intro']}\n\n"
+        f"{s['order']}:    #{order_id}\n"
         f"{name_line_txt}"
-        f"{L_WHEN}:     {when} {L_TZ}\n"
-        f"{L_WHERE}:    {address or '-'}\n"
+        f"{s['when']}:     {when} {s['tz_suffix']}\n"
+        f"{s['where']}:    {address or '-'}\n"
         f"{vehicle_line_txt}"
-        f"{L_PHONE}:    {phone_number or '-'}\n\n"
-        f"{L_SERVICES}:\n{services_text}\n"
+        f"{s['phone']}:    {phone_number or '-'}\n\n"
+        f"{s['services']}:\n{services_text}\n"
         f"{total_line_txt}\n"
-        f"{outro}\n\n"
-        f"{signature}"
+        f"{s['customer.outro']}\n\n"
+        f"{s['customer.signature']}"
     )
 
-    body_html = f"""\
-<!DOCTYPE html>
-<html>
-<body style="font-family:-apple-system,Helvetica,Arial,sans-serif;color:#1a1a1a;max-width:560px;margin:0 auto;padding:24px;">
-  <h2 style="color:#0EA5A4;margin:0 0 12px 0;">{heading}</h2>
-  <p>{intro}</p>
-  <table style="border-collapse:collapse;margin:16px 0;">
-    <tr><td style="padding:4px 12px 4px 0;color:#666;">{L_ORDER}</td><td>#{order_id}</td></tr>
-    {name_row_html}
-    <tr><td style="padding:4px 12px 4px 0;color:#666;">{L_WHEN}</td><td>{when} <span style="color:#888;">{L_TZ}</span></td></tr>
-    <tr><td style="padding:4px 12px 4px 0;color:#666;">{L_WHERE}</td><td>{address or '-'}</td></tr>
-    {vehicle_row_html}
-    <tr><td style="padding:4px 12px 4px 0;color:#666;">{L_PHONE}</td><td>{phone_number or '-'}</td></tr>
-  </table>
-  <p style="margin:8px 0 4px 0;color:#666;">{L_SERVICES}</p>
-  <ul style="margin:0 0 16px 18px;padding:0;">{services_html}</ul>
-  {total_line_html}
-  <p>{outro}</p>
-  <p style="color:#888;font-size:13px;margin-top:24px;">{signature}</p>
-</body>
-</html>
-"""
-
-    return send_email(
-        to=to, subject=subject, body_text=body_text, body_html=body_html, brand=brand,
+    body_html = (
+        f"{s['customer.html_head']}"
+        f"    {s['row.order']}#{order_id}</td></tr>\n"
+        f"    {name_row_html}\n"
+        f"    {s['row.when']}{when}{s['tz_html']}</td></tr>\n"
+        f"    {s['row.where']}{escape(address or '-')}</td></tr>\n"
+        f"    {vehicle_row_html}\n"
+        f"    {s['row.phone']}{escape(phone_number or '-')}</td></tr>\n"
+        f"  </table>\n"
+        f"  {s['services_html']}{services_html}</ul>\n"
+        f"  {total_line_html}\n"
+        f"{s['customer.html_tail']}"
     )
 
+    return OutgoingEmail(to, subject, body_text, body_html, brand)
+
 
-def send_cleaner_notification(
+def send_booking_confirmation(*args, **kwargs) -> bool:
+    """Build and send a booking confirmation email (see render_booking_confirmation)."""
+    return send_email(*render_booking_confirmation(*args, **kwargs))
+
+
+def render_cleaner_notification(
     order_id: int,
     order_uuid: str,
     plate_number: Optional[str],
@@ -388,40 +806,27 @@ def send_cleaner_notification(
     locale: str = DEFAULT_LOCALE,
     brand: str = "car",
     name: Optional[str] = None,
-) -> bool:
+) -> OutgoingEmail:
     """
-    Notify the cleaning team about a new booking. Includes a deep link to the
-    cleaner page for this order and a one-click "Add to Google Calendar" button.
+    Build the cleaning team's notification about a new booking. Includes a deep
+    link to the cleaner page for this order and a one-click "Add to Google
+    Calendar" button.
     """
     cfg = _brand_email_config(brand)
     recipient = to or cfg["cleaner_to"]
     loc = normalize_locale(locale)
+    s = _email_strings(loc, brand)
     when_label = _format_berlin(availability_time)
     services_list = _service_lines(service_names, service_quantities, loc)
-    services_text = "\n".join(f"  • {s}" for s in services_list) or "  • —"
-    services_html = "".join(f"<li>{s}</li>" for s in services_list) or "<li>—</li>"
-
-    L_ORDER    = _tr("email.field.order",    loc)
-    L_NAME     = _tr("email.field.name",     loc)
-    L_WHEN     = _tr("email.field.when",     loc)
-    L_WHERE    = _tr("email.field.where",    loc)
-    L_VEHICLE  = _tr("email.field.vehicle",  loc)
-    L_PHONE    = _tr("email.field.phone",    loc)
-    L_EMAIL    = _tr("email.field.email",    loc)
-    L_SERVICES = _tr("email.field.services", loc)
-    L_TOTAL    = _tr("email.field.total",    loc)
-    L_TZ       = _tr("email.field.tz_suffix", loc)
-    cta_open    = _tr("email.cleaner.cta_open",     loc)
-    cta_gcal    = _tr("email.cleaner.cta_calendar", loc)
-    intro_label = _trb("email.cleaner.intro",       loc, brand)
-    heading     = _trb("email.cleaner.heading",     loc, brand, order_id=order_id)
-    footer      = _trb("email.cleaner.footer",      loc, brand)
+    services_text = "\n".join(f"  • {line}" for line in services_list) or "  • —"
+    # Order fields are customer input: escape them in the HTML body.
+    services_html = "".join(f"<li>{escape(line)}</li>" for line in services_list) or "<li>—</li>"
 
     total_line_txt = ""
     total_line_html = ""
     if total_price is not None:
-        total_line_txt = f"\n{L_TOTAL}: {total_price:.2f} {currency}\n"
-        total_line_html = f"<p><strong>{L_TOTAL}:</strong> {total_price:.2f} {currency}</p>"
+        total_line_txt = f"\n{s['total']}: {total_price:.2f} {currency}\n"
+        total_line_html = f"<p><strong>{s['total']}:</strong> {total_price:.2f} {currency}</p>"
 
     cleaner_url = f"{cfg['base_url']}/cleaner/orders/{order_uuid}"
 
@@ -450,82 +855,72 @@ def send_cleaner_notification(
     else:
         gcal_url = None
 
-    subject = _trb("email.cleaner.subject", loc, brand, order_id=order_id, when=when_label)
+    subject = _with_fields(s["cleaner.subject"], order_id=order_id, when=when_label)
+    heading = _with_fields(s["cleaner.heading"], order_id=order_id)
 
     body_text_lines = [
-        intro_label,
+        s["cleaner.intro"],
         "",
-        f"{L_ORDER}:    #{order_id}",
+        f"{s['order']}:    #{order_id}",
     ]
     if name:
-        body_text_lines.append(f"{L_NAME}:     {name}")
+        body_text_lines.append(f"{s['name']}:     {name}")
     body_text_lines += [
-        f"{L_WHEN}:     {when_label} {L_TZ}",
-        f"{L_WHERE}:    {address or '-'}",
+        f"{s['when']}:     {when_label} {s['tz_suffix']}",
+        f"{s['where']}:    {address or '-'}",
     ]
     if plate_number:  # only the car app has a plate
-        body_text_lines.append(f"{L_VEHICLE}:  {plate_number}")
-    body_text_lines.append(f"{L_PHONE}:    {phone_number or '-'}")
+        body_text_lines.append(f"{s['vehicle']}:  {plate_number}")
+    body_text_lines.append(f"{s['phone']}:    {phone_number or '-'}")
     if customer_email:
-        body_text_lines.append(f"{L_EMAIL}:    {customer_email}")
+        body_text_lines.append(f"{s['email']}:    {customer_email}")
     body_text_lines += [
         "",
-        f"{L_SERVICES}:",
+        f"{s['services']}:",
         services_text,
         total_line_txt.rstrip("\n") if total_line_txt else "",
         "",
-        f"{cta_open}: {cleaner_url}",
+        f"{s['cta_open']}: {cleaner_url}",
     ]
     if gcal_url:
-        body_text_lines.append(f"{cta_gcal}: {gcal_url}")
-    body_text = "\n".join([l for l in body_text_lines if l is not None])
+        body_text_lines.append(f"{s['cta_calendar']}: {gcal_url}")
+    body_text = "\n".join(body_text_lines)
 
     gcal_button_html = (
-        f'<a href="{gcal_url}" target="_blank" '
+        f'<a href="{escape(gcal_url)}" target="_blank" '
         f'style="display:inline-block;padding:10px 16px;background:#1a73e8;color:#fff;'
         f'border-radius:6px;text-decoration:none;font-weight:600;margin-right:8px;">'
-        f'{cta_gcal}</a>'
+        f"{s['cta_calendar']}</a>"
     ) if gcal_url else ""
 
     customer_row_html = (
-        f'<tr><td style="padding:4px 12px 4px 0;color:#666;">{L_EMAIL}</td>'
-        f'<td><a href="mailto:{customer_email}">{customer_email}</a></td></tr>'
+        f'{s["row.email"]}<a href="mailto:{escape(customer_email)}">{escape(customer_email)}</a></td></tr>'
     ) if customer_email else ""
+    vehicle_row_html = f"{s['row.vehicle']}{escape(plate_number)}</td></tr>" if plate_number else ""
+    name_row_html = f"{s['row.name']}{escape(name)}</td></tr>" if name else ""
+
+    body_html = (
+        f"{s['html_open']}{heading}</h2>\n"
+        f'  <table style="border-collapse:collapse;margin:16px 0;">\n'
+        f"    {name_row_html}\n"
+        f"    {s['row.when']}{when_label}{s['tz_html']}</td></tr>\n"
+        f"    {s['row.where']}{escape(address or '-')}</td></tr>\n"
+        f"    {vehicle_row_html}\n"
+        f'    {s["row.phone"]}<a href="tel:{escape(phone_number or "")}">{escape(phone_number or "-")}</a></td></tr>\n'
+        f"    {customer_row_html}\n"
+        f"  </table>\n"
+        f"  {s['services_html']}{services_html}</ul>\n"
+        f"  {total_line_html}\n"
+        f'  <div style="margin-top:20px;">\n'
+        f"    {gcal_button_html}\n"
+        f'    <a href="{escape(cleaner_url)}" target="_blank" style="display:inline-block;padding:10px 16px;background:#0EA5A4;color:#fff;border-radius:6px;text-decoration:none;font-weight:600;">{s["cta_open"]}</a>\n'
+        f"  </div>\n"
+        f"{s['cleaner.html_tail']}"
+    )
+
+    return OutgoingEmail(recipient, subject, body_text, body_html, brand)
 
-    vehicle_row_html = (
-        f'<tr><td style="padding:4px 12px 4px 0;color:#666;">{L_VEHICLE}</td>'
-        f'<td>{plate_number}</td></tr>'
-    ) if plate_number else ""
-
-    name_row_html = (
-        f'<tr><td style="padding:4px 12px 4px 0;color:#666;">{L_NAME}</td>'
-        f'<td>{name}</td></tr>'
-    ) if name else ""
-
-    body_html = f"""\
-<!DOCTYPE html>
-<html>
-<body style="font-family:-apple-system,Helvetica,Arial,sans-serif;color:#1a1a1a;max-width:560px;margin:0 auto;padding:24px;">
-  <h2 style="color:#0EA5A4;margin:0 0 12px 0;">{heading}</h2>
-  <table style="border-collapse:collapse;margin:16px 0;">
-    {name_row_html}
-    <tr><td style="padding:4px 12px 4px 0;color:#666;">{L_WHEN}</td><td>{when_label} <span style="color:#888;">{L_TZ}</span></td></tr>
-    <tr><td style="padding:4px 12px 4px 0;color:#666;">{L_WHERE}</td><td>{address or '-'}</td></tr>
-    {vehicle_row_html}
-    <tr><td style="padding:4px 12px 4px 0;color:#666;">{L_PHONE}</td><td><a href="tel:{phone_number}">{phone_number or '-'}</a></td></tr>
-    {customer_row_html}
-  </table>
-  <p style="margin:8px 0 4px 0;color:#666;">{L_SERVICES}</p>
-  <ul style="margin:0 0 16px 18px;padding:0;">{services_html}</ul>
-  {total_line_html}
-  <div style="margin-top:20px;">
-    {gcal_button_html}
-    <a href="{cleaner_url}" target="_blank" style="display:inline-block;padding:10px 16px;background:#0EA5A4;color:#fff;border-radius:6px;text-decoration:none;font-weight:600;">{cta_open}</a>
-  </div>
-  <p style="color:#888;font-size:12px;margin-top:24px;">{footer}</p>
-</body>
-</html>
-"""
 
-    return send_email(to=recipient, subject=subject, body_text=body_text, body_html=body_html,
-                      brand=brand)
+def send_cleaner_notification(*args, **kwargs) -> bool:
+    """Build and send the cleaner notification (see render_cleaner_notification)."""
+    return send_email(*render_cleaner_notification(*args, **kwargs))
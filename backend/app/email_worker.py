@@ -0,0 +1,165 @@
+# app/email_worker.py
+"""
+Delivers the emails queued in the outbox (see app/outbox.py).
+
+A pool of ``EMAIL_WORKERS`` threads (default 4). Each one claims up to
+``EMAIL_BATCH_SIZE`` due emails, sends them together (one Resend batch
+request; retries go one by one), and records the outcome. When nothing is
+due it sleeps ``EMAIL_POLL_INTERVAL`` seconds or until ``wake()`` is
+called. Claims use SKIP LOCKED, so any number of pools (threads,
+processes, hosts) can drain the same table.
+
+Two ways to run it:
+
+* standalone, next to the web service:
+
+      EMAIL_WORKER_EMBEDDED=0 uvicorn main:app      # web: no email threads
+      python -m app.email_worker                   # worker process
+
+* embedded (``EMAIL_WORKER_EMBEDDED=1``, the default): each web process starts
+  a pool on startup. The threads are its own, so a slow provider never ties up
+  the request threadpool or the event loop.
+"""
+import datetime
+import logging
+import os
+import signal
+import threading
+from typing import List, Optional
+
+from . import outbox
+from .database import SessionLocal
+from .email_service import (
+    OutgoingEmail,
+    close_connections,
+    render_booking_confirmation,
+    render_cleaner_notification,
+    send_emails,
+)
+
+logger = logging.getLogger(__name__)
+
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", "4"))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "10"))
+EMAIL_POLL_INTERVAL = float(os.getenv("EMAIL_POLL_INTERVAL", "2"))
+EMAIL_WORKER_EMBEDDED = os.getenv("EMAIL_WORKER_EMBEDDED", "1") == "1"
+
+# outbox kind -> email_service renderer; the row's payload is its kwargs.
+RENDERERS = {
+    outbox.BOOKING_CONFIRMATION: render_booking_confirmation,
+    outbox.CLEANER_NOTIFICATION: render_cleaner_notification,
+}
+
+
+class DeliveryFailed(Exception):
+    """The sender reported failure (details are in its own log lines)."""
+
+
+def render(kind: str, payload: dict) -> OutgoingEmail:
+    """Build one outbox email; raises if it can't be built."""
+    renderer = RENDERERS.get(kind)
+    if renderer is None:
+        raise DeliveryFailed(f"Unknown email kind {kind!r}")
+    kwargs = dict(payload)
+    if kwargs.get("availability_time"):
+        kwargs["availability_time"] = datetime.datetime.fromisoformat(kwargs["availability_time"])
+    return renderer(**kwargs)
+
+
+def _failed(db, row, error: Exception) -> None:
+    status = outbox.mark_failed(db, row, f"{type(error).__name__}: {error}")
+    logger.warning(
+        "Email %s (%s, order %s) attempt %s failed: %s -> %s",
+        row.id, row.kind, row.order_id, row.attempts, error, status.value,
+    )
+
+
+def drain_once(batch_size: int = EMAIL_BATCH_SIZE) -> int:
+    """
+    Claim and process one batch. Returns how many emails were claimed.
+
+    The batch is rendered first and then handed to ``send_emails`` in one go,
+    so with Resend the customer and cleaner emails of an order (and those of
+    other orders claimed with them) share a single API request.
+    """
+    with SessionLocal() as db:
+        rows = outbox.claim(db, batch_size)
+        pending, messages = [], []
+        for row in rows:
+            try:
+                messages.append(render(row.kind, row.payload))
+            except Exception as e:  # noqa: BLE001 — any failure is retried
+                _failed(db, row, e)
+            else:
+                pending.append(row)
+        if messages:
+            results = send_emails(
+                messages,
+                idempotency_keys=[f"outbox-{row.id}" for row in pending],
+                first_attempt=[row.attempts == 1 for row in pending],
+            )
+            for row, ok in zip(pending, results):
+                if not ok:
+                    _failed(db, row, DeliveryFailed(f"{row.kind} was not delivered (see email log)"))
+            outbox.mark_sent(db, [row.id for row, ok in zip(pending, results) if ok])
+        return len(rows)
+
+
+class EmailWorkerPool:
+    def __init__(self, size: int = EMAIL_WORKERS, poll_interval: float = EMAIL_POLL_INTERVAL):
+        self.size = size
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        self._stop.clear()
+        for i in range(self.size):
+            thread = threading.Thread(target=self._run, name=f"email-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Email worker pool started with %s threads", self.size)
+
+    def wake(self) -> None:
+        """Skip the rest of the idle wait, e.g. right after queueing emails."""
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = 15.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        close_connections()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                claimed = drain_once()
+            except Exception:  # noqa: BLE001 — e.g. the database is unreachable
+                logger.exception("Email worker iteration failed")
+                claimed = 0
+            if not claimed:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+
+pool = EmailWorkerPool()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    done = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: done.set())
+    signal.signal(signal.SIGINT, lambda *_: done.set())
+    pool.start()
+    done.wait()
+    logger.info("Stopping email workers")
+    pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# app/fast_json.py
+"""
+Opt-in fast path for JSON responses.
+
+By default FastAPI runs whatever a route returns through ``response_model``
+validation before encoding it. That is wasted work when the data is already
+typed (the catalog and the availability calendar hold ``schemas`` instances),
+and it is done twice for ``Union`` response models. A route that returns
+``respond(...)`` skips that step: the body is encoded to bytes by Pydantic's
+Rust serializer using the (cached) ``TypeAdapter`` of the declared type.
+
+* ``validate=False``: ``content`` must already be instances of the declared
+  schemas (plain containers of them are fine); nothing is re-validated.
+* ``validate=True``: ``content`` contains ORM objects or rows. It is read
+  once via ``from_attributes``; schema instances nested inside it are not
+  validated again.
+
+Keep ``response_model`` on the route so the OpenAPI schema stays accurate.
+Returning a ``Response`` bypasses the injected ``response`` parameter, so any
+headers must be passed here.
+"""
+from functools import lru_cache
+from typing import Any, Mapping, Optional
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(tp: Any) -> TypeAdapter:
+    return TypeAdapter(tp)
+
+
+def encode(tp: Any, content: Any, validate: bool = False) -> bytes:
+    """``content`` as JSON bytes, serialized as type ``tp``."""
+    adapter = _adapter(tp)
+    if validate:
+        content = adapter.validate_python(content, from_attributes=True)
+    return adapter.dump_json(content)
+
+
+def respond(
+    tp: Any,
+    content: Any,
+    *,
+    validate: bool = False,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> Response:
+    """A JSON ``Response`` for ``content`` serialized as ``tp`` (see module docstring)."""
+    return Response(
+        encode(tp, content, validate=validate),
+        status_code=status_code,
+        headers=headers,
+        media_type="application/json",
+    )
@@ -3,7 +3,7 @@ import uuid as _uuid
 from datetime import date, datetime
 from typing import List, Optional
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Date, Enum
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Date, Enum, Index, JSON, Text, text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
 from .database import Base # Ensure this import is correct
@@ -99,6 +99,13 @@ class Availability(Base):
 
     # Optional: Add a unique constraint if (date, time) should be unique for availabilities
     # __table_args__ = (UniqueConstraint("date", "time", name="uq_availability_date_time"),)
+    __table_args__ = (
+        # Slot browsing only ever looks at untaken slots by time; booked slots
+        # drop out of this partial index.
+        Index("ix_availabilities_open_time", "time", postgresql_where=text("NOT is_taken")),
+        # One slot per start time; bulk generation relies on it for ON CONFLICT.
+        Index("uq_availabilities_time", "time", unique=True),
+    )
 
     def __repr__(self):
         return f"<Availability(id={self.id}, time={self.time.strftime('%H:%M')}, taken={self.is_taken})>"
@@ -114,6 +121,9 @@ class OrderServiceAssociation(Base):
     quantity: Mapped[int] = mapped_column(
         Integer, nullable=False, default=1, server_default="1"
     )
+    # Service price when the order was placed, so later catalog price changes
+    # don't rewrite history.
+    unit_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
 
     # Convenience relationship so the API can expose (service, quantity) pairs.
     # viewonly + overlaps keep it from fighting the Order.services / Service.orders
@@ -140,6 +150,11 @@ class ProcessStep(Base):
     order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"), nullable=False)
     order: Mapped["Order"] = relationship(back_populates="process_steps")
 
+    __table_args__ = (
+        # An order's steps, and the dashboard's "has a step in status X" filter.
+        Index("ix_process_steps_order_status", "order_id", "status"),
+    )
+
     def __repr__(self):
         return f"<ProcessStep(id={self.id}, name='{self.name}', status='{self.status}', order_id={self.order_id})>"
 
@@ -174,6 +189,14 @@ class Order(Base):
         default=OrderStatusEnum.OPEN, # Set the default value for new rows
         nullable=False # This will be enforced after the migration
     )
+    # Bumped by every status or process step change (see crud.py); the order
+    # endpoints serve it as the ETag.
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=1, server_default="1")
+
+    # Order total (sum of unit_price x quantity) and its currency, fixed when
+    # the order is created so list screens need no joins to show them.
+    total: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    currency: Mapped[Optional[CurrencyEnum]] = mapped_column(Enum(CurrencyEnum), nullable=True)
 
     # Foreign Key to Location (one-to-many: one location can have many orders)
     location_id: Mapped[int] = mapped_column(ForeignKey("locations.id"), nullable=False)
@@ -185,6 +208,14 @@ class Order(Base):
     availability_id: Mapped[int] = mapped_column(ForeignKey("availabilities.id"), unique=True, nullable=False)
     availability: Mapped["Availability"] = relationship(back_populates="orders")
 
+    __table_args__ = (
+        # Order history: equality on phone/brand, newest first, keyset on (created_at, id).
+        Index("ix_orders_phone_brand_created", "phone_identifier", "brand", "created_at", "id"),
+        # Cleaner dashboard: a brand's open orders. Completed and cancelled
+        # orders (nearly all of them, over time) drop out of this partial index.
+        Index("ix_orders_open_brand", "brand", "status", postgresql_where=text("status = 'OPEN'")),
+    )
+
     # One-to-Many relationship to ProcessStep
     process_steps: Mapped[List["ProcessStep"]] = relationship(
         back_populates="order",
@@ -213,4 +244,44 @@ class Order(Base):
 
     def __repr__(self):
         return (f"<Order(id={self.id}, plate_number='{self.plate_number}', "
-                f"location_id={self.location_id}, availability_id={self.availability_id})>")
\ No newline at end of file
+                f"location_id={self.location_id}, availability_id={self.availability_id})>")
+
+
+class OutboxStatusEnum(str, enum.Enum):
+    PENDING = "pending" # Waiting for (another) delivery attempt
+    SENT = "sent"
+    DEAD = "dead" # Gave up after EMAIL_MAX_ATTEMPTS; needs a look (and a requeue)
+
+
+class EmailOutbox(Base):
+    """
+    One email to deliver. Written in the same transaction as the order that
+    triggers it and drained by the email worker (see app/email_worker.py).
+    """
+    __tablename__ = "email_outbox"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # Which email_service renderer builds it (see email_worker.RENDERERS), with its kwargs.
+    kind: Mapped[str] = mapped_column(String(64), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    order_id: Mapped[Optional[int]] = mapped_column(ForeignKey("orders.id"), nullable=True, index=True)
+
+    status: Mapped[OutboxStatusEnum] = mapped_column(
+        Enum(OutboxStatusEnum), nullable=False, default=OutboxStatusEnum.PENDING,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Due time of the next attempt. A worker that claims the row pushes it out
+    # by a lease, so a crashed worker's row is picked up again later.
+    next_attempt_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=text("now()"),
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=text("now()"),
+    )
+    sent_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # The worker's claim query only looks at due, pending rows.
+        Index("ix_email_outbox_due", "next_attempt_at", postgresql_where=text("status = 'PENDING'")),
+    )
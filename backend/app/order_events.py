@@ -0,0 +1,310 @@
+# app/order_events.py
+"""
+Live order progress for the apps (server-sent events).
+
+Step and order status changes are announced with ``pg_notify`` inside the
+transaction that makes them (see ``notify`` and its callers in crud.py), so an
+event is delivered exactly when, and only if, the change commits, and every
+uvicorn worker hears about it whichever worker made it.
+
+Each process runs one listener thread (``OrderEventHub``) holding a single
+``LISTEN`` connection, whatever the number of subscribers. It encodes each
+event once and hands it to the subscribers of that order and of its
+customer's phone_identifier. The thread starts with the first subscriber.
+
+An event carries the order's status and all of its steps, so a client can
+replace what it shows instead of merging:
+
+    event: order
+    data: {"order_id": 7, "status": "open", "version": 4, "steps": [{"id": 31, "name": "...", "status": "completed", "updated_at": "..."}, ...]}
+
+A subscriber that falls ``ORDER_EVENTS_QUEUE_SIZE`` events behind is
+disconnected; it reconnects and starts from a fresh snapshot.
+If the listener can't LISTEN within a few seconds of a client connecting
+(e.g. the database is down), that client gets its snapshot and a ``retry:``
+hint, and reconnects instead of waiting on a stream that would stay silent.
+"""
+import asyncio
+import json
+import logging
+import os
+import selectors
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional, Set
+
+from sqlalchemy import Text, cast, func, literal, select, text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from . import models
+from .database import engine
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "order_events"
+ORDER_EVENTS_QUEUE_SIZE = int(os.getenv("ORDER_EVENTS_QUEUE_SIZE", "32"))
+# Seconds between comment lines that keep idle streams open through proxies.
+ORDER_EVENTS_HEARTBEAT = float(os.getenv("ORDER_EVENTS_HEARTBEAT", "15"))
+# Milliseconds a client waits before reconnecting when no listener is up.
+ORDER_EVENTS_RETRY_MS = int(os.getenv("ORDER_EVENTS_RETRY_MS", "3000"))
+
+_STEP_STATUS = {e.name: e.value for e in models.ProcessStepStatusEnum}
+_ORDER_STATUS = {e.name: e.value for e in models.OrderStatusEnum}
+_BRAND = {e.name: e.value for e in models.BrandEnum}
+
+
+# --- Publishing (SQL side) ----------------------------------------------------
+
+def step_json(step_id, name, status, updated_at):
+    """One step as the JSON object events carry (SQL expression)."""
+    return func.json_build_object("id", step_id, "name", name, "status", status, "updated_at", updated_at)
+
+
+def payload(order_id, phone_identifier, brand, status, version, steps):
+    """An order's event payload (SQL JSON). ``steps`` is a JSON array of ``step_json``."""
+    return func.json_build_object(
+        "order_id", order_id, "phone_identifier", phone_identifier,
+        "brand", brand, "status", status, "version", version, "steps", steps,
+    )
+
+
+def notify(order_id, phone_identifier, brand, status, version, steps):
+    """``pg_notify`` for one order, as a SQL expression to select in the statement that changes it."""
+    return func.pg_notify(
+        literal(CHANNEL), cast(payload(order_id, phone_identifier, brand, status, version, steps), Text),
+    )
+
+
+def order_payload():
+    """``payload`` of the ``orders`` row in the query, steps read from the table."""
+    PS, O = models.ProcessStep, models.Order
+    steps = (
+        select(func.coalesce(
+            func.json_agg(aggregate_order_by(step_json(PS.id, PS.name, PS.status, PS.updated_at), PS.id)),
+            text("'[]'::json"),
+        ))
+        .where(PS.order_id == O.id)
+        .scalar_subquery()
+    )
+    return payload(O.id, O.phone_identifier, O.brand, O.status, O.version, steps)
+
+
+def notify_orders(db: Session, order_ids: Iterable[int]) -> None:
+    """Announce the current state of ``order_ids`` (as this transaction sees it)."""
+    order_ids = list(order_ids)
+    if order_ids:
+        db.execute(
+            select(func.pg_notify(literal(CHANNEL), cast(order_payload(), Text)))
+            .where(models.Order.id.in_(order_ids))
+        ).all()
+
+
+# --- Event encoding -----------------------------------------------------------
+
+def sse(data: dict, event: str = "order") -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n".encode("utf-8")
+
+
+HEARTBEAT = b": keep-alive\n\n"
+
+
+def retry(milliseconds: int) -> bytes:
+    """The SSE field setting how long the client waits before reconnecting."""
+    return f"retry: {milliseconds}\n\n".encode("utf-8")
+
+
+def event_data(payload: dict) -> dict:
+    """The client-facing event for a payload (API enum values, no routing keys)."""
+    return {
+        "order_id": payload["order_id"],
+        "status": _ORDER_STATUS.get(payload["status"], payload["status"]),
+        "version": payload["version"],
+        "steps": [
+            {**step, "status": _STEP_STATUS.get(step["status"], step["status"])}
+            for step in payload["steps"] or []
+        ],
+    }
+
+
+def order_topic(order_id: int) -> Hashable:
+    return ("order", order_id)
+
+
+def phone_topic(phone_identifier: str, brand: models.BrandEnum) -> Hashable:
+    return ("phone", phone_identifier, brand.value)
+
+
+# --- Fan-out ------------------------------------------------------------------
+
+class Subscription:
+    """One stream's inbox. Filled from the listener thread, read on the event loop."""
+
+    def __init__(self, topics: Iterable[Hashable]):
+        self.topics = tuple(topics)
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(ORDER_EVENTS_QUEUE_SIZE)
+        self.overflowed = False
+
+    def _deliver(self, message: Optional[bytes]) -> None:
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind: end the stream (the client resyncs on reconnect).
+            self.overflowed = True
+            self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    def deliver(self, message: Optional[bytes]) -> None:
+        self.loop.call_soon_threadsafe(self._deliver, message)
+
+
+class OrderEventHub:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: Dict[Hashable, Set[Subscription]] = {}
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._listening = threading.Event()
+
+    # Subscribers -------------------------------------------------------------
+
+    def subscribe(self, *topics: Hashable) -> Subscription:
+        """Register for ``topics`` (``order_topic`` / ``phone_topic``), starting the listener."""
+        subscription = Subscription(topics)
+        with self._lock:
+            for topic in topics:
+                self._subscribers.setdefault(topic, set()).add(subscription)
+        self._ensure_listener()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            for topic in subscription.topics:
+                subscribers = self._subscribers.get(topic)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[topic]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len({s for subscribers in self._subscribers.values() for s in subscribers})
+
+    async def wait_listening(self, timeout: float = 5.0) -> bool:
+        """Wait until LISTEN is active, so nothing committed after this is missed."""
+        if self._listening.is_set():
+            return True
+        return await asyncio.to_thread(self._listening.wait, timeout)
+
+    def publish(self, payload: dict) -> None:
+        """Deliver a notification payload to everyone subscribed to its order or phone."""
+        brand = _BRAND.get(payload["brand"], payload["brand"])
+        topics = (order_topic(payload["order_id"]), ("phone", payload["phone_identifier"], brand))
+        with self._lock:
+            targets = {s for topic in topics for s in self._subscribers.get(topic, ())}
+        if targets:
+            message = sse(event_data(payload))
+            for subscription in targets:
+                subscription.deliver(message)
+
+    # Listener ----------------------------------------------------------------
+
+    def _ensure_listener(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="order-events", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self._listening.clear()
+
+    def _run(self) -> None:
+        backoff = 0.5
+        while not self._stop.is_set():
+            connection = selector = None
+            try:
+                connection = engine.raw_connection()
+                connection.detach()  # a dedicated, long-lived connection
+                raw = connection.dbapi_connection
+                raw.autocommit = True
+                with raw.cursor() as cursor:
+                    cursor.execute(f"LISTEN {CHANNEL}")
+                self._listening.set()
+                logger.info("Listening for order events")
+                backoff = 0.5
+                # Not select.select(): with many open streams the socket's fd
+                # can be above FD_SETSIZE.
+                selector = selectors.DefaultSelector()
+                selector.register(raw, selectors.EVENT_READ)
+                while not self._stop.is_set():
+                    if selector.select(1.0):
+                        raw.poll()
+                        while raw.notifies:
+                            notification = raw.notifies.pop(0)
+                            try:
+                                self.publish(json.loads(notification.payload))
+                            except Exception:  # noqa: BLE001 — one bad payload must not stop the stream
+                                logger.exception("Bad order event payload")
+            except Exception:  # noqa: BLE001 — e.g. the database restarted; listen again
+                logger.exception("Order event listener failed; retrying in %.1fs", backoff)
+                self._listening.clear()
+                # Subscribers may have missed events: end their streams so
+                # they reconnect and resync from a snapshot.
+                with self._lock:
+                    everyone = {s for subscribers in self._subscribers.values() for s in subscribers}
+                for subscription in everyone:
+                    subscription.deliver(None)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+            finally:
+                if selector is not None:
+                    selector.close()
+                if connection is not None:
+                    try:
+                        connection.close()
+                    except Exception:  # noqa: BLE001
+                        pass
+        self._listening.clear()
+
+
+hub = OrderEventHub()
+
+
+async def stream(subscription: Subscription, snapshot: List[dict]):
+    """
+    The SSE body: ``snapshot`` (payloads) first, then changes as they commit,
+    with heartbeat comments while idle. Ends when the subscriber falls behind
+    or the listener reconnects; unsubscribes when the client goes away.
+    """
+    try:
+        for state in snapshot:
+            yield sse(event_data(state))
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), ORDER_EVENTS_HEARTBEAT)
+            except asyncio.TimeoutError:
+                yield HEARTBEAT
+                continue
+            if message is None:
+                return
+            yield message
+    finally:
+        hub.unsubscribe(subscription)
+
+
+async def snapshot_then_retry(snapshot: List[dict]):
+    """
+    The SSE body when the listener isn't up: ``snapshot``, then the end of
+    the stream, asking the client to reconnect in ``ORDER_EVENTS_RETRY_MS``.
+    """
+    yield retry(ORDER_EVENTS_RETRY_MS)
+    for state in snapshot:
+        yield sse(event_data(state))
@@ -0,0 +1,183 @@
+# app/outbox.py
+"""
+Transactional outbox for emails.
+
+Order emails used to be sent from FastAPI ``BackgroundTasks``: they held a
+threadpool slot for as long as SMTP/Resend took and were lost if the process
+restarted. Now ``crud.create_order`` writes one ``email_outbox`` row per email
+in the same transaction as the order, and the email worker
+(``app/email_worker.py``) delivers them:
+
+* ``claim`` hands each due row to exactly one worker (``FOR UPDATE SKIP
+  LOCKED``) and pushes its due time out by ``EMAIL_SEND_LEASE`` seconds, so a
+  worker that dies mid-send only delays the email;
+* ``mark_failed`` retries with exponential backoff (``EMAIL_RETRY_BASE``
+  doubling per attempt, capped at ``EMAIL_RETRY_MAX``) and dead-letters the
+  row after ``EMAIL_MAX_ATTEMPTS`` attempts;
+* dead rows stay in the table for inspection and can be requeued.
+"""
+import datetime
+import os
+import random
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from . import models
+from .email_service import is_configured
+
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "6"))
+EMAIL_RETRY_BASE = float(os.getenv("EMAIL_RETRY_BASE", "30"))
+EMAIL_RETRY_MAX = float(os.getenv("EMAIL_RETRY_MAX", "3600"))
+EMAIL_SEND_LEASE = float(os.getenv("EMAIL_SEND_LEASE", "300"))
+
+BOOKING_CONFIRMATION = "booking_confirmation"
+CLEANER_NOTIFICATION = "cleaner_notification"
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def order_email_rows(db_order: models.Order, email: Optional[str], locale: Optional[str]) -> List[dict]:
+    """
+    Outbox rows for a new order: the customer confirmation (when they gave an
+    email) and the cleaner notification. ``db_order`` must have its location,
+    availability and service items loaded. Payloads are JSON-safe kwargs for
+    the matching ``email_service`` sender.
+    """
+    brand = db_order.brand.value if db_order.brand else "car"
+    if not is_configured(brand):
+        return []
+
+    items = list(db_order.service_items)
+    availability_time = db_order.availability.time if db_order.availability else None
+    common = dict(
+        order_id=db_order.id,
+        brand=brand,
+        name=db_order.name,
+        plate_number=db_order.plate_number,
+        phone_number=db_order.phone_number,
+        address=db_order.location.address if db_order.location else "",
+        availability_time=availability_time.isoformat() if availability_time else None,
+        service_names=[it.service.name for it in items],
+        service_quantities=[it.quantity or 1 for it in items],
+        total_price=db_order.total,
+        currency=db_order.currency.value if db_order.currency is not None else "EUR",
+    )
+
+    rows = []
+    if email:
+        rows.append({
+            "kind": BOOKING_CONFIRMATION,
+            "order_id": db_order.id,
+            "payload": dict(common, to=email, locale=locale or "de"),
+        })
+    # The cleaning team operates in German regardless of the customer's locale.
+    rows.append({
+        "kind": CLEANER_NOTIFICATION,
+        "order_id": db_order.id,
+        "payload": dict(common, order_uuid=db_order.uuid, customer_email=email, locale="de"),
+    })
+    return rows
+
+
+def claim(db: Session, batch_size: int) -> List[models.EmailOutbox]:
+    """Take up to ``batch_size`` due emails for this worker and commit the claim."""
+    now = _now()
+    due = (
+        select(models.EmailOutbox.id)
+        .where(
+            models.EmailOutbox.status == models.OutboxStatusEnum.PENDING,
+            models.EmailOutbox.next_attempt_at <= now,
+        )
+        .order_by(models.EmailOutbox.next_attempt_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    rows = db.scalars(
+        update(models.EmailOutbox)
+        .where(models.EmailOutbox.id.in_(due))
+        .values(
+            attempts=models.EmailOutbox.attempts + 1,
+            next_attempt_at=now + datetime.timedelta(seconds=EMAIL_SEND_LEASE),
+        )
+        .returning(models.EmailOutbox),
+    ).all()
+    db.commit()
+    return rows
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before attempt ``attempts + 1``: exponential, capped, with 10% jitter."""
+    delay = min(EMAIL_RETRY_MAX, EMAIL_RETRY_BASE * 2 ** max(0, attempts - 1))
+    return delay * random.uniform(0.9, 1.1)
+
+
+def mark_sent(db: Session, outbox_ids: List[int]) -> None:
+    if not outbox_ids:
+        return
+    db.execute(
+        update(models.EmailOutbox)
+        .where(models.EmailOutbox.id.in_(outbox_ids))
+        .values(status=models.OutboxStatusEnum.SENT, sent_at=_now(), last_error=None)
+    )
+    db.commit()
+
+
+def mark_failed(db: Session, row: models.EmailOutbox, error: str) -> models.OutboxStatusEnum:
+    """Schedule a retry, or dead-letter the row once it has used up its attempts."""
+    if row.attempts >= EMAIL_MAX_ATTEMPTS:
+        values = dict(status=models.OutboxStatusEnum.DEAD)
+    else:
+        values = dict(next_attempt_at=_now() + datetime.timedelta(seconds=retry_delay(row.attempts)))
+    db.execute(
+        update(models.EmailOutbox)
+        .where(models.EmailOutbox.id == row.id)
+        .values(last_error=error[:2000], **values)
+    )
+    db.commit()
+    return values.get("status", models.OutboxStatusEnum.PENDING)
+
+
+def requeue(db: Session, outbox_id: int) -> bool:
+    """Give a dead email a fresh set of attempts, due now. False if it isn't dead."""
+    result = db.execute(
+        update(models.EmailOutbox)
+        .where(
+            models.EmailOutbox.id == outbox_id,
+            models.EmailOutbox.status == models.OutboxStatusEnum.DEAD,
+        )
+        .values(status=models.OutboxStatusEnum.PENDING, attempts=0, next_attempt_at=_now())
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def stats(db: Session) -> Dict[str, object]:
+    """Row counts per status, plus the age of the oldest due email in seconds."""
+    counts = {status.value: 0 for status in models.OutboxStatusEnum}
+    for status, count in db.execute(
+        select(models.EmailOutbox.status, func.count()).group_by(models.EmailOutbox.status)
+    ):
+        counts[status.value] = count
+    oldest_due = db.scalar(
+        select(func.min(models.EmailOutbox.next_attempt_at)).where(
+            models.EmailOutbox.status == models.OutboxStatusEnum.PENDING,
+            models.EmailOutbox.next_attempt_at <= _now(),
+        )
+    )
+    lag = (_now() - oldest_due).total_seconds() if oldest_due else 0.0
+    return {"counts": counts, "oldest_due_s": round(lag, 3)}
+
+
+def dead_letters(db: Session, limit: int = 100) -> List[models.EmailOutbox]:
+    """Most recent dead-lettered emails."""
+    return db.scalars(
+        select(models.EmailOutbox)
+        .where(models.EmailOutbox.status == models.OutboxStatusEnum.DEAD)
+        .order_by(models.EmailOutbox.id.desc())
+        .limit(limit)
+    ).all()
@@ -0,0 +1,117 @@
+# app/page_cache.py
+"""
+In-process cache of rendered public web pages (landing + policy pages).
+
+Those pages depend only on (template, brand, locale) plus a ``variant`` the
+route supplies: the catalog digest for the landing page, the date for pages
+that print it. A hit skips Jinja and the database entirely; a changed variant
+(e.g. a new service, see ``catalog.invalidate``) re-renders the page.
+
+Each entry keeps the body precompressed (gzip, and brotli when the ``brotli``
+package is installed), so a hit is a dict lookup plus content negotiation.
+Responses carry a strong ``ETag`` and ``Last-Modified``; conditional requests
+get a bodyless 304.
+"""
+import gzip
+import hashlib
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+
+try:
+    import brotli
+except ImportError:  # optional: serve gzip only
+    brotli = None
+
+# Pages are shared by everyone on a host, but the locale/brand can come from
+# a cookie, so shared caches must revalidate and key on it.
+CACHE_CONTROL = "no-cache"
+VARY = "Accept-Encoding, Cookie"
+
+
+class CachedPage:
+    """One rendered page: the body in every encoding we serve, plus validators."""
+
+    def __init__(self, variant: Hashable, body: bytes):
+        self.variant = variant
+        self.bodies: Dict[str, bytes] = {"identity": body, "gzip": gzip.compress(body, 9, mtime=0)}
+        if brotli is not None:
+            self.bodies["br"] = brotli.compress(body, quality=11)
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.modified = int(time.time())
+        self.last_modified = formatdate(self.modified, usegmt=True)
+
+    def etag(self, encoding: str) -> str:
+        # Strong validators must differ per content-coding.
+        return f'"{self.digest}"' if encoding == "identity" else f'"{self.digest}-{encoding}"'
+
+    def not_modified(self, request: Request) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+            return "*" in tags or any(self.etag(e) in tags for e in self.bodies)
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return self.modified <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+def _encoding(accept_encoding: str, available) -> str:
+    """The best coding we have that the client accepts: br, then gzip, else identity."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    for coding in ("br", "gzip"):
+        if coding in available and accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return "identity"
+
+
+_pages: Dict[Tuple, CachedPage] = {}
+
+
+def get_page(
+    brand: str, template: str, locale: str, variant: Hashable, render: Callable[[], str],
+) -> CachedPage:
+    """The cached page, rendered with ``render()`` on a miss or a new ``variant``."""
+    key = (brand, template, locale)
+    page = _pages.get(key)
+    if page is None or page.variant != variant:
+        page = CachedPage(variant, render().encode("utf-8"))
+        _pages[key] = page
+    return page
+
+
+def respond(request: Request, page: CachedPage, headers: Optional[Dict[str, str]] = None) -> Response:
+    """The page as an HTML response (or a 304) in the best encoding the client accepts."""
+    encoding = _encoding(request.headers.get("accept-encoding", ""), page.bodies)
+    response_headers = {
+        "ETag": page.etag(encoding),
+        "Last-Modified": page.last_modified,
+        "Cache-Control": CACHE_CONTROL,
+        "Vary": VARY,
+        **(headers or {}),
+    }
+    if page.not_modified(request):
+        return Response(status_code=304, headers=response_headers)
+    if encoding != "identity":
+        response_headers["Content-Encoding"] = encoding
+    return Response(page.bodies[encoding], headers=response_headers, media_type="text/html")
+
+
+def invalidate(brand: Optional[str] = None) -> None:
+    """Drop cached pages for ``brand`` (or all of them)."""
+    for key in [k for k in _pages if brand is None or k[0] == brand]:
+        _pages.pop(key, None)
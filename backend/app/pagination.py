@@ -0,0 +1,46 @@
+# app/pagination.py
+"""
+Opaque cursors for keyset pagination.
+
+A cursor is the sort key of the last row on a page, e.g. ``(time, id)``,
+JSON-encoded and base64url'd so clients treat it as an opaque token and
+just send it back as ``?cursor=``. Datetimes round-trip as ISO strings with
+their UTC offset; one without an offset was not issued by us (and couldn't be
+compared with the aware column values), so it is rejected.
+"""
+import base64
+import binascii
+import datetime
+import json
+from typing import Any, List, Sequence
+
+
+class InvalidCursor(ValueError):
+    """The client sent a cursor we didn't issue (or one for a different list)."""
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime.datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _aware_datetime(value: str) -> datetime.datetime:
+    parsed = datetime.datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        raise ValueError("cursor datetime has no UTC offset")
+    return parsed
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> List[Any]:
+    """Decode ``cursor`` into values of ``types`` (``datetime.datetime`` or a scalar type)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if isinstance(values, list) and len(values) == len(types):
+            return [
+                _aware_datetime(v) if t is datetime.datetime else t(v)
+                for v, t in zip(values, types)
+            ]
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        pass
+    raise InvalidCursor("Malformed cursor")
@@ -76,6 +76,7 @@ class Service(ServiceBase):
 class ServiceItem(BaseModel):
     service: Service
     quantity: int = 1
+    unit_price: Optional[float] = None # Price when booked (service.price is today's)
 
     model_config = ConfigDict(from_attributes=True)
 
@@ -94,6 +95,18 @@ class Availability(AvailabilityBase):
     # class Config: # For Pydantic v1
     #     orm_mode = True
 
+# One Europe/Berlin calendar day of bookable slots.
+class AvailabilityDay(BaseModel):
+    day: date
+    slots: List[Availability] = []
+
+# A page of the availability calendar. Pass ``next_cursor`` back as
+# ``?cursor=`` to continue; it is None on the last page.
+class AvailabilityCalendar(BaseModel):
+    timezone: str = "Europe/Berlin"
+    days: List[AvailabilityDay]
+    next_cursor: Optional[str] = None
+
 # --- ProcessStep Schemas ---
 class ProcessStepBase(BaseModel):
     name: str
@@ -136,6 +149,11 @@ class OrderCreate(OrderBase):
 class Order(OrderBase):
     id: int
     created_at: datetime
+    # Bumped by every status or step change; also served as the ETag.
+    version: int = 1
+    # Stored when the order was placed (sum of unit_price x quantity).
+    total: Optional[float] = None
+    currency: Optional[CurrencyEnum] = None
 
     # Nested Pydantic models for relationships
     # These will be populated by SQLAlchemy's ORM when fetched
@@ -148,4 +166,80 @@ class Order(OrderBase):
 
     model_config = ConfigDict(from_attributes=True) # For Pydantic v2+
     # class Config: # For Pydantic v1
-    #     orm_mode = True
\ No newline at end of file
+    #     orm_mode = True
+
+# Compact order for list screens (``?view=summary``): built from one
+# projection query, without the nested location/services/steps graph.
+class OrderSummary(BaseModel):
+    id: int
+    created_at: datetime
+    status: OrderStatusEnum
+    time: datetime # Start of the booked slot
+    address: str
+    total: float # Sum of price x quantity over the booked services
+    currency: Optional[CurrencyEnum] = None
+    item_count: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+# A page of a customer's order history, newest first. Pass ``next_cursor``
+# back as ``?cursor=`` to continue; it is None on the last page.
+class OrderHistory(BaseModel):
+    orders: List[Order]
+    next_cursor: Optional[str] = None
+
+# The same page with ``?view=summary``.
+class OrderHistorySummary(BaseModel):
+    orders: List[OrderSummary]
+    next_cursor: Optional[str] = None
+
+# An email in the outbox, without its payload (which holds customer data).
+class OutboxEmail(BaseModel):
+    id: int
+    kind: str
+    order_id: Optional[int] = None
+    status: str
+    attempts: int
+    last_error: Optional[str] = None
+    created_at: datetime
+    next_attempt_at: datetime
+    sent_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+# --- Bulk status updates (cleaner end-of-day work) ---
+# A step is addressed by ``step_id``, or by ``order_uuid`` plus the step's
+# ``name`` key (e.g. "step.on_the_way.name") when the client only has orders.
+class StepStatusUpdate(BaseModel):
+    step_id: Optional[int] = None
+    order_uuid: Optional[str] = None
+    name: Optional[str] = None
+    status: ProcessStepStatusEnum
+
+class OrderStatusUpdate(BaseModel):
+    order_uuid: str
+    status: OrderStatusEnum
+
+class BulkStatusUpdate(BaseModel):
+    steps: List[StepStatusUpdate] = []
+    orders: List[OrderStatusUpdate] = []
+
+# One result per requested item, in request order. ``ok`` is False (with an
+# ``error``) for items that were not applied; the others still are.
+class StepStatusResult(BaseModel):
+    ok: bool
+    error: Optional[str] = None
+    step: Optional[ProcessStep] = None
+    order_uuid: Optional[str] = None
+    order_status: Optional[OrderStatusEnum] = None
+    order_completed: bool = False # The batch's step transitions completed the order
+
+class OrderStatusResult(BaseModel):
+    order_uuid: str
+    ok: bool
+    error: Optional[str] = None
+    status: Optional[OrderStatusEnum] = None
+
+class BulkStatusResult(BaseModel):
+    steps: List[StepStatusResult]
+    orders: List[OrderStatusResult]
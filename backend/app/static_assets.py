@@ -0,0 +1,229 @@
+# app/static_assets.py
+"""
+Fingerprinted, precompressed static assets.
+
+``AssetManifest.build()`` walks ``static/`` and writes to ``STATIC_BUILD_DIR``:
+
+* a copy of every file named after its content (``car-hero.3f9c2a1b7d.png``),
+  so it can be cached forever: a changed file gets a new URL;
+* for PNG/JPEG images, WebP and AVIF versions (when Pillow is installed and
+  the result is smaller);
+* for text assets (CSS, JS, SVG, ...), ``.gz`` and ``.br`` versions (brotli
+  when the ``brotli`` package is installed).
+
+Outputs are content-addressed, so an existing one is never rebuilt: run
+``python -m app.static_assets`` in the build step and startup only hashes the
+sources. Without that, the first startup builds what is missing.
+
+Templates reference assets through ``asset_url(name)`` (and the ``picture``
+macro for images), which resolves to the fingerprinted URL.
+``AssetStaticFiles`` serves those URLs with ``Cache-Control: immutable`` and
+picks the precompressed body the client accepts; plain ``/static/<name>``
+URLs are served from ``static/`` as before.
+"""
+import gzip
+import hashlib
+import io
+import json
+import logging
+import mimetypes
+import os
+import time
+from pathlib import Path
+from typing import Dict, NamedTuple, Optional
+
+from starlette.datastructures import Headers
+from starlette.exceptions import HTTPException
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+try:
+    from PIL import Image, features
+except ImportError:  # optional: no WebP/AVIF variants
+    Image = features = None
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+STATIC_BUILD_DIR = Path(os.getenv("STATIC_BUILD_DIR", str(STATIC_DIR.parent / "static_build")))
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg"}
+TEXT_SUFFIXES = {".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".xml", ".webmanifest"}
+# Pillow format name and save options per image variant, best first.
+IMAGE_VARIANTS = {
+    "avif": ("AVIF", {"quality": 60, "speed": 6}),
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+}
+
+
+class Asset(NamedTuple):
+    """One source file and what was built from it (paths relative to the build dir)."""
+    path: str
+    media_type: str
+    variants: Dict[str, str]   # image format -> path
+    encodings: Dict[str, str]  # content-coding -> path
+
+
+def _write(path: Path, data: bytes) -> None:
+    # Several workers may build at once: write a temp file, then rename.
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _encode_image(source: bytes, fmt: str) -> Optional[bytes]:
+    name, options = IMAGE_VARIANTS[fmt]
+    if Image is None or not features.check(fmt):
+        return None
+    with Image.open(io.BytesIO(source)) as image:
+        out = io.BytesIO()
+        image.save(out, name, **options)
+    return out.getvalue()
+
+
+def _compress(data: bytes, coding: str) -> Optional[bytes]:
+    if coding == "br":
+        return brotli.compress(data, quality=11) if brotli is not None else None
+    return gzip.compress(data, 9, mtime=0)
+
+
+class AssetManifest:
+    def __init__(self, source_dir: Path = STATIC_DIR, build_dir: Path = STATIC_BUILD_DIR):
+        self.source_dir = Path(source_dir)
+        self.build_dir = Path(build_dir)
+        self.assets: Dict[str, Asset] = {}     # source name -> asset
+        self.served: Dict[str, Asset] = {}     # built path -> asset
+
+    def _built(self, rel: str, make) -> Optional[str]:
+        """``rel`` in the build dir, creating it with ``make()`` unless it exists."""
+        target = self.build_dir / rel
+        if not target.exists():
+            data = make()
+            if data is None:
+                return None
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _write(target, data)
+        return rel
+
+    def _build_one(self, name: str) -> Asset:
+        source = (self.source_dir / name).read_bytes()
+        digest = hashlib.sha256(source).hexdigest()[:10]
+        stem, suffix = os.path.splitext(name)
+        suffix_lower = suffix.lower()
+        base = f"{stem}.{digest}"
+        path = self._built(f"{base}{suffix}", lambda: source)
+
+        variants: Dict[str, str] = {}
+        if suffix_lower in IMAGE_SUFFIXES:
+            for fmt in IMAGE_VARIANTS:
+                def make(fmt=fmt):
+                    data = _encode_image(source, fmt)
+                    # Keep a smaller placeholder when the variant doesn't
+                    # help, so the next build doesn't try again.
+                    return data if data is not None and len(data) < len(source) else b""
+                rel = self._built(f"{base}.{fmt}", make)
+                if rel and (self.build_dir / rel).stat().st_size:
+                    variants[fmt] = rel
+
+        encodings: Dict[str, str] = {}
+        if suffix_lower in TEXT_SUFFIXES:
+            for coding, ext in (("br", ".br"), ("gzip", ".gz")):
+                def make(coding=coding):
+                    data = _compress(source, coding)
+                    return data if data is not None and len(data) < len(source) else b""
+                rel = self._built(f"{base}{suffix}{ext}", make)
+                if rel and (self.build_dir / rel).stat().st_size:
+                    encodings[coding] = rel
+
+        media_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        return Asset(path, media_type, variants, encodings)
+
+    def build(self) -> "AssetManifest":
+        """Fingerprint every source file, building whatever outputs are missing."""
+        started = time.monotonic()
+        assets: Dict[str, Asset] = {}
+        for file in sorted(self.source_dir.rglob("*")):
+            if not file.is_file() or any(part.startswith(".") for part in file.relative_to(self.source_dir).parts):
+                continue
+            name = file.relative_to(self.source_dir).as_posix()
+            assets[name] = self._build_one(name)
+        self.assets = assets
+        self.served = {}
+        for asset in assets.values():
+            for rel in (asset.path, *asset.variants.values()):
+                self.served[rel] = asset
+        self.build_dir.mkdir(parents=True, exist_ok=True)
+        _write(
+            self.build_dir / "manifest.json",
+            json.dumps({name: a._asdict() for name, a in assets.items()}, indent=2).encode("utf-8"),
+        )
+        logger.info("Static assets ready: %s files in %.2fs", len(assets), time.monotonic() - started)
+        return self
+
+    def url(self, name: str, fmt: Optional[str] = None) -> Optional[str]:
+        """
+        URL of ``name`` (a path under static/). With ``fmt`` ("avif"/"webp"),
+        the URL of that variant, or None if there isn't one. Unknown names fall
+        back to the plain /static/ URL.
+        """
+        asset = self.assets.get(name)
+        if fmt is not None:
+            rel = asset.variants.get(fmt) if asset else None
+            return f"/static/{rel}" if rel else None
+        return f"/static/{asset.path if asset else name}"
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    for item in accept_encoding.split(","):
+        value, _, params = item.strip().partition(";")
+        if value.strip().lower() == coding:
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+class AssetStaticFiles(StaticFiles):
+    """``StaticFiles`` over static/ that also serves the manifest's built files."""
+
+    def __init__(self, manifest: AssetManifest):
+        super().__init__(directory=str(manifest.source_dir))
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        asset = self.manifest.served.get(path.replace(os.sep, "/"))
+        if asset is None:
+            return await super().get_response(path, scope)
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+
+        request_headers = Headers(scope=scope)
+        headers = {"Cache-Control": IMMUTABLE}
+        rel, media_type = path, asset.media_type
+        if path == asset.path and asset.encodings:
+            headers["Vary"] = "Accept-Encoding"
+            accept_encoding = request_headers.get("accept-encoding", "")
+            for coding in ("br", "gzip"):
+                if coding in asset.encodings and _accepts(accept_encoding, coding):
+                    rel = asset.encodings[coding]
+                    headers["Content-Encoding"] = coding
+                    break
+        elif path != asset.path:
+            media_type = f"image/{os.path.splitext(path)[1][1:]}"
+
+        full_path = self.manifest.build_dir / rel
+        response = FileResponse(full_path, headers=headers, media_type=media_type, stat_result=os.stat(full_path))
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    AssetManifest().build()
@@ -7,6 +7,9 @@ table — when you add a new service translation here, add it there too.
 
 from __future__ import annotations
 
+from functools import lru_cache
+from typing import Callable
+
 Locale = str  # "de" | "en"
 DEFAULT_LOCALE: Locale = "de"
 
@@ -183,6 +186,14 @@ _TRANSLATIONS: dict[str, dict[Locale, str]] = {
     "web.cleaner.empty":            {"en": "No open orders right now. Take a break ☕",
                                      "de": "Aktuell keine offenen Aufträge. Gönnen Sie sich eine Pause ☕"},
     "web.cleaner.order_prefix":     {"en": "Order",             "de": "Auftrag"},
+    "web.cleaner.filter_from":      {"en": "From",              "de": "Von"},
+    "web.cleaner.filter_to":        {"en": "To",                "de": "Bis"},
+    "web.cleaner.filter_step":      {"en": "Step status",       "de": "Schrittstatus"},
+    "web.cleaner.filter_any_step":  {"en": "Any",               "de": "Alle"},
+    "web.cleaner.filter_apply":     {"en": "Filter",            "de": "Filtern"},
+    "web.cleaner.filter_today":     {"en": "Today",             "de": "Heute"},
+    "web.cleaner.filter_reset":     {"en": "Reset",             "de": "Zurücksetzen"},
+    "web.cleaner.next_page":        {"en": "Next page →",       "de": "Nächste Seite →"},
 
     # cleaner order detail
     "web.cleaner.back_to_list":     {"en": "← All orders",      "de": "← Alle Aufträge"},
@@ -270,17 +281,43 @@ _TRANSLATIONS: dict[str, dict[Locale, str]] = {
 }
 
 
-def translate(raw: str | None, locale: Locale = DEFAULT_LOCALE, **params) -> str:
-    """
-    Translate a single key. If ``raw`` isn't itself a known key (e.g. a legacy
-    row or a typo) it is returned verbatim — same safe-fallback behaviour as
-    the mobile app. ``params`` are interpolated into ``{name}`` placeholders.
-    """
+# --- Compiled lookup tables -------------------------------------------------
+# ``translate`` / ``translate_brand`` are called for every label of every page
+# and email. Rather than walking ``_TRANSLATIONS`` (entry -> locale -> "en"
+# fallback, then a ``{raw}.{brand}`` probe) on each call, the fallbacks are
+# resolved once here into one flat ``key -> string`` dict per (locale, brand).
+
+_BRANDS: tuple[str | None, ...] = (None, "car", "home")
+
+
+def _resolve(entry: dict[Locale, str], locale: Locale, raw: str) -> str:
+    return entry.get(locale) or entry.get("en") or raw
+
+
+def _compile(locale: Locale, brand: str | None) -> dict[str, str]:
+    table = {key: _resolve(entry, locale, key) for key, entry in _TRANSLATIONS.items()}
+    if brand:
+        suffix = f".{brand}"
+        for key, entry in _TRANSLATIONS.items():
+            if key.endswith(suffix):
+                generic = key[: -len(suffix)]
+                if generic:
+                    table[generic] = table[key]
+    return table
+
+
+_LOCALES: tuple[Locale, ...] = tuple(sorted({loc for entry in _TRANSLATIONS.values() for loc in entry}))
+_TABLES: dict[tuple[Locale, str | None], dict[str, str]] = {
+    (locale, brand): _compile(locale, brand) for locale in _LOCALES for brand in _BRANDS
+}
+
+
+def _lookup(table: dict[str, str], raw: str | None, params: dict) -> str:
     if not raw:
         return ""
-    entry = _TRANSLATIONS.get(raw)
-    value = entry.get(locale) or entry.get("en") or raw if entry else raw
-    if params:
+    value = table.get(raw, raw)
+    # Most strings have no placeholders: skip str.format for those.
+    if params and "{" in value:
         try:
             return value.format(**params)
         except (KeyError, IndexError):
@@ -288,16 +325,45 @@ def translate(raw: str | None, locale: Locale = DEFAULT_LOCALE, **params) -> str
     return value
 
 
+def _table(locale: Locale, brand: str | None = None) -> dict[str, str] | None:
+    """The compiled table, or None for a brand we have no table for."""
+    table = _TABLES.get((locale, brand))
+    if table is None and brand in _BRANDS:
+        # A locale no entry has resolves exactly like "en".
+        table = _TABLES[("en", brand)]
+    return table
+
+
+def translate(raw: str | None, locale: Locale = DEFAULT_LOCALE, **params) -> str:
+    """
+    Translate a single key. If ``raw`` isn't itself a known key (e.g. a legacy
+    row or a typo) it is returned verbatim — same safe-fallback behaviour as
+    the mobile app. ``params`` are interpolated into ``{name}`` placeholders.
+    """
+    return _lookup(_table(locale), raw, params)
+
+
 def translate_brand(raw: str | None, locale: Locale, brand: str | None = None, **params) -> str:
     """
     Brand-aware translate. Tries the brand-specific key ``{raw}.{brand}`` first
     (e.g. ``email.customer.signature.home``) and falls back to the generic key.
     """
-    if raw and brand:
+    table = _table(locale, brand)
+    if table is None:
         brand_key = f"{raw}.{brand}"
-        if brand_key in _TRANSLATIONS:
-            return translate(brand_key, locale, **params)
-    return translate(raw, locale, **params)
+        if raw and brand_key in _TRANSLATIONS:
+            raw = brand_key
+        table = _table(locale)
+    return _lookup(table, raw, params)
+
+
+@lru_cache(maxsize=64)
+def translator(locale: Locale, brand: str | None = None) -> Callable[..., str]:
+    """``translate_brand`` bound to (locale, brand), e.g. a template's ``t()``."""
+    table = _table(locale, brand)
+    if table is None:
+        return lambda raw, **params: translate_brand(raw, locale, brand, **params)
+    return lambda raw, **params: _lookup(table, raw, params)
 
 
 def normalize_locale(locale: str | None) -> Locale:
@@ -1,25 +1,27 @@
 import logging
 import os
+from contextlib import asynccontextmanager
 import secrets
 import sys
 from datetime import date, datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
-from fastapi import FastAPI, Depends, HTTPException, Response, status, BackgroundTasks, Request, Cookie
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi import FastAPI, Depends, HTTPException, Query, Response, status, Request, Cookie
+from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session, joinedload, selectinload
-from typing import List, Dict, Optional
-
-from app import models, schemas, crud
-from app.database import engine, get_db, Base # Import Base for table creation
-from app.email_service import send_booking_confirmation, send_cleaner_notification
+from typing import Annotated, List, Dict, Hashable, Literal, Optional, Union
+from pydantic import BeforeValidator
+
+from app import models, schemas, crud, crud_async, catalog, fast_json, order_events, page_cache, static_assets
+from app.availability_calendar import calendar as slot_calendar
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.database import engine, get_session, pool_status, AnySession, Base # Import Base for table creation
+from app.email_worker import EMAIL_WORKER_EMBEDDED, pool as email_workers
 from app.translations import (
     translate as _tr,
-    translate_brand as _trb,
+    translator as _translator,
     normalize_locale as _normalize_locale,
 )
 
@@ -37,12 +39,28 @@ for _name in (__name__, "app.email_service"):
 logger = logging.getLogger(__name__)
 
 # Disable the public default docs routes — we expose authenticated ones below.
-app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Embedded email delivery (see app/email_worker.py); with
+    # EMAIL_WORKER_EMBEDDED=0 run `python -m app.email_worker` separately.
+    if EMAIL_WORKER_EMBEDDED:
+        email_workers.start()
+    yield
+    order_events.hub.stop()
+    if EMAIL_WORKER_EMBEDDED:
+        email_workers.stop()
+
+
+app = FastAPI(docs_url=None, redoc_url=None, openapi_url=None, lifespan=lifespan)
 
 # --- Web UI templates + static assets ---------------------------------------
 STATIC_DIR = Path(__file__).parent / "static"
+# Fingerprinted copies, WebP/AVIF variants and precompressed text assets
+# (see app/static_assets.py); templates link them through asset_url().
+assets = static_assets.AssetManifest(STATIC_DIR)
 if STATIC_DIR.exists():
-    app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
+    assets.build()
+    app.mount("/static", static_assets.AssetStaticFiles(assets), name="static")
 
 TEMPLATES_DIR = Path(__file__).parent / "templates"
 print(
@@ -65,6 +83,7 @@ def _format_when(value) -> str:
 
 
 templates.env.globals["format_when"] = _format_when
+templates.env.globals["asset_url"] = assets.url
 
 
 # --- Web UI locale ----------------------------------------------------------
@@ -85,13 +104,7 @@ def web_locale(
     return "de"
 
 
-def render_web(
-    request: Request,
-    template: str,
-    locale: str,
-    context: Optional[Dict] = None,
-) -> Response:
-    """Render a Jinja template with a `t()` helper bound to ``locale``."""
+def _web_context(request: Request, locale: str, context: Optional[Dict]) -> Dict:
     ctx = dict(context or {})
     ctx["locale"] = locale
     # Make the brand available to every template (for /static/{brand_key}-*.png
@@ -99,10 +112,13 @@ def render_web(
     # brand_key (e.g. the landing page, honouring ?brand=) keep theirs.
     ctx.setdefault("brand_key", resolve_web_brand(request).value)
     # Brand-aware translate: tries `{key}.{brand}` first (e.g. the home hero
-    # copy), then falls back to the shared/car string.
-    _brand_key = ctx["brand_key"]
-    ctx["t"] = lambda key, **params: _trb(key, locale, _brand_key, **params)
-    response = templates.TemplateResponse(request, template, ctx)
+    # copy), then falls back to the shared/car string. Cached per
+    # (locale, brand), so no closure is built per request.
+    ctx["t"] = _translator(locale, ctx["brand_key"])
+    return ctx
+
+
+def _set_web_cookies(response: Response, locale: str, brand_key: str) -> None:
     # Persist the choice so the user doesn't have to keep `?lang=` in the URL.
     response.set_cookie(
         WEB_LOCALE_COOKIE,
@@ -115,11 +131,42 @@ def render_web(
     # brand on hosts that aren't cargrime.de/homegrime.de (e.g. localhost).
     response.set_cookie(
         WEB_BRAND_COOKIE,
-        _brand_key,
+        brand_key,
         max_age=60 * 60 * 24 * 365,
         httponly=False,
         samesite="lax",
     )
+
+
+def render_web(
+    request: Request,
+    template: str,
+    locale: str,
+    context: Optional[Dict] = None,
+) -> Response:
+    """Render a Jinja template with a `t()` helper bound to ``locale``."""
+    ctx = _web_context(request, locale, context)
+    response = templates.TemplateResponse(request, template, ctx)
+    _set_web_cookies(response, locale, ctx["brand_key"])
+    return response
+
+
+def render_web_cached(
+    request: Request,
+    template: str,
+    locale: str,
+    variant: Hashable,
+    context: Optional[Dict] = None,
+) -> Response:
+    """``render_web`` for public pages that are the same for every visitor of a
+    (brand, locale): rendered once per ``variant`` and served from page_cache."""
+    ctx = _web_context(request, locale, context)
+    page = page_cache.get_page(
+        ctx["brand_key"], template, locale, variant,
+        lambda: templates.get_template(template).render(dict(ctx, request=request)),
+    )
+    response = page_cache.respond(request, page)
+    _set_web_cookies(response, locale, ctx["brand_key"])
     return response
 
 
@@ -263,7 +310,7 @@ async def web_root(
     request: Request,
     brand: Optional[models.BrandEnum] = None,
     locale: str = Depends(web_locale),
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
 ):
     """Public marketing landing page — services overview + app download.
 
@@ -271,17 +318,18 @@ async def web_root(
     an explicit ``?brand=`` query param overrides it for local testing.
     """
     brand = resolve_web_brand(request, brand)
-    services = (
-        db.query(models.Service)
-        .filter(models.Service.is_active.is_(True), models.Service.brand == brand)
-        .order_by(models.Service.id)
-        .all()
-    )
+    # Served from the page cache; the catalog digest re-renders it whenever a
+    # service changes. The catalog itself is cached too, so a hit normally
+    # doesn't touch the database.
+    entry = await catalog.get_catalog(db, brand)
+    # The landing page lists services in creation (id) order.
+    services = sorted(entry.services, key=lambda s: s.id)
     web_brand = WEB_BRANDS.get(brand, WEB_BRANDS[models.BrandEnum.CAR])
-    return render_web(
+    return render_web_cached(
         request,
         "index.html",
         locale,
+        entry.digest,
         {
             "services": services,
             "brand": brand.value,
@@ -302,78 +350,99 @@ def _policy_template(base: str, brand: models.BrandEnum) -> str:
 @app.get("/terms", response_class=HTMLResponse)
 async def web_terms(request: Request, brand: Optional[models.BrandEnum] = None, locale: str = Depends(web_locale)):
     b = resolve_web_brand(request, brand)
-    return render_web(request, _policy_template("terms", b), locale,
-                      {"today": date.today().isoformat(), "brand_key": b.value})
+    today = date.today().isoformat()
+    return render_web_cached(request, _policy_template("terms", b), locale, today,
+                             {"today": today, "brand_key": b.value})
 
 
 @app.get("/privacy", response_class=HTMLResponse)
 async def web_privacy(request: Request, brand: Optional[models.BrandEnum] = None, locale: str = Depends(web_locale)):
     b = resolve_web_brand(request, brand)
-    return render_web(request, _policy_template("privacy", b), locale,
-                      {"today": date.today().isoformat(), "brand_key": b.value})
+    today = date.today().isoformat()
+    return render_web_cached(request, _policy_template("privacy", b), locale, today,
+                             {"today": today, "brand_key": b.value})
 
 
 @app.get("/cancellation", response_class=HTMLResponse)
 async def web_cancellation(request: Request, brand: Optional[models.BrandEnum] = None, locale: str = Depends(web_locale)):
     b = resolve_web_brand(request, brand)
-    return render_web(request, _policy_template("cancellation", b), locale,
-                      {"today": date.today().isoformat(), "brand_key": b.value})
+    today = date.today().isoformat()
+    return render_web_cached(request, _policy_template("cancellation", b), locale, today,
+                             {"today": today, "brand_key": b.value})
 
 
 @app.get("/press", response_class=HTMLResponse)
 async def web_press(request: Request, brand: Optional[models.BrandEnum] = None, locale: str = Depends(web_locale)):
     """Public press / review kit page consolidating store copy + assets."""
     b = resolve_web_brand(request, brand)
-    return render_web(request, _policy_template("press", b), locale,
-                      {"today": date.today().isoformat(), "brand_key": b.value})
+    today = date.today().isoformat()
+    return render_web_cached(request, _policy_template("press", b), locale, today,
+                             {"today": today, "brand_key": b.value})
 
 
 # ---------------------------------------------------------------------------
 # Web UI: cleaner dashboard
 # ---------------------------------------------------------------------------
-def _load_order_for_cleaner(db: Session, order_uuid: str) -> Optional[models.Order]:
-    return (
-        db.query(models.Order)
-        .filter(models.Order.uuid == order_uuid)
-        .options(
-            joinedload(models.Order.location),
-            joinedload(models.Order.availability),
-            selectinload(models.Order.services),
-            selectinload(models.Order.process_steps),
-        )
-        .first()
-    )
-
-
 @app.get("/cleaner", response_class=HTMLResponse)
 async def cleaner_index(_user: str = Depends(require_cleaner_auth)):
     return RedirectResponse(url="/cleaner/orders")
 
 
+# Orders per dashboard page.
+CLEANER_ORDERS_PAGE_SIZE = int(os.getenv("CLEANER_ORDERS_PAGE_SIZE", "25"))
+
+# The filter form submits fields left empty as "": treat them as unset.
+_BlankIsNone = BeforeValidator(lambda value: value or None)
+
+
 @app.get("/cleaner/orders", response_class=HTMLResponse)
 async def cleaner_orders(
     request: Request,
-    db: Session = Depends(get_db),
+    day: Annotated[Optional[date], _BlankIsNone] = None,
+    from_date: Annotated[Optional[date], _BlankIsNone, Query(alias="from")] = None,
+    to_date: Annotated[Optional[date], _BlankIsNone, Query(alias="to")] = None,
+    step: Annotated[Optional[models.ProcessStepStatusEnum], _BlankIsNone] = None,
+    cursor: Optional[str] = None,
+    db: AnySession = Depends(get_session),
     locale: str = Depends(web_locale),
     _user: str = Depends(require_cleaner_auth),
 ):
+    """
+    Open orders by appointment time, a page at a time. ``day`` (or the
+    ``from``/``to`` range, Europe/Berlin days) narrows them to appointments on
+    those days, ``step`` to orders with a process step in that status.
+    """
     # Scope the dashboard to the brand of the domain it's opened on
     # (homegrime.de → home orders, cargrime.de → car orders).
     brand = resolve_web_brand(request)
-    orders = (
-        db.query(models.Order)
-        .filter(
-            models.Order.status == models.OrderStatusEnum.OPEN,
-            models.Order.brand == brand,
-        )
-        .options(
-            joinedload(models.Order.location),
-            joinedload(models.Order.availability),
-        )
-        .order_by(models.Order.created_at.desc())
-        .all()
+    if day is not None:
+        from_date = to_date = day
+    if from_date is not None and to_date is not None and to_date < from_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="`to` must not be before `from`")
+    after = None
+    if cursor:
+        try:
+            after = tuple(decode_cursor(cursor, (datetime, int)))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    orders = await crud_async.get_open_orders(
+        db, brand, start_date=from_date, end_date=to_date, step_status=step,
+        limit=CLEANER_ORDERS_PAGE_SIZE + 1, after=after,
     )
-    return render_web(request, "cleaner_orders.html", locale, {"orders": orders})
+    next_url = None
+    if len(orders) > CLEANER_ORDERS_PAGE_SIZE:
+        orders = orders[:CLEANER_ORDERS_PAGE_SIZE]
+        last = orders[-1]
+        next_page = request.url.include_query_params(cursor=encode_cursor(last.availability.time, last.id))
+        next_url = f"{next_page.path}?{next_page.query}"
+    return render_web(request, "cleaner_orders.html", locale, {
+        "orders": orders,
+        "next_url": next_url,
+        "filters": {"from": from_date, "to": to_date, "step": step.value if step else None},
+        "today": crud.business_today(),
+        "step_statuses": [s.value for s in models.ProcessStepStatusEnum],
+    })
 
 
 @app.get("/cleaner/orders/{order_uuid}", response_class=HTMLResponse)
@@ -382,10 +451,10 @@ async def cleaner_order_detail(
     order_uuid: str,
     ok: Optional[str] = None,
     err: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
     locale: str = Depends(web_locale),
 ):
-    order = _load_order_for_cleaner(db, order_uuid)
+    order = await crud_async.get_order_by_uuid(db, order_uuid)
     if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
     # Keep brands separated: a car order can't be opened on homegrime.de and
@@ -406,12 +475,12 @@ async def cleaner_order_detail(
 async def cleaner_update_order_status(
     order_uuid: str,
     new_status: schemas.OrderStatusEnum,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
 ):
-    order = db.query(models.Order).filter(models.Order.uuid == order_uuid).first()
+    order = await crud_async.get_order_by_uuid(db, order_uuid)
     if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
-    crud.update_order_status(db=db, order_id=order.id, new_status=new_status)
+    await crud_async.update_order_status(db=db, order_id=order.id, new_status=new_status)
     return RedirectResponse(
         url=f"/cleaner/orders/{order_uuid}?ok=Order+marked+{new_status.value}",
         status_code=303,
@@ -423,30 +492,102 @@ async def cleaner_update_step(
     order_uuid: str,
     step_id: int,
     new_status: schemas.ProcessStepStatusEnum,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
 ):
-    # Resolve the order via its uuid, then check the step belongs to it. This
-    # prevents URLs from being forged to update steps from someone else's order.
-    order = db.query(models.Order).filter(models.Order.uuid == order_uuid).first()
-    if order is None:
-        raise HTTPException(status_code=404, detail="Order not found")
-
-    step = db.query(models.ProcessStep).filter(models.ProcessStep.id == step_id).first()
-    if step is None or step.order_id != order.id:
+    # The update is scoped to the order's uuid, so URLs can't be forged to
+    # update steps from someone else's order. Finishing the last step also
+    # completes the order, in the same statement.
+    transition = await crud_async.update_process_step_status(
+        db=db, step_id=step_id, new_status=new_status, order_uuid=order_uuid,
+    )
+    if transition is None:
+        if await crud_async.get_order_by_uuid(db, order_uuid) is None:
+            raise HTTPException(status_code=404, detail="Order not found")
         return RedirectResponse(
             url=f"/cleaner/orders/{order_uuid}?err=Step+not+found+on+this+order",
             status_code=303,
         )
-    crud.update_process_step_status(db=db, step_id=step_id, new_status=new_status)
     return RedirectResponse(
-        url=f"/cleaner/orders/{order_uuid}?ok=Step+'{step.name}'+updated+to+{new_status.value}",
+        url=f"/cleaner/orders/{order_uuid}?ok=Step+'{transition.step.name}'+updated+to+{new_status.value}",
         status_code=303,
     )
 
 
+# Most items a single bulk status request may carry.
+BULK_STATUS_MAX_ITEMS = 1000
+
+
+@app.post(
+    "/api/cleaner/bulk_status",
+    response_model=schemas.BulkStatusResult,
+    summary="Bulk Update Step and Order Statuses",
+    description=(
+        "Applies many process-step and order status transitions in one "
+        "transaction, e.g. advancing every order of the day to \"on the way\" "
+        "or closing out a day, and reports a result per item. Protected by the "
+        "cleaner credentials."
+    ),
+)
+async def bulk_update_statuses(
+    update: schemas.BulkStatusUpdate,
+    db: AnySession = Depends(get_session),
+    _user: str = Depends(require_cleaner_auth),
+):
+    """
+    - **steps**: `{"step_id", "status"}`, or `{"order_uuid", "name", "status"}`
+      to address a step by its name key (e.g. `step.on_the_way.name`).
+    - **orders**: `{"order_uuid", "status"}`; completing an order completes its steps.
+
+    Step transitions are applied first (finishing an order's last step
+    completes it), then order transitions. Items that can't be applied are
+    reported with `ok: false` and an `error`; the others are still applied.
+    """
+    if len(update.steps) + len(update.orders) > BULK_STATUS_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {BULK_STATUS_MAX_ITEMS} items per request",
+        )
+    steps, orders = await crud_async.bulk_update_statuses(db, update.steps, update.orders)
+    return fast_json.respond(schemas.BulkStatusResult, {"steps": steps, "orders": orders}, validate=True)
+
+
 # ---------------------------------------------------------------------------
 # Existing JSON API
 # ---------------------------------------------------------------------------
+# How long clients may reuse a catalog response before revalidating it with
+# If-None-Match (which is answered with a 304 while the catalog is unchanged).
+CATALOG_MAX_AGE = int(os.getenv("CATALOG_MAX_AGE", "60"))
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's ``If-None-Match`` lists ``etag`` (or is ``*``)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [c.strip() for c in header.split(",")]
+    # If-None-Match uses weak comparison: ignore any W/ prefix.
+    return "*" in candidates or etag in (c[2:] if c.startswith("W/") else c for c in candidates)
+
+
+# Orders change with every process step, so clients revalidate on each
+# refresh: they send the ETag back in If-None-Match and, while the order (or
+# every order on the page) keeps its version, get an empty 304 for the price
+# of a one-column query. Without If-None-Match the ETag comes from the loaded
+# rows, so a plain GET costs no extra query.
+ORDER_CACHE_CONTROL = "private, no-cache"
+
+
+def _order_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": ORDER_CACHE_CONTROL}
+
+
+def _order_etag(order_id: int, version: int) -> str:
+    return f'"{order_id}.{version}"'
+
+
+def _order_page_etag(view: str, digest: str) -> str:
+    return f'"{view}.{digest}"'
+
 @app.get( # Changed from @app.post to @app.get
     "/api/health",
     status_code=status.HTTP_204_NO_CONTENT, # Still returns 204 No Content
@@ -464,22 +605,140 @@ async def health_check():
     # For this example, we simply return a successful status.
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
+
+@app.get(
+    "/api/internal/db/pool",
+    summary="Database Pool Statistics",
+    description=(
+        "Live connection pool statistics (checked out, overflow, checkout wait "
+        "time, pre-ping failures) for the worker process that serves the "
+        "request. Protected by the docs credentials."
+    ),
+)
+async def database_pool_stats(_user: str = Depends(require_docs_auth)):
+    """
+    Each uvicorn worker has its own pool, so repeated calls may be answered by
+    different workers — compare the `pid` field.
+    """
+    return pool_status()
+
+
+@app.get(
+    "/api/internal/email/outbox",
+    summary="Email Outbox Status",
+    description=(
+        "Outbox row counts per status, how long the oldest due email has been "
+        "waiting, and the most recent dead-lettered emails. Protected by the "
+        "docs credentials."
+    ),
+)
+async def email_outbox_status(
+    _user: str = Depends(require_docs_auth),
+    db: AnySession = Depends(get_session),
+):
+    status_ = await crud_async.get_outbox_stats(db)
+    dead = await crud_async.get_dead_letters(db, limit=50)
+    status_["dead"] = [schemas.OutboxEmail.model_validate(row).model_dump(mode="json") for row in dead]
+    return status_
+
+
+@app.post(
+    "/api/internal/email/outbox/{outbox_id}/requeue",
+    summary="Requeue a Dead Email",
+    description="Gives a dead-lettered email a fresh set of delivery attempts. Protected by the docs credentials.",
+)
+async def requeue_outbox_email(
+    outbox_id: int,
+    _user: str = Depends(require_docs_auth),
+    db: AnySession = Depends(get_session),
+):
+    if not await crud_async.requeue_outbox_email(db, outbox_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No dead email with this id")
+    if EMAIL_WORKER_EMBEDDED:
+        email_workers.wake()
+    return {"requeued": outbox_id}
+
 # Get All Orders Endpoint
 @app.get(
     "/api/orders/get/phone_identifier/{phone_identifier}",
-    response_model=List[schemas.Order],
+    response_model=Union[List[schemas.Order], List[schemas.OrderSummary]],
     summary="Get All Orders",
-    description="Retrieves a list of all orders with their associated location, services, and availability."
+    description=(
+        "Retrieves a list of all orders with their associated location, services, and availability. "
+        "Deprecated: `skip` pages by offset; use `/api/orders/history/phone_identifier/{phone_identifier}`."
+    ),
+    deprecated=True,
 )
 async def read_orders(
+    request: Request,
     phone_identifier: str,
     brand: models.BrandEnum = models.BrandEnum.CAR,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    view: Literal["full", "summary"] = "full",
+    db: AnySession = Depends(get_session),
 ):
-    orders = crud.get_orders(db, phone_identifier, brand=brand, skip=skip, limit=limit)
-    return orders
+    if "if-none-match" in request.headers:
+        digest = await crud_async.get_order_page_digest(db, phone_identifier, brand=brand, skip=skip, limit=limit)
+        etag = _order_page_etag(view, digest)
+        if _etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_order_headers(etag))
+    if view == "summary":
+        rows = await crud_async.get_order_summaries(db, phone_identifier, brand=brand, skip=skip, limit=limit)
+        headers = _order_headers(_order_page_etag(view, crud.order_page_digest(rows)))
+        return fast_json.respond(List[schemas.OrderSummary], rows, validate=True, headers=headers)
+    orders = await crud_async.get_orders(db, phone_identifier, brand=brand, skip=skip, limit=limit)
+    headers = _order_headers(_order_page_etag(view, crud.order_page_digest(orders)))
+    return fast_json.respond(List[schemas.Order], orders, validate=True, headers=headers)
+
+# Order History Endpoint (keyset-paged)
+@app.get(
+    "/api/orders/history/phone_identifier/{phone_identifier}",
+    response_model=Union[schemas.OrderHistory, schemas.OrderHistorySummary],
+    summary="Get Order History",
+    description=(
+        "A customer's orders, newest first, with their associated location, services, "
+        "and availability. At most `limit` orders per page; pass `next_cursor` back as "
+        "`cursor` for the next page. `view=summary` returns compact rows (status, slot "
+        "time, address, total, item count) for list screens; the full order is "
+        "available from the by-ID endpoint. Send the page's `ETag` back in "
+        "`If-None-Match` to get an empty 304 while none of its orders changed."
+    ),
+)
+async def read_order_history(
+    request: Request,
+    phone_identifier: str,
+    brand: models.BrandEnum = models.BrandEnum.CAR,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=100),
+    view: Literal["full", "summary"] = "full",
+    db: AnySession = Depends(get_session),
+):
+    before = None
+    if cursor:
+        try:
+            before = tuple(decode_cursor(cursor, (datetime, int)))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    # The extra row that decides next_cursor is part of the digest too.
+    if "if-none-match" in request.headers:
+        digest = await crud_async.get_order_page_digest(
+            db, phone_identifier, brand=brand, limit=limit + 1, before=before,
+        )
+        etag = _order_page_etag(view, digest)
+        if _etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_order_headers(etag))
+    fetch = crud_async.get_order_summaries if view == "summary" else crud_async.get_orders
+    orders = await fetch(db, phone_identifier, brand=brand, limit=limit + 1, before=before)
+    headers = _order_headers(_order_page_etag(view, crud.order_page_digest(orders)))
+    has_more = len(orders) > limit
+    orders = orders[:limit]
+    page = {
+        "orders": orders,
+        "next_cursor": encode_cursor(orders[-1].created_at, orders[-1].id) if has_more else None,
+    }
+    page_type = schemas.OrderHistorySummary if view == "summary" else schemas.OrderHistory
+    return fast_json.respond(page_type, page, validate=True, headers=headers)
 
 # Get Order By ID Endpoint (NEW)
 @app.get(
@@ -489,18 +748,29 @@ async def read_orders(
     description="Retrieves a single order by its unique ID, including associated location, services, and availability."
 )
 async def read_order_by_id(
+    request: Request,
     phone_identifier: str,
     order_id: int,
     brand: models.BrandEnum = models.BrandEnum.CAR,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
 ):
     """
     Retrieves a single order from the database by its ID.
 
     - **order_id**: The unique integer ID of the order to retrieve.
+
+    The `ETag` is the order's version; a request whose `If-None-Match`
+    still matches gets an empty 304 after a one-column lookup.
     """
+    if "if-none-match" in request.headers:
+        version = await crud_async.get_order_version(db, phone_identifier, order_id, brand=brand)
+        if version is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+        etag = _order_etag(order_id, version)
+        if _etag_matches(request, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_order_headers(etag))
     print("Fetching order with ID:", order_id)  # Debugging line
-    db_order = crud.get_order_by_phone_identifier_and_id(
+    db_order = await crud_async.get_order_by_phone_identifier_and_id(
         db, phone_identifier=phone_identifier, order_id=order_id, brand=brand,
     )
     if db_order is None:
@@ -508,7 +778,77 @@ async def read_order_by_id(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Order not found"
         )
-    return db_order
+    headers = _order_headers(_order_etag(db_order.id, db_order.version))
+    return fast_json.respond(schemas.Order, db_order, validate=True, headers=headers)
+
+
+# Live order progress (server-sent events, see app/order_events.py). The
+# stream starts with a snapshot read after subscribing, so no change is lost
+# between the two.
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+async def _order_event_stream(db: AnySession, topic, phone_identifier: str, brand: models.BrandEnum, order_id=None):
+    subscription = order_events.hub.subscribe(topic)
+    try:
+        listening = await order_events.hub.wait_listening()
+        # Streams stay open for minutes: this also releases the connection.
+        snapshot = await crud_async.get_order_progress(db, phone_identifier, brand, order_id=order_id)
+    except BaseException:
+        order_events.hub.unsubscribe(subscription)
+        raise
+    if order_id is not None and not snapshot:
+        order_events.hub.unsubscribe(subscription)
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Order not found")
+    if not listening:
+        # No change would ever reach this stream: send the snapshot and have
+        # the client reconnect shortly instead of waiting on a dead stream.
+        order_events.hub.unsubscribe(subscription)
+        logger.warning("Order event listener is not ready; ending %s after its snapshot", topic)
+        return StreamingResponse(
+            order_events.snapshot_then_retry(snapshot), media_type="text/event-stream", headers=SSE_HEADERS,
+        )
+    return StreamingResponse(
+        order_events.stream(subscription, snapshot), media_type="text/event-stream", headers=SSE_HEADERS,
+    )
+
+
+@app.get(
+    "/api/orders/events/phone_identifier/{phone_identifier}",
+    summary="Stream Order Progress",
+    description=(
+        "Server-sent events with the status and process steps of the customer's "
+        "orders: one `order` event per OPEN order on connect, then one whenever "
+        "an order's status or steps change."
+    ),
+)
+async def stream_order_events(
+    phone_identifier: str,
+    brand: models.BrandEnum = models.BrandEnum.CAR,
+    db: AnySession = Depends(get_session),
+):
+    return await _order_event_stream(
+        db, order_events.phone_topic(phone_identifier, brand), phone_identifier, brand,
+    )
+
+
+@app.get(
+    "/api/orders/events/phone_identifier/{phone_identifier}/id/{order_id}",
+    summary="Stream Order Progress by ID",
+    description=(
+        "Server-sent events for one order: its status and process steps on "
+        "connect, then again whenever they change."
+    ),
+)
+async def stream_order_events_by_id(
+    phone_identifier: str,
+    order_id: int,
+    brand: models.BrandEnum = models.BrandEnum.CAR,
+    db: AnySession = Depends(get_session),
+):
+    return await _order_event_stream(
+        db, order_events.order_topic(order_id), phone_identifier, brand, order_id=order_id,
+    )
 
 
 # Create Order Endpoint
@@ -521,75 +861,27 @@ async def read_order_by_id(
 )
 async def create_new_order(
     order: schemas.OrderCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
 ):
     try:
-        db_order = crud.create_order(db=db, order=order)
+        db_order = await crud_async.create_order(db=db, order=order)
+    except crud.SlotUnavailableError as e:
+        # Someone else booked (or is booking) this slot: the app should
+        # refresh the calendar and let the customer pick another one.
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    slot_calendar.remove(db_order.availability_id)
 
-    # Schedule emails AFTER the response is returned so the client never waits
-    # for SMTP/HTTP. Failures inside the tasks are logged but never affect the
-    # order response.
+    # The booking emails were queued in the outbox with the order; wake the
+    # local workers so they go out now instead of at the next poll.
     # NOTE: we also print() because uvicorn's log handler sometimes swallows
     # third-party logger output on hosting providers.
     print(f"[order_create] order={db_order.id} email={order.email!r}", flush=True)
+    if EMAIL_WORKER_EMBEDDED:
+        email_workers.wake()
 
-    try:
-        # Quantity-aware: each association carries (service, quantity). The car
-        # app always has quantity 1; the home app may book several units.
-        items = list(db_order.service_items)
-        total = sum((it.service.price or 0) * (it.quantity or 1) for it in items)
-        currency = (
-            items[0].service.currency.value
-            if items and items[0].service.currency is not None
-            else "EUR"
-        )
-        common = dict(
-            order_id=db_order.id,
-            brand=db_order.brand.value if db_order.brand else "car",
-            name=db_order.name,
-            plate_number=db_order.plate_number,
-            phone_number=db_order.phone_number,
-            address=db_order.location.address if db_order.location else "",
-            availability_time=db_order.availability.time if db_order.availability else None,
-            service_names=[it.service.name for it in items],
-            service_quantities=[it.quantity or 1 for it in items],
-            total_price=total if items else None,
-            currency=currency,
-        )
-        customer_locale = order.locale or "de"
-
-        # 1. Customer confirmation (only if they provided an email).
-        if order.email:
-            logger.info("Queueing booking confirmation email for order %s to %s", db_order.id, order.email)
-            print(f"[order_create] queueing customer email for order {db_order.id}", flush=True)
-            background_tasks.add_task(
-                send_booking_confirmation,
-                to=order.email,
-                locale=customer_locale,
-                **common,
-            )
-        else:
-            print(f"[order_create] order={db_order.id} no customer email on payload", flush=True)
-
-        # 2. Internal cleaner notification — always in German regardless of
-        #    what the customer chose, since the cleaning team operates in DE.
-        logger.info("Queueing cleaner notification email for order %s", db_order.id)
-        print(f"[order_create] queueing cleaner email for order {db_order.id}", flush=True)
-        background_tasks.add_task(
-            send_cleaner_notification,
-            order_uuid=db_order.uuid,
-            customer_email=order.email,
-            locale="de",
-            **common,
-        )
-    except Exception as e:
-        logger.exception("Failed to queue emails for order %s", db_order.id)
-        print(f"[order_create] ERROR queueing emails: {e}", flush=True)
-
-    return db_order
+    return fast_json.respond(schemas.Order, db_order, validate=True, status_code=status.HTTP_201_CREATED)
 
 
 # Get Available Availabilities Endpoint
@@ -597,22 +889,111 @@ async def create_new_order(
     "/api/availabilities/get",
     response_model=Dict[date, List[schemas.Availability]],
     summary="Get Available Availabilities",
-    description="Retrieves a list of all availability slots that are not yet taken, filtered for the next two weeks."
+    description=(
+        "Retrieves every availability slot that is not yet taken for the next "
+        "two weeks, keyed by Europe/Berlin day. Superseded by "
+        "`/api/availabilities/calendar`, which takes a date range and pages."
+    ),
+    deprecated=True,
 )
-async def read_available_availabilities(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    start_date = date.today()
+async def read_available_availabilities(db: AnySession = Depends(get_session)):
+    start_date = crud.business_today()
     end_date = start_date + timedelta(weeks=2)
 
+    # Served from the in-memory calendar snapshot: one dict lookup per day.
+    await slot_calendar.ensure_current(db, start_date)
     result = {}
 
     current = start_date
     while current <= end_date:
-        result[current] = []
+        result[current] = slot_calendar.slots(current)
         current += timedelta(days=1)
-    availabilities = crud.get_available_availabilities(db, start_date=start_date, end_date=end_date)
-    for availability in availabilities:
-        result[availability.time.date()].append(availability)
-    return result
+    # Snapshot slots are schemas.Availability already: encode without re-validating.
+    return fast_json.respond(Dict[date, List[schemas.Availability]], result)
+
+
+# Longest range a single calendar request may span.
+AVAILABILITY_CALENDAR_MAX_SPAN_DAYS = 62
+
+
+@app.get(
+    "/api/availabilities/calendar",
+    response_model=schemas.AvailabilityCalendar,
+    summary="Get Availability Calendar",
+    description=(
+        "Bookable slots between `from` and `to` (inclusive Europe/Berlin days), "
+        "grouped by day. At most `limit` slots per page; pass `next_cursor` "
+        "back as `cursor` for the next page."
+    ),
+)
+async def read_availability_calendar(
+    from_date: date = Query(alias="from"),
+    to_date: date = Query(alias="to"),
+    brand: models.BrandEnum = models.BrandEnum.CAR,
+    cursor: Optional[str] = None,
+    limit: int = Query(200, ge=1, le=1000),
+    db: AnySession = Depends(get_session),
+):
+    """
+    - **from** / **to**: `YYYY-MM-DD`, inclusive, in Europe/Berlin.
+    - **brand**: accepted like on every other app call; the slot pool is
+      currently shared by both brands.
+    - **cursor**: `next_cursor` from the previous page.
+
+    Each page lists every day from where it starts up to its last slot's day
+    (the whole range on the final page), including days without slots.
+    """
+    if to_date < from_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="`to` must not be before `from`")
+    if (to_date - from_date).days >= AVAILABILITY_CALENDAR_MAX_SPAN_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range may span at most {AVAILABILITY_CALENDAR_MAX_SPAN_DAYS} days",
+        )
+    after = None
+    if cursor:
+        try:
+            after = tuple(decode_cursor(cursor, (datetime, int)))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Past days have nothing bookable.
+    start_day = max(from_date, crud.business_today())
+    if after is not None:
+        start_day = max(start_day, crud.business_day(after[0]))
+
+    await slot_calendar.ensure_current(db, crud.business_today())
+    if start_day > to_date:
+        slots = []
+    elif slot_calendar.covers(start_day, to_date):
+        slots = slot_calendar.slots_between(start_day, to_date)
+        if after is not None:
+            slots = [s for s in slots if (s.time, s.id) > after]
+        slots = slots[:limit + 1]
+    else:
+        slots = await crud_async.get_available_availabilities(
+            db, start_date=start_day, end_date=to_date, limit=limit + 1, after=after,
+        )
+
+    has_more = len(slots) > limit
+    slots = slots[:limit]
+    last_day = crud.business_day(slots[-1].time) if has_more else to_date
+
+    by_day: Dict[date, List] = {}
+    for slot in slots:
+        by_day.setdefault(crud.business_day(slot.time), []).append(slot)
+    days = []
+    current = start_day
+    while current <= last_day:
+        days.append({"day": current, "slots": by_day.get(current, [])})
+        current += timedelta(days=1)
+    page = {
+        "days": days,
+        "next_cursor": encode_cursor(slots[-1].time, slots[-1].id) if has_more else None,
+    }
+    # Only rows from the database fallback are validated; snapshot slots are
+    # schemas.Availability already and pass through.
+    return fast_json.respond(schemas.AvailabilityCalendar, page, validate=True)
 
 
 @app.get(
@@ -621,8 +1002,8 @@ async def read_available_availabilities(skip: int = 0, limit: int = 100, db: Ses
     summary="Get Available Availability by id",
     description="Retrieves an availability slot by id."
 )
-async def read_availability(availability_id: int, db: Session = Depends(get_db)):
-    db_availability = crud.get_availability_by_id(db, availability_id=availability_id)
+async def read_availability(availability_id: int, db: AnySession = Depends(get_session)):
+    db_availability = await crud_async.get_availability_by_id(db, availability_id=availability_id)
     if db_availability is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -639,8 +1020,12 @@ async def read_availability(availability_id: int, db: Session = Depends(get_db))
     summary="Create a New Availability Slot",
     description="Creates a new availability slot."
 )
-async def create_availability_slot(availability: schemas.AvailabilityCreate, db: Session = Depends(get_db)):
-    db_availability = crud.create_availability(db=db, availability=availability)
+async def create_availability_slot(availability: schemas.AvailabilityCreate, db: AnySession = Depends(get_session)):
+    try:
+        db_availability = await crud_async.create_availability(db=db, availability=availability)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    slot_calendar.add([db_availability])
     return db_availability
 
 
@@ -663,7 +1048,7 @@ async def bulk_create_availabilities_for_day(
     start_hour: int = 8,
     end_hour: int = 17,
     step_minutes: int = 90,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
 ):
     """
     - **day**: target date in `YYYY-MM-DD` format (query param).
@@ -682,13 +1067,86 @@ async def bulk_create_availabilities_for_day(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="step_minutes must be positive",
         )
-    return crud.bulk_create_availabilities_for_day(
+    created = await crud_async.bulk_create_availabilities_for_day(
         db=db,
         target_date=day,
         start_hour=start_hour,
         end_hour=end_hour,
         step_minutes=step_minutes,
     )
+    slot_calendar.add(created)
+    return created
+
+
+# Longest range one bulk call may generate (about a quarter).
+BULK_RANGE_MAX_DAYS = 93
+
+
+# Bulk Create Availabilities For a Date Range Endpoint
+@app.post(
+    "/api/availabilities/bulk_create_range",
+    response_model=List[schemas.Availability],
+    status_code=status.HTTP_201_CREATED,
+    summary="Bulk Create Availabilities For a Date Range",
+    description=(
+        "Generates availability slots for every day from `start` through `end` "
+        "(inclusive) whose ISO weekday is listed in `weekdays`, using the same "
+        "hours and interval as `/api/availabilities/bulk_create_for_day`. All "
+        "slots are written in one statement; times that already have a slot "
+        "are skipped, so the endpoint is safe to call repeatedly."
+    ),
+)
+async def bulk_create_availabilities_range(
+    start: date,
+    end: date,
+    weekdays: str = Query("1,2,3,4,5,6,7", description="Comma-separated ISO weekdays (Mon=1 .. Sun=7)."),
+    start_hour: int = 8,
+    end_hour: int = 17,
+    step_minutes: int = 90,
+    db: AnySession = Depends(get_session),
+):
+    """
+    - **start** / **end**: first and last date in `YYYY-MM-DD` format.
+    - **weekdays**: e.g. `1,2,3,4,5` for Monday to Friday only.
+    - **start_hour** / **end_hour** / **step_minutes**: optional overrides.
+
+    Returns the list of newly created availability slots, ordered by time.
+    """
+    if end < start or (end - start).days >= BULK_RANGE_MAX_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Require start <= end and at most {BULK_RANGE_MAX_DAYS} days",
+        )
+    try:
+        weekday_set = {int(d) for d in weekdays.split(",") if d.strip()}
+    except ValueError:
+        weekday_set = set()
+    if not weekday_set or not weekday_set <= set(range(1, 8)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="weekdays must be a comma-separated list of 1..7",
+        )
+    if not (0 <= start_hour < end_hour <= 24):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Require 0 <= start_hour < end_hour <= 24",
+        )
+    if step_minutes <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="step_minutes must be positive",
+        )
+    created = await crud_async.bulk_create_availabilities(
+        db=db,
+        start_date=start,
+        end_date=end,
+        weekdays=weekday_set,
+        start_hour=start_hour,
+        end_hour=end_hour,
+        step_minutes=step_minutes,
+    )
+    slot_calendar.add(created)
+    return created
 
 # Get Active Services Endpoint
 @app.get(
@@ -698,19 +1156,29 @@ async def bulk_create_availabilities_for_day(
     description="Retrieves a list of all services that are currently active (is_active = True)."
 )
 async def read_active_services(
+    request: Request,
     brand: models.BrandEnum = models.BrandEnum.CAR,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_session),
 ):
     """
     Retrieves a list of services that are marked as active for the given brand
     (white-label app). Defaults to `car` so the original app keeps working
     without sending a `brand` query param.
     Supports pagination using `skip` and `limit` parameters.
+
+    Served from the in-process catalog cache with a strong `ETag`; a request
+    whose `If-None-Match` matches gets an empty 304.
     """
-    active_services = crud.get_active_services(db, brand=brand, skip=skip, limit=limit)
-    return active_services
+    entry = await catalog.get_catalog(db, brand)
+    headers = {
+        "ETag": entry.etag(skip, limit),
+        "Cache-Control": f"public, max-age={CATALOG_MAX_AGE}",
+    }
+    if _etag_matches(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return fast_json.respond(List[schemas.Service], entry.services[skip:skip + limit], headers=headers)
 
 
 @app.put(
@@ -720,8 +1188,9 @@ async def read_active_services(
     summary="Create a New Service",
     description="Creates a new service."
 )
-async def create_service_entry(service: schemas.ServiceCreate, db: Session = Depends(get_db)):
-    db_service = crud.create_service(db=db, service=service)
+async def create_service_entry(service: schemas.ServiceCreate, db: AnySession = Depends(get_session)):
+    db_service = await crud_async.create_service(db=db, service=service)
+    catalog.invalidate(models.BrandEnum(db_service.brand.value))
     return db_service
 
 
@@ -734,7 +1203,7 @@ async def create_service_entry(service: schemas.ServiceCreate, db: Session = Dep
 async def update_process_step(
     step_id: int,
     status: schemas.ProcessStepStatusEnum,
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_session)
 ):
     """
     Updates the status of a process step.
@@ -742,13 +1211,11 @@ async def update_process_step(
     - **step_id**: The unique integer ID of the process step to update.
     - **status**: The new status (e.g., "in_progress", "completed", "failed").
     """
-    db_step = crud.update_process_step_status(db=db, step_id=step_id, new_status=status)
-    if db_step is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Process step not found"
-        )
-    return db_step
+    transition = await crud_async.update_process_step_status(db=db, step_id=step_id, new_status=status)
+    if transition is None:
+        # ``status`` is the path parameter here, not fastapi.status.
+        raise HTTPException(status_code=404, detail="Process step not found")
+    return transition.step
 
 
 
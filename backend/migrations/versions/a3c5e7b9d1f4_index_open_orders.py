@@ -0,0 +1,38 @@
+"""Indexes for the cleaner dashboard
+
+Revision ID: a3c5e7b9d1f4
+Revises: f7c1d3e5a9b2
+Create Date: 2026-10-18 15:00:00.000000
+
+The cleaner dashboard lists a brand's OPEN orders. Without an index that is a
+scan of every order ever placed; a partial index on ``(brand, status)``
+restricted to open orders stays as small as the current workload.
+
+Its step filter ("has a step in status X") and loading an order's steps look
+up ``process_steps`` by ``order_id``, which had no index at all.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7b9d1f4'
+down_revision: Union[str, Sequence[str], None] = 'f7c1d3e5a9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_orders_open_brand', 'orders', ['brand', 'status'],
+        unique=False, postgresql_where=sa.text("status = 'OPEN'"),
+    )
+    op.create_index(
+        'ix_process_steps_order_status', 'process_steps', ['order_id', 'status'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_process_steps_order_status', table_name='process_steps')
+    op.drop_index('ix_orders_open_brand', table_name='orders')
@@ -0,0 +1,30 @@
+"""Version stamp on orders
+
+Revision ID: b8d2f4a6c0e3
+Revises: a3c5e7b9d1f4
+Create Date: 2026-10-18 18:00:00.000000
+
+``orders.version`` goes up by one with every status or process step change
+of the order. The order endpoints use it as their ETag, so an app can ask
+"has this changed?" with a one-column query instead of reloading the order.
+Existing orders start at 1.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f4a6c0e3'
+down_revision: Union[str, Sequence[str], None] = 'a3c5e7b9d1f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # A constant default: Postgres adds the column without rewriting the table.
+    op.add_column('orders', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('orders', 'version')
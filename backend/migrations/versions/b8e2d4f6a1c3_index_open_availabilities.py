@@ -0,0 +1,31 @@
+"""Partial index on untaken availability slots
+
+Revision ID: b8e2d4f6a1c3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-18 09:00:00.000000
+
+Slot browsing always asks for untaken slots in a time range. A partial index
+on ``time`` restricted to ``NOT is_taken`` serves that query with an index
+range scan and stays small, because booked slots drop out of it.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2d4f6a1c3'
+down_revision: Union[str, Sequence[str], None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_availabilities_open_time', 'availabilities', ['time'],
+        unique=False, postgresql_where=sa.text('NOT is_taken'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_availabilities_open_time', table_name='availabilities')
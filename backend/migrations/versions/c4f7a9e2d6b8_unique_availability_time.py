@@ -0,0 +1,51 @@
+"""Unique index on availabilities.time
+
+Revision ID: c4f7a9e2d6b8
+Revises: b8e2d4f6a1c3
+Create Date: 2026-10-18 10:00:00.000000
+
+Bulk slot generation inserts whole months with ``ON CONFLICT (time) DO
+NOTHING``, which needs a unique index to resolve conflicts against. Before
+creating it, duplicate slots left behind by earlier per-day generation are
+removed. Each group sharing a time keeps one row: a slot that is taken or
+referenced by an order if there is one, else the lowest id. Every other free,
+unreferenced slot in the group is deleted. Slots in use are never deleted, so
+if a time has two taken or booked slots the index creation fails and those
+need manual cleanup.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f7a9e2d6b8'
+down_revision: Union[str, Sequence[str], None] = 'b8e2d4f6a1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        WITH ranked AS (
+            SELECT id, in_use,
+                   row_number() OVER (PARTITION BY time ORDER BY in_use DESC, id) AS rank
+            FROM (
+                SELECT a.id, a.time,
+                       a.is_taken OR EXISTS (
+                           SELECT 1 FROM orders o WHERE o.availability_id = a.id
+                       ) AS in_use
+                FROM availabilities a
+            ) slots
+        )
+        DELETE FROM availabilities a
+        USING ranked r
+        WHERE a.id = r.id AND r.rank > 1 AND NOT r.in_use
+        """
+    )
+    op.create_index('uq_availabilities_time', 'availabilities', ['time'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_availabilities_time', table_name='availabilities')
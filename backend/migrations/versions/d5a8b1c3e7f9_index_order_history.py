@@ -0,0 +1,32 @@
+"""Composite index for keyset-paged order history
+
+Revision ID: d5a8b1c3e7f9
+Revises: c4f7a9e2d6b8
+Create Date: 2026-10-18 11:00:00.000000
+
+The history screen filters on ``phone_identifier`` and ``brand`` and pages by
+``(created_at, id)`` descending. With all four columns in one index, each page
+is a backward index range scan that starts at the cursor, instead of a sort
+of the customer's whole history followed by OFFSET.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8b1c3e7f9'
+down_revision: Union[str, Sequence[str], None] = 'c4f7a9e2d6b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_orders_phone_brand_created', 'orders',
+        ['phone_identifier', 'brand', 'created_at', 'id'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_orders_phone_brand_created', table_name='orders')
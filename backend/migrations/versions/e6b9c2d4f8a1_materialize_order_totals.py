@@ -0,0 +1,61 @@
+"""Store order totals, currency and booked unit prices
+
+Revision ID: e6b9c2d4f8a1
+Revises: d5a8b1c3e7f9
+Create Date: 2026-10-18 12:00:00.000000
+
+``orders.total`` / ``orders.currency`` and
+``order_service_association.unit_price`` are written when an order is
+created, so totals no longer need the services join and later catalog price
+changes don't alter past orders. Existing rows are backfilled from the
+current service prices, the closest record we have.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6b9c2d4f8a1'
+down_revision: Union[str, Sequence[str], None] = 'd5a8b1c3e7f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Already created for services.currency.
+currency_enum_type = sa.Enum('EUR', 'USD', 'GBP', name='currencyenum')
+
+
+def upgrade() -> None:
+    op.add_column('order_service_association', sa.Column('unit_price', sa.Float(), nullable=True))
+    op.add_column('orders', sa.Column('total', sa.Float(), nullable=True))
+    op.add_column('orders', sa.Column('currency', currency_enum_type, nullable=True))
+
+    op.execute(
+        """
+        UPDATE order_service_association a
+        SET unit_price = s.price
+        FROM services s
+        WHERE s.id = a.service_id
+        """
+    )
+    op.execute(
+        """
+        UPDATE orders o
+        SET total = t.total, currency = t.currency
+        FROM (
+            SELECT a.order_id,
+                   SUM(a.unit_price * a.quantity) AS total,
+                   MIN(s.currency) AS currency
+            FROM order_service_association a
+            JOIN services s ON s.id = a.service_id
+            GROUP BY a.order_id
+        ) t
+        WHERE t.order_id = o.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('orders', 'currency')
+    op.drop_column('orders', 'total')
+    op.drop_column('order_service_association', 'unit_price')
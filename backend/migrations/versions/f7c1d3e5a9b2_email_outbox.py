@@ -0,0 +1,53 @@
+"""Email outbox table
+
+Revision ID: f7c1d3e5a9b2
+Revises: e6b9c2d4f8a1
+Create Date: 2026-10-18 13:00:00.000000
+
+Order emails are written to ``email_outbox`` in the order's transaction and
+delivered by the email worker with retries and dead-lettering, instead of
+from in-process background tasks. The partial index keeps the worker's
+"due and pending" claim query cheap no matter how many sent rows pile up.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7c1d3e5a9b2'
+down_revision: Union[str, Sequence[str], None] = 'e6b9c2d4f8a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+outbox_status_enum_type = sa.Enum('PENDING', 'SENT', 'DEAD', name='outboxstatusenum')
+
+
+def upgrade() -> None:
+    op.create_table(
+        'email_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=64), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=True),
+        sa.Column('status', outbox_status_enum_type, nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id']),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_email_outbox_order_id'), 'email_outbox', ['order_id'], unique=False)
+    op.create_index(
+        'ix_email_outbox_due', 'email_outbox', ['next_attempt_at'],
+        unique=False, postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_due', table_name='email_outbox')
+    op.drop_index(op.f('ix_email_outbox_order_id'), table_name='email_outbox')
+    op.drop_table('email_outbox')
+    outbox_status_enum_type.drop(op.get_bind(), checkfirst=True)
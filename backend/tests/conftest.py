@@ -0,0 +1,82 @@
+# tests/conftest.py
+"""
+Run from backend/: ``python -m pytest``.
+
+Tests that need Postgres use ``TEST_DATABASE_URL``, a throwaway database
+whose tables are dropped and recreated, and are skipped when it is unset.
+DATABASE_URL (and .env) is never used, so the suite can't touch real data.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+# Set before app.database is imported; creating the engine doesn't connect.
+os.environ["DATABASE_URL"] = TEST_DATABASE_URL or "postgresql://unused@localhost/unused"
+os.environ["DB_ASYNC"] = "0"
+
+
+@pytest.fixture
+def db_engine():
+    """The app's engine on a fresh schema (TEST_DATABASE_URL)."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    from app import models  # noqa: F401 — registers the tables
+    from app.database import Base, engine
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture
+def session_factory(db_engine):
+    from app.database import SessionLocal
+
+    return SessionLocal
+
+
+@pytest.fixture
+def catalog(session_factory):
+    """Three CAR services and twenty free slots: ``(service_ids, availability_ids)``."""
+    import datetime
+
+    from app import models
+
+    start = datetime.datetime(2030, 1, 7, 8, tzinfo=datetime.timezone.utc)
+    with session_factory() as db:
+        services = [
+            models.Service(
+                brand=models.BrandEnum.CAR, category=models.ServiceCategoryEnum.BASIC,
+                name=f"service.{i}.name", price=10.0 + i, currency=models.CurrencyEnum.EUR,
+            )
+            for i in range(3)
+        ]
+        slots = [models.Availability(time=start + datetime.timedelta(hours=2 * i)) for i in range(20)]
+        db.add_all(services + slots)
+        db.commit()
+        return [s.id for s in services], [a.id for a in slots]
+
+
+@pytest.fixture
+def place_order(session_factory, catalog):
+    """``place_order(slot_index, phone_identifier="p")`` books one of ``catalog``'s slots."""
+    from app import crud, schemas
+
+    service_ids, availability_ids = catalog
+
+    def place(slot_index: int, phone_identifier: str = "p"):
+        with session_factory() as db:
+            return crud.create_order(db, schemas.OrderCreate(
+                brand="car", phone_identifier=phone_identifier, plate_number="B-CC 1",
+                phone_number="+4915100000000", name="Test",
+                location=schemas.LocationCreate(address=f"Street {slot_index}", longitude=13.4, latitude=52.5),
+                availability_id=availability_ids[slot_index], service_ids=service_ids,
+            ))
+
+    return place
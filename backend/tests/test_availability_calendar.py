@@ -0,0 +1,24 @@
+import asyncio
+import datetime
+
+from app import availability_calendar, crud_async
+
+
+def test_concurrent_requests_for_a_stale_calendar_load_it_once(monkeypatch):
+    loads = []
+
+    async def get_available_availabilities(db, start_date, end_date, limit):
+        loads.append(start_date)
+        await asyncio.sleep(0.01)
+        return []
+
+    monkeypatch.setattr(crud_async, "get_available_availabilities", get_available_availabilities)
+    calendar = availability_calendar.AvailabilityCalendar()
+    today = datetime.date(2030, 1, 7)
+
+    async def browse():
+        await asyncio.gather(*(calendar.ensure_current(None, today) for _ in range(10)))
+
+    asyncio.run(browse())
+    assert loads == [today]
+    assert calendar.covers(today)
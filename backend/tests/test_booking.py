@@ -0,0 +1,57 @@
+import threading
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+
+from app import crud, models, schemas
+
+CONTENDERS = 12
+
+
+def _order(availability_id, service_ids, n):
+    return schemas.OrderCreate(
+        brand="car", phone_identifier=f"p{n}", plate_number="B-CC 1", phone_number="+4915100000000",
+        name="Test", location=schemas.LocationCreate(address=f"Street {n}", longitude=13.4, latitude=52.5),
+        availability_id=availability_id, service_ids=service_ids,
+    )
+
+
+def test_concurrent_bookings_of_one_slot_take_it_once(session_factory, catalog):
+    service_ids, availability_ids = catalog
+    slot = availability_ids[0]
+    start = threading.Barrier(CONTENDERS)
+    booked, refused, errors = [], [], []
+
+    def book(n):
+        with session_factory() as db:
+            start.wait()
+            try:
+                booked.append(crud.create_order(db, _order(slot, service_ids, n)).id)
+            except crud.SlotUnavailableError:
+                refused.append(n)
+            except Exception as e:  # noqa: BLE001 — reported below
+                errors.append(e)
+
+    threads = [threading.Thread(target=book, args=(n,)) for n in range(CONTENDERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    assert errors == []
+    assert len(booked) == 1
+    assert len(refused) == CONTENDERS - 1
+    with session_factory() as db:
+        assert db.scalar(select(func.count()).where(models.Order.availability_id == slot)) == 1
+        assert db.get(models.Availability, slot).is_taken
+
+
+def test_booking_a_taken_slot_returns_409(session_factory, catalog, place_order):
+    import main
+
+    service_ids, availability_ids = catalog
+    place_order(0)
+    response = TestClient(main.app).put(
+        "/api/orders/create", json=_order(availability_ids[0], service_ids, 99).model_dump(mode="json"),
+    )
+    assert response.status_code == 409
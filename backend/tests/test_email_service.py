@@ -0,0 +1,133 @@
+import smtplib
+import socket
+from email.message import EmailMessage
+
+import pytest
+
+from app import email_service
+from app.email_service import _SMTPPool
+
+
+def _closed_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _message() -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"], msg["To"], msg["Subject"] = "a@example.com", "b@example.com", "hi"
+    msg.set_content("hi")
+    return msg
+
+
+def test_connect_failure_raises_the_connect_error():
+    pool = _SMTPPool("127.0.0.1", _closed_port(), "", "", use_tls=True)
+    with pytest.raises(ConnectionRefusedError):
+        pool.send(_message())
+
+
+class _FakeSMTP:
+    def __init__(self, fail_with=None):
+        self.fail_with = fail_with
+        self.sent = []
+
+    def noop(self):
+        return (250, b"ok")
+
+    def send_message(self, msg):
+        if self.fail_with is not None:
+            raise self.fail_with
+        self.sent.append(msg)
+
+    def close(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+def test_stale_pooled_connection_is_retried_once_on_a_fresh_one(monkeypatch):
+    pool = _SMTPPool("smtp.example.com", 587, "", "", use_tls=True)
+    stale, fresh = _FakeSMTP(smtplib.SMTPServerDisconnected("gone")), _FakeSMTP()
+    pool._checkin(stale)
+    monkeypatch.setattr(pool, "_connect", lambda: fresh)
+    pool.send(_message())
+    assert len(fresh.sent) == 1
+
+
+def test_fresh_connection_failure_is_not_retried(monkeypatch):
+    pool = _SMTPPool("smtp.example.com", 587, "", "", use_tls=True)
+    connects = []
+
+    def connect():
+        connects.append(1)
+        return _FakeSMTP(smtplib.SMTPServerDisconnected("gone"))
+
+    monkeypatch.setattr(pool, "_connect", connect)
+    with pytest.raises(smtplib.SMTPServerDisconnected):
+        pool.send(_message())
+    assert len(connects) == 1
+
+
+class _FakeResend:
+    """Stands in for the Resend calls: refuses any batch or email to ``bad``."""
+
+    def __init__(self, bad=(), batch_error=None):
+        self.bad, self.batch_error = set(bad), batch_error
+        self.batches, self.singles = [], []
+
+    def batch(self, payloads, idempotency_key=None):
+        if self.batch_error is not None:
+            raise self.batch_error
+        self.batches.append(([p["to"][0] for p in payloads], idempotency_key))
+        return not any(p["to"][0] in self.bad for p in payloads)
+
+    def single(self, to, from_addr, subject, body_text, body_html, idempotency_key=None):
+        self.singles.append((to, idempotency_key))
+        return to not in self.bad
+
+
+@pytest.fixture
+def resend(monkeypatch):
+    def install(**kwargs):
+        fake = _FakeResend(**kwargs)
+        monkeypatch.setenv("RESEND_API_KEY", "test")
+        monkeypatch.setattr(email_service, "_send_batch_via_resend", fake.batch)
+        monkeypatch.setattr(email_service, "_send_via_resend", fake.single)
+        return fake
+    return install
+
+
+def _emails(*recipients):
+    return [email_service.OutgoingEmail(to, "subject", "text", None) for to in recipients]
+
+
+def test_refused_batch_is_resent_one_by_one(resend):
+    fake = resend(bad={"bad@example.com"})
+    results = email_service.send_emails(
+        _emails("a@example.com", "bad@example.com", "c@example.com"),
+        idempotency_keys=["k1", "k2", "k3"],
+    )
+    assert results == [True, False, True]
+    assert len(fake.batches) == 1
+    assert fake.singles == [("a@example.com", "k1"), ("bad@example.com", "k2"), ("c@example.com", "k3")]
+
+
+def test_retries_are_sent_one_by_one_under_their_own_key(resend):
+    fake = resend()
+    results = email_service.send_emails(
+        _emails("a@example.com", "b@example.com", "c@example.com"),
+        idempotency_keys=["k1", "k2", "k3"],
+        first_attempt=[True, False, True],
+    )
+    assert results == [True, True, True]
+    assert fake.batches == [(["a@example.com", "c@example.com"], fake.batches[0][1])]
+    assert fake.singles == [("b@example.com", "k2")]
+
+
+def test_batch_transport_error_leaves_emails_for_retry(resend):
+    fake = resend(batch_error=ConnectionResetError("reset"))
+    results = email_service.send_emails(_emails("a@example.com", "b@example.com"), idempotency_keys=["k1", "k2"])
+    assert results == [False, False]
+    assert fake.singles == []
@@ -0,0 +1,24 @@
+from fastapi.testclient import TestClient
+
+from app import order_events
+
+
+def test_stream_without_a_listener_sends_the_snapshot_and_a_retry_hint(monkeypatch, place_order, caplog):
+    import main
+
+    async def not_listening(timeout=5.0):
+        return False
+
+    order = place_order(0)
+    monkeypatch.setattr(order_events.hub, "wait_listening", not_listening)
+    try:
+        with caplog.at_level("WARNING"):
+            response = TestClient(main.app).get(f"/api/orders/events/phone_identifier/p/id/{order.id}")
+    finally:
+        order_events.hub.stop()
+
+    assert response.status_code == 200
+    assert response.text.startswith(f"retry: {order_events.ORDER_EVENTS_RETRY_MS}\n\n")
+    assert f'"order_id":{order.id}' in response.text
+    assert order_events.hub.subscriber_count() == 0
+    assert "listener is not ready" in caplog.text
@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app import crud, schemas
+
+
+@contextmanager
+def count_statements(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def _load_page(db_engine, session_factory, limit):
+    """Load a page of orders and serialize it; the statements that took."""
+    with session_factory() as db, count_statements(db_engine) as statements:
+        orders = crud.get_orders(db, "p", limit=limit)
+        page = [schemas.Order.model_validate(order).model_dump() for order in orders]
+    return page, len(statements)
+
+
+def test_order_page_loads_in_a_constant_number_of_statements(db_engine, session_factory, place_order):
+    for i in range(12):
+        place_order(i)
+
+    small, small_count = _load_page(db_engine, session_factory, limit=2)
+    large, large_count = _load_page(db_engine, session_factory, limit=12)
+
+    assert len(small) == 2 and len(large) == 12
+    assert all(len(order["services"]) == 3 and len(order["process_steps"]) == 5 for order in large)
+    assert small_count == large_count
+    # Orders (with location and slot joined), then service rows, then steps.
+    assert large_count <= 3
+
+
+def test_history_keyset_pages_cost_the_same(db_engine, session_factory, place_order):
+    for i in range(9):
+        place_order(i)
+
+    with session_factory() as db:
+        first = crud.get_orders(db, "p", limit=3)
+        cursor = (first[-1].created_at, first[-1].id)
+    with session_factory() as db, count_statements(db_engine) as statements:
+        second = crud.get_orders(db, "p", limit=3, before=cursor)
+        [schemas.Order.model_validate(order) for order in second]
+    assert [o.id for o in second] == sorted((o.id for o in second), reverse=True)
+    assert not {o.id for o in first} & {o.id for o in second}
+    assert len(statements) <= 3
@@ -0,0 +1,33 @@
+import base64
+import datetime
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def _raw_cursor(*values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_cursor_round_trips_an_aware_datetime():
+    when = datetime.datetime(2030, 1, 7, 8, tzinfo=datetime.timezone.utc)
+    assert decode_cursor(encode_cursor(when, 7), (datetime.datetime, int)) == [when, 7]
+
+
+@pytest.mark.parametrize("cursor", [_raw_cursor("2030-01-07T08:00:00", 7), _raw_cursor(1, 2, 3), "not base64!"])
+def test_foreign_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, (datetime.datetime, int))
+
+
+def test_calendar_answers_a_naive_cursor_with_400():
+    import main
+
+    response = TestClient(main.app).get(
+        "/api/availabilities/calendar",
+        params={"from": "2030-01-07", "to": "2030-01-08", "cursor": _raw_cursor("2030-01-07T08:00:00", 7)},
+    )
+    assert response.status_code == 400
@@ -81,9 +81,9 @@ const HomeScreen = () => {
   const goToSettings = () => router.push('/settings');
 
   const computeOrderTotal = (o: Order) =>
-    (o.services || []).reduce((sum, s) => sum + (s.price || 0), 0);
+    o.total ?? (o.services || []).reduce((sum, s) => sum + (s.price || 0), 0);
 
-  const orderCurrency = (o: Order) => (o.services?.[0]?.currency || 'EUR');
+  const orderCurrency = (o: Order) => (o.currency || o.services?.[0]?.currency || 'EUR');
 
   // Matches the badge style used in the orders tab (OrderCard.tsx). The open
   // accent is brand-specific: home uses a light tint of #E38C39, car light blue.
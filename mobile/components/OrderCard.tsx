@@ -43,11 +43,11 @@ const OrderItemCard: React.FC<OrderItemCardProps> = ({ item }) => {
   const isCompleted = statusKey === 'completed';
   const isCancelled = statusKey === 'cancelled';
 
-  const totalPrice = (item.services || []).reduce(
+  const totalPrice = item.total ?? (item.services || []).reduce(
     (sum, s) => sum + (s.price || 0),
     0,
   );
-  const currency = item.services?.[0]?.currency || 'EUR';
+  const currency = item.currency || item.services?.[0]?.currency || 'EUR';
   const serviceLabel =
     (item.services || []).map((s) => tService(s as any, 'name')).join(', ') ||
     item.plate_number ||
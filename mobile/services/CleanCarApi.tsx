@@ -24,6 +24,9 @@ export interface Order {
   service_ids: number[];
   created_at: string;
   status: OrderStatus;
+  // Stored at booking time; null on orders without services.
+  total?: number | null;
+  currency?: string | null;
   location: Location;
   availability: Availability;
   services: Service[];
@@ -47,6 +50,7 @@ export interface Service {
 export interface ServiceItem {
   service: Service;
   quantity: number;
+  unit_price?: number | null; // price when booked
 }
 
 export interface ProcessStep {
@@ -93,20 +97,41 @@ export interface Availability {
   is_taken: boolean;
 }
 
+// One page of /api/availabilities/calendar.
+export interface AvailabilityCalendarPage {
+  timezone: string;
+  days: { day: string; slots: Availability[] }[];
+  next_cursor: string | null;
+}
+
+// One page of /api/orders/history, newest first.
+export interface OrderHistoryPage {
+  orders: Order[];
+  next_cursor: string | null;
+}
+
 export const CleanCarAPI = {
 
-  getOrdersByPhoneIdentifier: async (phone_identifier: string) => {
+  // One page of order history; pass the previous page's next_cursor to continue.
+  getOrderHistoryPage: async (phone_identifier: string, cursor?: string | null): Promise<OrderHistoryPage> => {
     try {
-      const response = await fetch(`${BASE_URL}/api/orders/get/phone_identifier/${phone_identifier}?${BRAND_PARAM}`);
-      const data = await response.json();
-      return data
-    }
-    catch (error) {
-      console.error("Error getting orders by phone identifier:", error);
-      return [];
+      const params = new URLSearchParams({ limit: '100' });
+      if (cursor) params.set('cursor', cursor);
+      const response = await fetch(`${BASE_URL}/api/orders/history/phone_identifier/${phone_identifier}?${params.toString()}&${BRAND_PARAM}`);
+      if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+      return await response.json();
+    } catch (error) {
+      console.error("Error getting order history:", error);
+      return { orders: [], next_cursor: null };
     }
   },
 
+  // Most recent orders (first history page).
+  getOrdersByPhoneIdentifier: async (phone_identifier: string) => {
+    const page = await CleanCarAPI.getOrderHistoryPage(phone_identifier);
+    return page.orders;
+  },
+
   getOrderByByPhoneIdentifierAndId: async (phone_identifier: string, order_id: number) => {
     try {
       const response = await fetch(`${BASE_URL}/api/orders/get/phone_identifier/${phone_identifier}/id/${order_id}?${BRAND_PARAM}`);
@@ -129,17 +154,43 @@ export const CleanCarAPI = {
     }
   },
 
-  getAvailabilities: async() => {
+  /**
+   * Bookable slots between `from` and `to` (inclusive YYYY-MM-DD, Europe/Berlin
+   * days), keyed by day. Follows the calendar endpoint's cursor until the
+   * whole range is loaded.
+   */
+  getAvailabilityCalendar: async (from: string, to: string) => {
+    const result: { [date: string]: Availability[] } = {};
+    let cursor: string | null = null;
     try {
-      const response = await fetch(`${BASE_URL}/api/availabilities/get`);
-      const data = await response.json();
-      return data;
+      do {
+        const params = new URLSearchParams({ from, to });
+        if (cursor) params.set('cursor', cursor);
+        const response = await fetch(`${BASE_URL}/api/availabilities/calendar?${params.toString()}&${BRAND_PARAM}`);
+        if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
+        const page: AvailabilityCalendarPage = await response.json();
+        for (const day of page.days) {
+          result[day.day] = [...(result[day.day] ?? []), ...day.slots];
+        }
+        cursor = page.next_cursor;
+      } while (cursor);
+      return result;
     } catch (error) {
-      console.error("Error getting availabilities:", error);
+      console.error("Error getting availability calendar:", error);
       return {};
     }
   },
 
+  // Next two weeks of bookable slots, keyed by day.
+  getAvailabilities: async() => {
+    const today = new Date();
+    const until = new Date(today);
+    until.setDate(today.getDate() + 14);
+    const isoDay = (d: Date) =>
+      `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}-${String(d.getDate()).padStart(2, '0')}`;
+    return CleanCarAPI.getAvailabilityCalendar(isoDay(today), isoDay(until));
+  },
+
   getServices: async() => {
     try {
       const response = await fetch(`${BASE_URL}/api/services/get?${BRAND_PARAM}`);